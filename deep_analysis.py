@@ -1,261 +1,290 @@
 """
 Deep Data Analysis - Finding Impressive Insights
-Exploring the books dataset for compelling findings
+Exploring the books dataset for compelling findings, one cached section at a time
 """
 import pandas as pd
-import numpy as np
 from collections import Counter
 import sys
+import os
 
-# Redirect to file
-sys.stdout = open('deep_insights.txt', 'w', encoding='utf-8')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from snapshot import load_books
+from category_trends import CategoryYearCube
+from publishers import PublisherCategoryMatrix
+from topk import TopKEngine
+from insights import Section, write_report
 
-# Load data
-df = pd.read_csv('google_books_dataset.csv')
 
-print("=" * 80)
-print("📊 DEEP DATA ANALYSIS - IMPRESSIVE INSIGHTS")
-print("=" * 80)
+def bar(count, per):
+    return '█' * int(count // per)
+
 
 # =============================================================================
 # 1. AUTHOR ANALYSIS
 # =============================================================================
-print("\n" + "=" * 80)
-print("👤 AUTHOR ANALYSIS")
-print("=" * 80)
-
-# Most prolific authors
-df_authors = df[df['authors'].notna()].copy()
-all_authors = []
-for authors in df_authors['authors'].dropna():
+def author_analysis(df):
+    df_authors = df[df['authors'].notna()]
     # Split by comma if multiple authors
-    for author in str(authors).split(','):
-        all_authors.append(author.strip())
+    author_counts = Counter(author.strip() for authors in df_authors['authors'] for author in str(authors).split(','))
+
+    author_ratings = df_authors[df_authors['average_rating'].notna()].groupby('authors').agg({
+        'average_rating': 'mean',
+        'book_id': 'count'
+    }).rename(columns={'book_id': 'book_count'})
+    author_ratings = author_ratings[author_ratings['book_count'] >= 3].sort_values('average_rating', ascending=False)
+
+    return {
+        'prolific': author_counts.most_common(15),
+        'highest_rated': [[author, row['average_rating'], int(row['book_count'])]
+                          for author, row in author_ratings.head(10).iterrows()],
+    }
 
-author_counts = Counter(all_authors)
-print("\n📚 TOP 15 MOST PROLIFIC AUTHORS:")
-for author, count in author_counts.most_common(15):
-    print(f"   {author}: {count} books")
 
-# Authors with highest average ratings
-author_ratings = df_authors[df_authors['average_rating'].notna()].groupby('authors').agg({
-    'average_rating': 'mean',
-    'book_id': 'count'
-}).rename(columns={'book_id': 'book_count'})
-author_ratings = author_ratings[author_ratings['book_count'] >= 3].sort_values('average_rating', ascending=False)
+def render_author_analysis(r):
+    lines = ['', "📚 TOP 15 MOST PROLIFIC AUTHORS:"]
+    lines += [f"   {author}: {count} books" for author, count in r['prolific']]
+    lines += ['', "⭐ TOP 10 HIGHEST-RATED AUTHORS (min 3 books):"]
+    lines += [f"   {author[:40]}: {rating:.2f} avg rating ({books} books)" for author, rating, books in r['highest_rated']]
+    return lines
 
-print("\n⭐ TOP 10 HIGHEST-RATED AUTHORS (min 3 books):")
-for idx, (author, row) in enumerate(author_ratings.head(10).iterrows()):
-    print(f"   {author[:40]}: {row['average_rating']:.2f} avg rating ({int(row['book_count'])} books)")
 
 # =============================================================================
 # 2. PUBLICATION TRENDS
 # =============================================================================
-print("\n" + "=" * 80)
-print("📅 PUBLICATION TRENDS")
-print("=" * 80)
-
-df_dated = df[df['published_date'].notna()].copy()
-# Extract year from published_date
-df_dated['year'] = df_dated['published_date'].str.extract(r'(\d{4})').astype(float)
-df_dated = df_dated[df_dated['year'].notna() & (df_dated['year'] >= 1900) & (df_dated['year'] <= 2025)]
-
-print("\n📈 BOOKS BY DECADE:")
-df_dated['decade'] = (df_dated['year'] // 10 * 10).astype(int)
-decade_counts = df_dated['decade'].value_counts().sort_index()
-for decade, count in decade_counts.items():
-    bar = '█' * (count // 100)
-    print(f"   {int(decade)}s: {count:>4} books {bar}")
-
-# Which categories have grown the most recently?
-recent = df_dated[df_dated['year'] >= 2020]
-older = df_dated[(df_dated['year'] >= 2010) & (df_dated['year'] < 2020)]
-
-recent_cats = recent['search_category'].value_counts()
-older_cats = older['search_category'].value_counts()
-
-print("\n🚀 FASTEST GROWING CATEGORIES (2020s vs 2010s):")
-growth_rates = {}
-for cat in set(recent_cats.index) & set(older_cats.index):
-    if older_cats[cat] > 10:  # Minimum base
-        growth = (recent_cats[cat] - older_cats[cat]) / older_cats[cat] * 100
-        growth_rates[cat] = growth
-
-for cat, growth in sorted(growth_rates.items(), key=lambda x: x[1], reverse=True)[:10]:
-    print(f"   {cat}: {growth:+.1f}% growth")
+def publication_trends(df):
+    # year is parsed once per dataset version in the snapshot
+    df_dated = df[df['year'].notna() & (df['year'] >= 1900) & (df['year'] <= 2025)]
+    decades = (df_dated['year'] // 10 * 10).astype(int).value_counts().sort_index()
+
+    # Which categories have grown the most recently?
+    cube = CategoryYearCube.from_frame(df_dated)
+    growth_rates = cube.growth((2010, 2019), (2020, 2025), min_base=10)
+    return {'decades': decades, 'growth': growth_rates.head(10)}
+
+
+def render_publication_trends(r):
+    lines = ['', "📈 BOOKS BY DECADE:"]
+    lines += [f"   {int(decade)}s: {count:>4} books {bar(count, 100)}" for decade, count in r['decades']]
+    lines += ['', "🚀 FASTEST GROWING CATEGORIES (2020s vs 2010s):"]
+    lines += [f"   {cat}: {growth:+.1f}% growth" for cat, growth in r['growth']]
+    return lines
+
 
 # =============================================================================
 # 3. PRICE VS QUALITY ANALYSIS
 # =============================================================================
-print("\n" + "=" * 80)
-print("💰 PRICE VS QUALITY ANALYSIS")
-print("=" * 80)
-
-df_price_rating = df[(df['list_price'].notna()) & (df['average_rating'].notna()) & 
-                      (df['list_price'] > 0) & (df['list_price'] < 200)]
-
-if len(df_price_rating) > 10:
-    correlation = df_price_rating['list_price'].corr(df_price_rating['average_rating'])
-    print(f"\n📊 Correlation between price and rating: {correlation:.3f}")
-    
-    # Expensive but highly rated
-    expensive_good = df_price_rating[(df_price_rating['list_price'] > 50) & 
-                                      (df_price_rating['average_rating'] >= 4.5)]
-    print(f"\n💎 Premium gems (>$50, rating ≥4.5): {len(expensive_good)} books")
-    
-    # Cheap but highly rated (best value!)
-    cheap_good = df_price_rating[(df_price_rating['list_price'] < 15) & 
-                                  (df_price_rating['average_rating'] >= 4.5)]
-    print(f"🏆 Best value (<$15, rating ≥4.5): {len(cheap_good)} books")
+def price_vs_quality(df):
+    df_price_rating = df[(df['list_price'].notna()) & (df['average_rating'].notna()) &
+                         (df['list_price'] > 0) & ~df['is_outlier_list_price']]
+    if len(df_price_rating) <= 10:
+        return {}
+
+    # Expensive but highly rated, and cheap but highly rated (best value!)
+    top_rated = df_price_rating['average_rating'] >= 4.5
+    return {
+        'correlation': df_price_rating['list_price'].corr(df_price_rating['average_rating']),
+        'premium_gems': int((top_rated & (df_price_rating['list_price'] > 50)).sum()),
+        'best_value': int((top_rated & (df_price_rating['list_price'] < 15)).sum()),
+    }
 
-# =============================================================================
-# 4. PAGE COUNT INSIGHTS
-# =============================================================================
-print("\n" + "=" * 80)
-print("📖 PAGE COUNT INSIGHTS")
-print("=" * 80)
 
-df_pages = df[(df['page_count'] > 0) & (df['page_count'] < 5000)]
+def render_price_vs_quality(r):
+    if not r:
+        return []
+    return ['', f"📊 Correlation between price and rating: {r['correlation']:.3f}",
+            '', f"💎 Premium gems (>$50, rating ≥4.5): {r['premium_gems']} books",
+            f"🏆 Best value (<$15, rating ≥4.5): {r['best_value']} books"]
 
-# Longest books
-print("\n📚 TOP 10 LONGEST BOOKS:")
-longest = df_pages.nlargest(10, 'page_count')[['title', 'authors', 'page_count', 'search_category']]
-for _, row in longest.iterrows():
-    title = str(row['title'])[:40] if pd.notna(row['title']) else 'Unknown'
-    print(f"   {title}: {int(row['page_count'])} pages ({row['search_category']})")
 
-# Average pages by category
-print("\n📊 CATEGORIES WITH LONGEST AVERAGE BOOKS:")
-cat_pages = df_pages.groupby('search_category')['page_count'].mean().sort_values(ascending=False)
-for cat, pages in cat_pages.head(10).items():
-    print(f"   {cat}: {pages:.0f} avg pages")
+# =============================================================================
+# 4. PAGE COUNT INSIGHTS
+# =============================================================================
+def page_count(df):
+    df_pages = df[(df['page_count'] > 0) & ~df['is_outlier_page_count']]
+    longest = TopKEngine(df).top('page_count', k=10,
+                                 filters={'page_count': ('>', 0), 'is_outlier_page_count': ('==', False)})
+    cat_pages = df_pages.groupby('search_category')['page_count'].mean().sort_values(ascending=False)
+    return {
+        'longest': [[str(row['title'])[:40] if pd.notna(row['title']) else 'Unknown',
+                     int(row['page_count']), row['search_category']] for _, row in longest.iterrows()],
+        'longest_categories': cat_pages.head(10),
+        # Shortest books still being sold
+        'under_50': int((df_pages['page_count'] < 50).sum()),
+        'books': len(df_pages),
+    }
+
+
+def render_page_count(r):
+    lines = ['', "📚 TOP 10 LONGEST BOOKS:"]
+    lines += [f"   {title}: {pages} pages ({cat})" for title, pages, cat in r['longest']]
+    lines += ['', "📊 CATEGORIES WITH LONGEST AVERAGE BOOKS:"]
+    lines += [f"   {cat}: {pages:.0f} avg pages" for cat, pages in r['longest_categories']]
+    lines += ['', f"📄 Books under 50 pages: {r['under_50']} ({r['under_50'] / r['books'] * 100:.1f}%)"]
+    return lines
 
-# Shortest books still being sold
-short_books = df_pages[df_pages['page_count'] < 50]
-print(f"\n📄 Books under 50 pages: {len(short_books)} ({len(short_books)/len(df_pages)*100:.1f}%)")
 
 # =============================================================================
 # 5. LANGUAGE DIVERSITY ANALYSIS
 # =============================================================================
-print("\n" + "=" * 80)
-print("🌍 LANGUAGE DIVERSITY")
-print("=" * 80)
-
-# Languages with highest average ratings
-lang_ratings = df[df['average_rating'].notna()].groupby('language').agg({
-    'average_rating': 'mean',
-    'book_id': 'count'
-}).rename(columns={'book_id': 'count'})
-lang_ratings = lang_ratings[lang_ratings['count'] >= 5].sort_values('average_rating', ascending=False)
-
-print("\n⭐ HIGHEST-RATED LANGUAGES (min 5 rated books):")
-for lang, row in lang_ratings.head(10).iterrows():
-    print(f"   {lang}: {row['average_rating']:.2f} avg rating ({int(row['count'])} books)")
-
-# Non-English categories
-non_english = df[df['language'] != 'en']
-print(f"\n📚 Non-English books: {len(non_english)} ({len(non_english)/len(df)*100:.1f}%)")
-
-non_eng_cats = non_english['search_category'].value_counts().head(10)
-print("\n🌐 Top categories for non-English books:")
-for cat, count in non_eng_cats.items():
-    print(f"   {cat}: {count} books")
+def language_diversity(df):
+    lang_ratings = df[df['average_rating'].notna()].groupby('language').agg({
+        'average_rating': 'mean',
+        'book_id': 'count'
+    }).rename(columns={'book_id': 'count'})
+    lang_ratings = lang_ratings[lang_ratings['count'] >= 5].sort_values('average_rating', ascending=False)
+
+    non_english = df[df['language'] != 'en']
+    return {
+        'highest_rated': [[lang, row['average_rating'], int(row['count'])]
+                          for lang, row in lang_ratings.head(10).iterrows()],
+        'non_english': len(non_english),
+        'books': len(df),
+        'non_english_categories': non_english['search_category'].value_counts().head(10),
+    }
+
+
+def render_language_diversity(r):
+    lines = ['', "⭐ HIGHEST-RATED LANGUAGES (min 5 rated books):"]
+    lines += [f"   {lang}: {rating:.2f} avg rating ({count} books)" for lang, rating, count in r['highest_rated']]
+    lines += ['', f"📚 Non-English books: {r['non_english']} ({r['non_english'] / r['books'] * 100:.1f}%)"]
+    lines += ['', "🌐 Top categories for non-English books:"]
+    lines += [f"   {cat}: {count} books" for cat, count in r['non_english_categories']]
+    return lines
+
 
 # =============================================================================
 # 6. PUBLISHER SPECIALIZATION
 # =============================================================================
-print("\n" + "=" * 80)
-print("🏢 PUBLISHER SPECIALIZATION")
-print("=" * 80)
-
-df_pub = df[df['publisher'].notna()]
-top_publishers = df_pub['publisher'].value_counts().head(10).index
-
-print("\n📊 WHAT DO TOP PUBLISHERS SPECIALIZE IN?")
-for pub in top_publishers[:5]:
-    pub_books = df_pub[df_pub['publisher'] == pub]
-    top_cat = pub_books['search_category'].value_counts().head(3)
-    pub_name = pub[:30] + '...' if len(pub) > 30 else pub
-    print(f"\n   {pub_name}:")
-    for cat, count in top_cat.items():
-        pct = count / len(pub_books) * 100
-        print(f"      └─ {cat}: {count} books ({pct:.0f}%)")
+def publisher_specialization(df):
+    pub_matrix = PublisherCategoryMatrix.from_frame(df)
+    pub_table = pub_matrix.summary(k=3)
+    specialists = pub_table[pub_table['books'] >= 20].sort_values('hhi', ascending=False)
+    return {
+        'top': [[pub, int(row['books']), pub_matrix.profile(pub, k=3)] for pub, row in pub_table.head(5).iterrows()],
+        'publishers': len(pub_table),
+        'specialists': [[pub, row['hhi'], row['top_1_share'], row['top_1']]
+                        for pub, row in specialists.head(5).iterrows()],
+    }
+
+
+def render_publisher_specialization(r):
+    lines = ['', "📊 WHAT DO TOP PUBLISHERS SPECIALIZE IN?"]
+    for pub, books, profile in r['top']:
+        pub_name = pub[:30] + '...' if len(pub) > 30 else pub
+        lines += ['', f"   {pub_name}:"]
+        lines += [f"      └─ {cat}: {count} books ({count / books * 100:.0f}%)" for cat, count in profile]
+    lines += ['', f"🎯 MOST SPECIALIZED PUBLISHERS (min 20 books, of {r['publishers']:,}):"]
+    lines += [f"   {pub[:40]}: HHI {hhi:.2f}, {share * 100:.0f}% {top_1}" for pub, hhi, share, top_1 in r['specialists']]
+    return lines
+
 
 # =============================================================================
 # 7. RATING PATTERNS
 # =============================================================================
-print("\n" + "=" * 80)
-print("⭐ RATING PATTERNS")
-print("=" * 80)
-
-df_rated = df[df['average_rating'].notna()]
-
-# Rating distribution
-rating_dist = pd.cut(df_rated['average_rating'], bins=[0,1,2,3,4,5], labels=['1★','2★','3★','4★','5★'])
-print("\n📊 RATING DISTRIBUTION:")
-for rating, count in rating_dist.value_counts().sort_index().items():
-    pct = count / len(df_rated) * 100
-    bar = '█' * int(pct / 2)
-    print(f"   {rating}: {count:>4} ({pct:>5.1f}%) {bar}")
-
-# Do longer books get better ratings?
-df_pages_rated = df[(df['page_count'] > 0) & (df['page_count'] < 2000) & (df['average_rating'].notna())]
-if len(df_pages_rated) > 10:
-    corr = df_pages_rated['page_count'].corr(df_pages_rated['average_rating'])
-    print(f"\n📈 Correlation: Page Count vs Rating: {corr:.3f}")
-    
-    short = df_pages_rated[df_pages_rated['page_count'] < 200]['average_rating'].mean()
-    long = df_pages_rated[df_pages_rated['page_count'] > 500]['average_rating'].mean()
-    print(f"   Short books (<200 pages) avg rating: {short:.2f}")
-    print(f"   Long books (>500 pages) avg rating: {long:.2f}")
+def rating_patterns(df):
+    df_rated = df[df['average_rating'].notna()]
+    rating_dist = pd.cut(df_rated['average_rating'], bins=[0, 1, 2, 3, 4, 5], labels=['1★', '2★', '3★', '4★', '5★'])
+    result = {'distribution': rating_dist.value_counts().sort_index(), 'rated': len(df_rated)}
+
+    # Do longer books get better ratings?
+    df_pages_rated = df[(df['page_count'] > 0) & ~df['is_outlier_page_count'] & (df['average_rating'].notna())]
+    if len(df_pages_rated) > 10:
+        result['page_correlation'] = df_pages_rated['page_count'].corr(df_pages_rated['average_rating'])
+        result['short_rating'] = df_pages_rated[df_pages_rated['page_count'] < 200]['average_rating'].mean()
+        result['long_rating'] = df_pages_rated[df_pages_rated['page_count'] > 500]['average_rating'].mean()
+    return result
+
+
+def render_rating_patterns(r):
+    lines = ['', "📊 RATING DISTRIBUTION:"]
+    for rating, count in r['distribution']:
+        pct = count / r['rated'] * 100
+        lines.append(f"   {rating}: {count:>4} ({pct:>5.1f}%) {bar(pct, 2)}")
+    if 'page_correlation' in r:
+        lines += ['', f"📈 Correlation: Page Count vs Rating: {r['page_correlation']:.3f}",
+                  f"   Short books (<200 pages) avg rating: {r['short_rating']:.2f}",
+                  f"   Long books (>500 pages) avg rating: {r['long_rating']:.2f}"]
+    return lines
+
 
 # =============================================================================
 # 8. ISBN ANALYSIS
 # =============================================================================
-print("\n" + "=" * 80)
-print("📘 ISBN & BUYABILITY ANALYSIS")
-print("=" * 80)
+def isbn_buyability(df):
+    has_isbn = df['isbn_13'].notna() | df['isbn_10'].notna()
+    buyable_by_cat = df.groupby('search_category')['buyable'].mean().sort_values(ascending=False)
+    return {
+        'isbn': int(has_isbn.sum()), 'isbn_share': has_isbn.mean(),
+        'buyable': int(df['buyable'].sum()), 'buyable_share': df['buyable'].mean(),
+        'buyable_categories': buyable_by_cat.head(10),
+    }
+
 
-has_isbn = df['isbn_13'].notna() | df['isbn_10'].notna()
-print(f"\n📖 Books with ISBN: {has_isbn.sum()} ({has_isbn.mean()*100:.1f}%)")
-print(f"🛒 Buyable books: {df['buyable'].sum()} ({df['buyable'].mean()*100:.1f}%)")
+def render_isbn_buyability(r):
+    lines = ['', f"📖 Books with ISBN: {r['isbn']} ({r['isbn_share'] * 100:.1f}%)",
+             f"🛒 Buyable books: {r['buyable']} ({r['buyable_share'] * 100:.1f}%)",
+             '', "💳 MOST PURCHASABLE CATEGORIES:"]
+    lines += [f"   {cat}: {rate * 100:.1f}% buyable" for cat, rate in r['buyable_categories']]
+    return lines
 
-# Buyable by category
-buyable_by_cat = df.groupby('search_category')['buyable'].mean().sort_values(ascending=False)
-print("\n💳 MOST PURCHASABLE CATEGORIES:")
-for cat, rate in buyable_by_cat.head(10).items():
-    print(f"   {cat}: {rate*100:.1f}% buyable")
 
 # =============================================================================
 # 9. INTERESTING CORRELATIONS
 # =============================================================================
-print("\n" + "=" * 80)
-print("🔍 INTERESTING FINDINGS")
-print("=" * 80)
-
-# Books with descriptions vs without
-with_desc = df[df['description'].notna()]
-without_desc = df[df['description'].isna()]
-print(f"\n📝 Books with descriptions: {len(with_desc)} ({len(with_desc)/len(df)*100:.1f}%)")
-
-if 'average_rating' in df.columns:
-    rated_with_desc = with_desc['average_rating'].notna().mean() * 100
-    rated_without_desc = without_desc['average_rating'].notna().mean() * 100
-    print(f"   With description: {rated_with_desc:.1f}% have ratings")
-    print(f"   Without description: {rated_without_desc:.1f}% have ratings")
-
-# Subtitle analysis
-has_subtitle = df['subtitle'].notna().sum()
-print(f"\n📑 Books with subtitles: {has_subtitle} ({has_subtitle/len(df)*100:.1f}%)")
-
-# Most common words in titles (simple analysis)
-all_titles = ' '.join(df['title'].dropna().astype(str))
-words = [w.lower() for w in all_titles.split() if len(w) > 4]
-word_counts = Counter(words).most_common(15)
-print("\n📰 MOST COMMON TITLE WORDS (>4 chars):")
-for word, count in word_counts:
-    print(f"   {word}: {count}")
-
-print("\n" + "=" * 80)
-print("✅ ANALYSIS COMPLETE")
-print("=" * 80)
+def interesting_findings(df):
+    # Books with descriptions vs without
+    has_desc = df['description'].notna()
+    rated = df['average_rating'].notna()
+
+    # Most common words in titles (simple analysis)
+    all_titles = ' '.join(df['title'].dropna().astype(str))
+    words = [w.lower() for w in all_titles.split() if len(w) > 4]
+    return {
+        'books': len(df),
+        'with_description': int(has_desc.sum()),
+        'rated_with_description': rated[has_desc].mean() * 100,
+        'rated_without_description': rated[~has_desc].mean() * 100,
+        'with_subtitle': int(df['subtitle'].notna().sum()),
+        'title_words': Counter(words).most_common(15),
+    }
+
+
+def render_interesting_findings(r):
+    books = r['books']
+    return ['', f"📝 Books with descriptions: {r['with_description']} ({r['with_description'] / books * 100:.1f}%)",
+            f"   With description: {r['rated_with_description']:.1f}% have ratings",
+            f"   Without description: {r['rated_without_description']:.1f}% have ratings",
+            '', f"📑 Books with subtitles: {r['with_subtitle']} ({r['with_subtitle'] / books * 100:.1f}%)",
+            '', "📰 MOST COMMON TITLE WORDS (>4 chars):"] + [f"   {word}: {count}" for word, count in r['title_words']]
+
+
+SECTIONS = [
+    Section('author_analysis', "👤 AUTHOR ANALYSIS", ['authors', 'average_rating', 'book_id'],
+            author_analysis, render_author_analysis),
+    Section('publication_trends', "📅 PUBLICATION TRENDS", ['year', 'search_category'],
+            publication_trends, render_publication_trends),
+    Section('price_vs_quality', "💰 PRICE VS QUALITY ANALYSIS",
+            ['list_price', 'average_rating', 'is_outlier_list_price'], price_vs_quality, render_price_vs_quality),
+    Section('page_count', "📖 PAGE COUNT INSIGHTS",
+            ['page_count', 'is_outlier_page_count', 'title', 'search_category'], page_count, render_page_count),
+    Section('language_diversity', "🌍 LANGUAGE DIVERSITY",
+            ['language', 'average_rating', 'book_id', 'search_category'], language_diversity, render_language_diversity),
+    Section('publisher_specialization', "🏢 PUBLISHER SPECIALIZATION", ['publisher', 'search_category'],
+            publisher_specialization, render_publisher_specialization),
+    Section('rating_patterns', "⭐ RATING PATTERNS", ['average_rating', 'page_count', 'is_outlier_page_count'],
+            rating_patterns, render_rating_patterns),
+    Section('isbn_buyability', "📘 ISBN & BUYABILITY ANALYSIS",
+            ['isbn_13', 'isbn_10', 'buyable', 'search_category'], isbn_buyability, render_isbn_buyability),
+    Section('interesting_findings', "🔍 INTERESTING FINDINGS",
+            ['description', 'average_rating', 'subtitle', 'title'], interesting_findings, render_interesting_findings),
+]
+
+
+if __name__ == '__main__':
+    # Load data
+    df = load_books()
+
+    results, recomputed = write_report(
+        SECTIONS, df, 'deep', 'deep_insights.txt', 'deep_insights.json',
+        heading="📊 DEEP DATA ANALYSIS - IMPRESSIVE INSIGHTS", footer="✅ ANALYSIS COMPLETE")
+    print(f"✅ Saved deep_insights.txt / .json ({len(recomputed)} of {len(SECTIONS)} sections recomputed)")
@@ -1,80 +1,121 @@
+"""
+Dataset Overview
+Structured sections written to analysis_output.json, with analysis_output.txt rendered from them
+"""
 import pandas as pd
 import sys
+import os
 
-# Redirect output to file
-sys.stdout = open('analysis_output.txt', 'w', encoding='utf-8')
-
-# Load the dataset
-df = pd.read_csv('google_books_dataset.csv')
-
-print("=" * 70)
-print("BOOKS DATASET - COMPREHENSIVE OVERVIEW")
-print("=" * 70)
-
-print(f"\n📚 Total Books: {len(df):,}")
-print(f"📊 Total Columns: {len(df.columns)}")
-
-print("\n" + "-" * 70)
-print("COLUMNS & DATA TYPES")
-print("-" * 70)
-for col in df.columns:
-    dtype = df[col].dtype
-    non_null = df[col].notna().sum()
-    print(f"  {col:<20} | {str(dtype):<10} | {non_null:,} non-null values")
-
-print("\n" + "-" * 70)
-print("MISSING VALUES SUMMARY")
-print("-" * 70)
-for col in df.columns:
-    missing = df[col].isna().sum()
-    pct = (missing / len(df)) * 100
-    if missing > 0:
-        print(f"  {col:<20} | {missing:>6,} missing ({pct:.1f}%)")
-
-print("\n" + "-" * 70)
-print("NUMERICAL COLUMNS STATISTICS")
-print("-" * 70)
-numerical_cols = ['page_count', 'average_rating', 'ratings_count', 'list_price']
-for col in numerical_cols:
-    if col in df.columns:
-        print(f"\n  {col}:")
-        print(f"    Min: {df[col].min()}")
-        print(f"    Max: {df[col].max()}")
-        print(f"    Mean: {df[col].mean():.2f}")
-        print(f"    Median: {df[col].median():.2f}")
-
-print("\n" + "-" * 70)
-print("CATEGORICAL INSIGHTS")
-print("-" * 70)
-
-print(f"\n  Unique Categories: {df['search_category'].nunique()}")
-print(f"  Unique Languages: {df['language'].nunique()}")
-print(f"  Unique Publishers: {df['publisher'].nunique():,}")
-
-print("\n  TOP 15 CATEGORIES:")
-for cat, count in df['search_category'].value_counts().head(15).items():
-    print(f"    {cat}: {count}")
-
-print("\n  TOP 10 LANGUAGES:")
-for lang, count in df['language'].value_counts().head(10).items():
-    print(f"    {lang}: {count}")
-
-print("\n  TOP 10 PUBLISHERS:")
-for pub, count in df['publisher'].value_counts().head(10).items():
-    print(f"    {pub}: {count}")
-
-print("\n" + "-" * 70)
-print("RATINGS DISTRIBUTION")
-print("-" * 70)
-rating_bins = [0, 1, 2, 3, 4, 5]
-df['rating_bin'] = pd.cut(df['average_rating'], bins=rating_bins, labels=['0-1', '1-2', '2-3', '3-4', '4-5'])
-print(df['rating_bin'].value_counts().sort_index().to_string())
-
-print("\n" + "-" * 70)
-print("SAMPLE DATA (First 3 rows)")
-print("-" * 70)
-print(df[['title', 'authors', 'average_rating', 'page_count', 'search_category']].head(3).to_string())
-
-print("\n" + "=" * 70)
-print("ANALYSIS COMPLETE!")
-print("=" * 70)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from insights import Section, write_report
+
+NUMERICAL_COLS = ['page_count', 'average_rating', 'ratings_count', 'list_price']
+SAMPLE_COLS = ['title', 'authors', 'average_rating', 'page_count', 'search_category']
+RATING_LABELS = ['0-1', '1-2', '2-3', '3-4', '4-5']
+
+
+# =============================================================================
+# SECTIONS
+# =============================================================================
+def summary(df):
+    return {'books': len(df), 'columns': len(df.columns)}
+
+
+def render_summary(r):
+    return ['', f"📚 Total Books: {r['books']:,}", f"📊 Total Columns: {r['columns']}"]
+
+
+def columns(df):
+    return {'columns': [[col, str(df[col].dtype), int(df[col].notna().sum())] for col in df.columns]}
+
+
+def render_columns(r):
+    return [f"  {col:<20} | {dtype:<10} | {non_null:,} non-null values" for col, dtype, non_null in r['columns']]
+
+
+def missing(df):
+    counts = df.isna().sum()
+    return {'missing': [[col, int(n), n / len(df) * 100] for col, n in counts.items() if n > 0]}
+
+
+def render_missing(r):
+    return [f"  {col:<20} | {n:>6,} missing ({pct:.1f}%)" for col, n, pct in r['missing']]
+
+
+def numerical(df):
+    return {col: {'min': df[col].min(), 'max': df[col].max(),
+                  'mean': df[col].mean(), 'median': df[col].median()}
+            for col in NUMERICAL_COLS if col in df.columns}
+
+
+def render_numerical(r):
+    lines = []
+    for col, stats in r.items():
+        lines += ['', f"  {col}:", f"    Min: {stats['min']}", f"    Max: {stats['max']}",
+                  f"    Mean: {stats['mean']:.2f}", f"    Median: {stats['median']:.2f}"]
+    return lines
+
+
+def categorical(df):
+    return {
+        'unique': {'categories': df['search_category'].nunique(), 'languages': df['language'].nunique(),
+                   'publishers': df['publisher'].nunique()},
+        'top_categories': df['search_category'].value_counts().head(15),
+        'top_languages': df['language'].value_counts().head(10),
+        'top_publishers': df['publisher'].value_counts().head(10),
+    }
+
+
+def render_categorical(r):
+    lines = ['', f"  Unique Categories: {r['unique']['categories']}",
+             f"  Unique Languages: {r['unique']['languages']}",
+             f"  Unique Publishers: {r['unique']['publishers']:,}"]
+    for heading, key in (('TOP 15 CATEGORIES', 'top_categories'), ('TOP 10 LANGUAGES', 'top_languages'),
+                         ('TOP 10 PUBLISHERS', 'top_publishers')):
+        lines += ['', f"  {heading}:"] + [f"    {name}: {count}" for name, count in r[key]]
+    return lines
+
+
+def ratings(df):
+    bins = pd.cut(df['average_rating'], bins=[0, 1, 2, 3, 4, 5], labels=RATING_LABELS)
+    return {'distribution': bins.value_counts().sort_index()}
+
+
+def render_ratings(r):
+    counts = pd.Series(dict(r['distribution']), name='count').rename_axis('rating_bin')
+    return [counts.to_string()]
+
+
+def sample(df):
+    head = df[SAMPLE_COLS].head(3)
+    numeric = {col: str(dtype) for col, dtype in head.dtypes.items() if dtype.kind in 'fiub'}
+    return {'index': head.index.tolist(), 'rows': head.to_dict(orient='records'), 'numeric': numeric}
+
+
+def render_sample(r):
+    # Integer columns come back from JSON as plain ints; restore the sampled dtypes
+    rows = pd.DataFrame(r['rows'], index=r['index'], columns=SAMPLE_COLS).astype(r['numeric'])
+    return [rows.to_string()]
+
+
+SECTIONS = [
+    Section('summary', None, None, summary, render_summary),
+    Section('columns', 'COLUMNS & DATA TYPES', None, columns, render_columns),
+    Section('missing_values', 'MISSING VALUES SUMMARY', None, missing, render_missing),
+    Section('numerical', 'NUMERICAL COLUMNS STATISTICS', NUMERICAL_COLS, numerical, render_numerical),
+    Section('categorical', 'CATEGORICAL INSIGHTS', ['search_category', 'language', 'publisher'],
+            categorical, render_categorical),
+    Section('ratings', 'RATINGS DISTRIBUTION', ['average_rating'], ratings, render_ratings),
+    Section('sample', 'SAMPLE DATA (First 3 rows)', SAMPLE_COLS, sample, render_sample),
+]
+
+
+if __name__ == '__main__':
+    # Load the dataset
+    df = pd.read_csv('google_books_dataset.csv')
+
+    results, recomputed = write_report(
+        SECTIONS, df, 'overview', 'analysis_output.txt', 'analysis_output.json',
+        heading='BOOKS DATASET - COMPREHENSIVE OVERVIEW', footer='ANALYSIS COMPLETE!',
+        width=70, section_rule='-')
+    print(f"✅ Saved analysis_output.txt / .json ({len(recomputed)} of {len(SECTIONS)} sections recomputed)")
@@ -7,11 +7,16 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import os
+from aggregates import load_aggregates
+from snapshot import load_books
 
 plt.style.use('seaborn-v0_8-darkgrid')
 
 # Load data
-df = pd.read_csv('../google_books_dataset.csv')
+df = load_books()
+
+# Persisted quantile sketches of the snapshot, outliers excluded like the charts below
+aggs = load_aggregates()
 
 # Create figure with subplots
 fig = plt.figure(figsize=(18, 14))
@@ -27,6 +32,7 @@ stats_text = f"""
 📊 KEY STATISTICS
 
 Total Books: {len(df):,}
+Unique Works: {df['work_id'].nunique():,}
 Categories: {df['search_category'].nunique()}
 Languages: {df['language'].nunique()}
 Publishers: {df['publisher'].nunique():,}
@@ -64,10 +70,10 @@ ax3.set_title('🌍 Language Split', fontsize=12, fontweight='bold')
 
 # 4. Page Count Distribution (middle left)
 ax4 = fig.add_subplot(gs[1, 0:2])
-df_pages = df[(df['page_count'] > 0) & (df['page_count'] < 1500)]
+df_pages = df[(df['page_count'] > 0) & ~df['is_outlier_page_count']]
 ax4.hist(df_pages['page_count'], bins=40, color='#9b59b6', edgecolor='white', alpha=0.8)
 ax4.axvline(df_pages['page_count'].mean(), color='#e74c3c', linestyle='--', linewidth=2, label=f'Mean: {df_pages["page_count"].mean():.0f}')
-ax4.axvline(df_pages['page_count'].median(), color='#2ecc71', linestyle='--', linewidth=2, label=f'Median: {df_pages["page_count"].median():.0f}')
+ax4.axvline(aggs.median('page_count'), color='#2ecc71', linestyle='--', linewidth=2, label=f'Median: {aggs.median("page_count"):.0f}')
 ax4.set_xlabel('Page Count', fontsize=10)
 ax4.set_ylabel('Books', fontsize=10)
 ax4.set_title('📖 Page Count Distribution', fontsize=12, fontweight='bold')
@@ -5,10 +5,8 @@ Analyzes what makes books popular using ML clustering
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
 import os
+from snapshot import load_books
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,18 +17,14 @@ data_path = os.path.join(project_dir, 'google_books_dataset.csv')
 output_path = os.path.join(project_dir, 'graphs', '11_popularity_analysis.png')
 
 print("Loading data...")
-df = pd.read_csv(data_path)
+df = load_books(data_path)
 
 # Clean
 df['page_count'] = pd.to_numeric(df['page_count'], errors='coerce').fillna(300)
 df = df[df['page_count'] > 0]
-df = df[df['page_count'] < 2000]  # Remove outliers
+df = df[~df['is_outlier_page_count']]  # Remove per-category outliers
 
-# Feature engineering
-df['title_length'] = df['title'].fillna('').apply(len)
-df['has_subtitle'] = df['subtitle'].notna().astype(int)
-df['has_description'] = df['description'].notna().astype(int)
-df['title_words'] = df['title'].fillna('').apply(lambda x: len(x.split()))
+# Feature columns (title_length, has_subtitle, ...) come precomputed in the snapshot
 
 # Get top categories for analysis
 category_counts = df['categories'].value_counts().head(10)
@@ -2,13 +2,14 @@
 12 - Category Clustering
 Groups books by features using K-Means
 """
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
 import os
+import sys
+from clustering import kmeans_sweep, sweep_scores
+from projection import fit_projection, project
+from cluster_model import FEATURES, ClusterPipeline, clean_for_clustering, current_pipeline
+from snapshot import dataset_hash, load_books
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,36 +20,36 @@ data_path = os.path.join(project_dir, 'google_books_dataset.csv')
 output_path = os.path.join(project_dir, 'graphs', '12_category_clustering.png')
 
 print("Loading data...")
-df = pd.read_csv(data_path)
+df = clean_for_clustering(load_books(data_path))
 
-# Clean
-df = df.dropna(subset=['average_rating', 'page_count'])
-df = df[df['average_rating'] > 0]
-df['page_count'] = pd.to_numeric(df['page_count'], errors='coerce').fillna(200)
-df['ratings_count'] = pd.to_numeric(df['ratings_count'], errors='coerce').fillna(0)
-df['title_length'] = df['title'].fillna('').apply(len)
+K_range = range(2, 8)
+n_clusters = 5
 
-features = ['average_rating', 'page_count', 'ratings_count', 'title_length']
-X = df[features].fillna(0)
+# Reuse the pipeline saved for this dataset snapshot unless --refit is passed
+pipeline = None if '--refit' in sys.argv else current_pipeline()
 
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+if pipeline is None:
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(df[FEATURES].fillna(0))
 
-# Elbow
-inertias = []
-K_range = range(2, 8)
-for k in K_range:
-    km = KMeans(n_clusters=k, random_state=42, n_init=10)
-    km.fit(X_scaled)
-    inertias.append(km.inertia_)
+    # Elbow (all K fitted in parallel; MiniBatch mode kicks in for large catalogues)
+    print(f"Fitting K={K_range.start}..{K_range.stop - 1} in parallel...")
+    models = kmeans_sweep(X_scaled, K_range)
+    scores = sweep_scores(X_scaled, models)
+    kmeans = models[n_clusters]
+    pca = fit_projection(X_scaled)
+else:
+    print(f"Reusing saved pipeline from {pipeline.created_at}...")
+    X_scaled = pipeline.transform(df)
+    kmeans, pca, scores = pipeline.kmeans, pipeline.pca, pipeline.scores
 
-n_clusters = 5
-print(f"Clustering with {n_clusters} clusters...")
-kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-df['Cluster'] = kmeans.fit_predict(X_scaled)
+inertias = [scores[k]['inertia'] for k in K_range]
+
+print(f"Clustering with {n_clusters} clusters "
+      f"(sampled silhouette: {scores[n_clusters]['silhouette']:.3f})...")
+df['Cluster'] = kmeans.predict(X_scaled)
 
-pca = PCA(n_components=2)
-X_pca = pca.fit_transform(X_scaled)
+X_pca = project(pca, X_scaled)
 df['pca1'] = X_pca[:, 0]
 df['pca2'] = X_pca[:, 1]
 
@@ -76,6 +77,11 @@ if len(remaining) > 2:
 
 df['Cluster_Name'] = df['Cluster'].map(cluster_names)
 
+if pipeline is None:
+    pipeline = ClusterPipeline(scaler, kmeans, pca, cluster_names, dataset_hash(data_path), scores)
+    pipeline.set_baseline(X_scaled)
+    print(f"Saved model: {pipeline.save()}")
+
 colors = ['#ff6b6b', '#4ecdc4', '#ffd93d', '#45b7d1', '#96ceb4']
 
 # Create visualization
@@ -0,0 +1,162 @@
+"""
+Aggregate Pass
+Builds mergeable per-column and per-category summaries in one pass over the data
+"""
+import os
+import json
+from collections import Counter
+import pandas as pd
+from quantiles import TDigest
+from snapshot import cache_dir, data_path, dataset_hash, load_books
+
+# Bump when what goes into the sketches changes so persisted aggregates are rebuilt
+AGGREGATES_VERSION = 2
+
+# Column -> validity filter applied before values reach the sketches
+SKETCH_COLUMNS = {
+    'list_price': lambda s: s > 0,
+    'page_count': lambda s: s > 0,
+    'average_rating': lambda s: s.notna(),
+}
+
+# Snapshot flag columns: flagged rows are left out of the sketches, as they are out of the charts
+OUTLIER_FLAGS = {'list_price': 'is_outlier_list_price', 'page_count': 'is_outlier_page_count'}
+
+# Columns whose value counts are kept exactly (books per category / language)
+COUNT_COLUMNS = ['search_category', 'language']
+
+
+class BookAggregates:
+    """Summaries that can be built chunk by chunk and merged across processes"""
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.count = 0
+        self.digests = {col: TDigest(compression) for col in SKETCH_COLUMNS}
+        self.category_digests = {col: {} for col in SKETCH_COLUMNS}
+        self.sums = {col: 0.0 for col in SKETCH_COLUMNS}
+        self.value_counts = {col: Counter() for col in COUNT_COLUMNS}
+
+    def update(self, chunk):
+        self.count += len(chunk)
+        for col in COUNT_COLUMNS:
+            self.value_counts[col].update(chunk[col].value_counts().to_dict())
+        for col, valid in SKETCH_COLUMNS.items():
+            values = pd.to_numeric(chunk[col], errors='coerce')
+            mask = valid(values) & values.notna()
+            if OUTLIER_FLAGS.get(col) in chunk.columns:
+                mask &= ~chunk[OUTLIER_FLAGS[col]].astype(bool)
+            values = values[mask]
+            if values.empty:
+                continue
+            self.digests[col].update(values.to_numpy())
+            self.sums[col] += float(values.sum())
+
+            per_cat = self.category_digests[col]
+            cats = chunk.loc[mask, 'search_category']
+            for cat, idx in cats.groupby(cats, sort=False).indices.items():
+                if cat not in per_cat:
+                    per_cat[cat] = TDigest(self.compression)
+                per_cat[cat].update(values.to_numpy()[idx])
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        for col in COUNT_COLUMNS:
+            self.value_counts[col].update(other.value_counts[col])
+        for col in SKETCH_COLUMNS:
+            self.sums[col] += other.sums[col]
+            self.digests[col].merge(other.digests[col])
+            per_cat = self.category_digests[col]
+            for cat, digest in other.category_digests[col].items():
+                if cat not in per_cat:
+                    per_cat[cat] = TDigest(self.compression)
+                per_cat[cat].merge(digest)
+        return self
+
+    def digest(self, column, category=None):
+        if category is None:
+            return self.digests[column]
+        return self.category_digests[column].get(category, TDigest(self.compression))
+
+    def quantile(self, column, q, category=None):
+        return self.digest(column, category).quantile(q)
+
+    def median(self, column, category=None):
+        return self.quantile(column, 0.5, category)
+
+    def mean(self, column):
+        """Exact mean of the valid values (running sum over the digest's count)"""
+        n = self.digests[column].count
+        return self.sums[column] / n if n else float('nan')
+
+    def box_stats(self, column, categories, labels=None):
+        labels = labels or categories
+        return [self.digest(column, cat).box_stats(label) for cat, label in zip(categories, labels)]
+
+    def to_dict(self):
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'sums': self.sums,
+            'value_counts': {col: dict(counts) for col, counts in self.value_counts.items()},
+            'digests': {col: d.to_dict() for col, d in self.digests.items()},
+            'category_digests': {
+                col: {cat: d.to_dict() for cat, d in per_cat.items()}
+                for col, per_cat in self.category_digests.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggs = cls(compression=data['compression'])
+        aggs.count = data['count']
+        aggs.sums = dict(data['sums'])
+        aggs.value_counts = {col: Counter(counts) for col, counts in data['value_counts'].items()}
+        aggs.digests = {col: TDigest.from_dict(d) for col, d in data['digests'].items()}
+        aggs.category_digests = {
+            col: {cat: TDigest.from_dict(d) for cat, d in per_cat.items()}
+            for col, per_cat in data['category_digests'].items()
+        }
+        return aggs
+
+
+def build_aggregates(df, chunksize=100_000):
+    """Aggregate an in-memory frame chunk by chunk"""
+    aggs = BookAggregates()
+    for start in range(0, len(df), chunksize):
+        aggs.update(df.iloc[start:start + chunksize])
+    return aggs
+
+
+def aggregates_path(data_hash):
+    return os.path.join(cache_dir, f'aggregates_{data_hash[:16]}_v{AGGREGATES_VERSION}.json')
+
+
+def load_aggregates(path=data_path):
+    """Aggregates of the full snapshot, built once per dataset version and read back from disk"""
+    target = aggregates_path(dataset_hash(path))
+    if os.path.exists(target):
+        with open(target, encoding='utf-8') as f:
+            return BookAggregates.from_dict(json.load(f))
+    aggs = build_aggregates(load_books(path))
+    save_aggregates(aggs, dataset_hash(path))
+    return aggs
+
+
+def save_aggregates(aggs, data_hash):
+    """Persist aggregates for one dataset version; ingest.py calls this after each delta"""
+    target = aggregates_path(data_hash)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(aggs.to_dict(), f)
+    os.replace(tmp, target)
+
+
+if __name__ == '__main__':
+    aggs = load_aggregates()
+    print(f"📊 Aggregated {aggs.count:,} books")
+    for col in SKETCH_COLUMNS:
+        pcts = aggs.digests[col].percentiles()
+        print(f"   {col}: " + ', '.join(f"p{p}={v:.2f}" for p, v in pcts.items()))
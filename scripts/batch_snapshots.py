@@ -0,0 +1,133 @@
+"""
+Snapshot Batch Mode
+Aggregates many dataset scrapes in parallel and compares them, caching each snapshot's aggregates
+"""
+import os
+import sys
+import json
+from concurrent.futures import ProcessPoolExecutor
+from aggregates import BookAggregates, aggregates_path, load_aggregates
+from snapshot import dataset_hash
+
+MAX_WORKERS = os.cpu_count() or 4
+TOP_CATEGORIES = 5
+DELTA_FIELDS = ['books', 'categories', 'languages', 'mean_rating', 'median_price', 'median_pages']
+
+
+def _aggregate(path):
+    """Worker: one CSV -> its snapshot (outlier flags included) -> persisted aggregates"""
+    return load_aggregates(path).to_dict()
+
+
+def load_partials(paths, max_workers=MAX_WORKERS):
+    """BookAggregates per path, in order; only snapshots not seen before are read.
+
+    Returns (partials, built) where built lists the paths aggregated on this run.
+    Each snapshot goes through the same outlier stage and persisted aggregates
+    (aggregates_path) as the dashboard, so their numbers agree. Snapshots are
+    keyed by content hash, so renamed or duplicated files cost nothing.
+    """
+    hashes = [dataset_hash(path) for path in paths]
+    data, todo = {}, {}
+    for path, h in zip(paths, hashes):
+        if h in data or h in todo:
+            continue
+        target = aggregates_path(h)
+        if os.path.exists(target):
+            with open(target, encoding='utf-8') as f:
+                data[h] = json.load(f)
+        else:
+            todo[h] = path
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(todo))) as pool:
+            futures = {h: pool.submit(_aggregate, path) for h, path in todo.items()}
+            for h, future in futures.items():
+                data[h] = future.result()
+
+    partials = [BookAggregates.from_dict(data[h]) for h in hashes]
+    return partials, list(todo.values())
+
+
+def summarize(aggs):
+    """Headline numbers from one set of aggregates"""
+    categories = aggs.value_counts['search_category']
+    return {
+        'books': aggs.count,
+        'categories': len(categories),
+        'languages': len(aggs.value_counts['language']),
+        'mean_rating': aggs.mean('average_rating'),
+        'median_rating': aggs.median('average_rating'),
+        'rated_books': aggs.digests['average_rating'].count,
+        'mean_price': aggs.mean('list_price'),
+        'median_price': aggs.median('list_price'),
+        'median_pages': aggs.median('page_count'),
+        'top_categories': categories.most_common(TOP_CATEGORIES),
+    }
+
+
+def compare(before, after):
+    """What changed from one snapshot to the next.
+
+    Snapshots are scrapes of the same catalogue, so their rows overlap; they are
+    compared against each other rather than added up.
+    """
+    old, new = summarize(before), summarize(after)
+    old_cats = set(before.value_counts['search_category'])
+    new_cats = set(after.value_counts['search_category'])
+    change = {field: new[field] - old[field] for field in DELTA_FIELDS}
+    change['added_categories'] = sorted(new_cats - old_cats)
+    change['dropped_categories'] = sorted(old_cats - new_cats)
+    return change
+
+
+def run_batch(paths, max_workers=MAX_WORKERS):
+    """Per-snapshot summaries for a list of CSV snapshots, each with its change from the previous one"""
+    partials, built = load_partials(paths, max_workers)
+    snapshots = []
+    for i, (path, aggs) in enumerate(zip(paths, partials)):
+        snapshots.append({'snapshot': os.path.splitext(os.path.basename(path))[0], **summarize(aggs),
+                          'change': compare(partials[i - 1], aggs) if i else None})
+    return {'snapshots': snapshots, 'built': built}
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    out = None
+    if '--json' in args:
+        i = args.index('--json')
+        out = args[i + 1]
+        args = args[:i] + args[i + 2:]
+    if not args:
+        print("Usage: python batch_snapshots.py SNAPSHOT.csv [SNAPSHOT.csv ...] [--json OUT]")
+        sys.exit(1)
+
+    print(f"📦 Aggregating {len(args)} snapshots...")
+    result = run_batch(args)
+    print(f"   {len(result['built'])} read, {len(args) - len(result['built'])} reused")
+
+    print(f"\n{'snapshot':<28} {'books':>9} {'change':>8} {'rating':>7} {'price':>8} {'pages':>6}")
+    for s in result['snapshots']:
+        change = f"{s['change']['books']:+,}" if s['change'] else ''
+        print(f"{s['snapshot'][:28]:<28} {s['books']:>9,} {change:>8} {s['mean_rating']:>7.2f} "
+              f"{s['median_price']:>8.2f} {s['median_pages']:>6.0f}")
+
+    if len(result['snapshots']) > 1:
+        print("\n🔄 Changes between snapshots:")
+    for prev, s in zip(result['snapshots'], result['snapshots'][1:]):
+        c = s['change']
+        print(f"   {prev['snapshot']} → {s['snapshot']}: {c['books']:+,} books, "
+              f"rating {c['mean_rating']:+.2f}, median price {c['median_price']:+.2f}, "
+              f"median pages {c['median_pages']:+.0f}, languages {c['languages']:+}")
+        for label, cats in (('added', c['added_categories']), ('dropped', c['dropped_categories'])):
+            if cats:
+                more = f" (+{len(cats) - TOP_CATEGORIES} more)" if len(cats) > TOP_CATEGORIES else ''
+                print(f"      Categories {label}: {', '.join(cats[:TOP_CATEGORIES])}{more}")
+    latest = result['snapshots'][-1]
+    print(f"\n📊 Latest ({latest['snapshot']}) top categories: "
+          + ', '.join(f"{cat} ({n:,})" for cat, n in latest['top_categories']))
+
+    if out:
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"✅ Saved {out}")
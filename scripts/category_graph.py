@@ -0,0 +1,113 @@
+"""
+Category Co-occurrence Graph
+Sparse Google categories x search_category counts, PMI/lift scores and connected components
+"""
+import pandas as pd
+import numpy as np
+from scipy.sparse import coo_matrix, bmat
+from scipy.sparse.csgraph import connected_components
+from snapshot import load_books
+
+
+def _book_labels(df, col, split=False):
+    """(book positions, label codes, labels) for one category column, one entry per (book, label)"""
+    values = df[col].reset_index(drop=True)
+    if split:
+        values = values.str.split(',').explode().str.strip()
+    values = values[values.notna() & (values != '')]
+    codes, labels = pd.factorize(values)
+    return values.index.to_numpy(), codes, labels
+
+
+def _incidence(rows, codes, n_books, n_labels):
+    data = np.ones(len(rows), dtype=np.int32)
+    return coo_matrix((data, (rows, codes)), shape=(n_books, n_labels)).tocsr()
+
+
+class CategoryGraph:
+    """Book x label incidence matrices for both category dimensions and their co-occurrence"""
+
+    def __init__(self, df):
+        n = len(df)
+        rows, codes, self.google = _book_labels(df, 'categories', split=True)
+        self.books_google = _incidence(rows, codes, n, len(self.google))
+        self.books_google.data[:] = 1  # a label repeated within one book counts once
+        rows, codes, self.search = _book_labels(df, 'search_category')
+        self.books_search = _incidence(rows, codes, n, len(self.search))
+
+        # counts[g, s] = books carrying Google label g that were crawled under s
+        self.counts = (self.books_google.T @ self.books_search).tocsr()
+        self.n_books = n
+
+    def lift(self):
+        """P(g, s) / (P(g) P(s)) on the non-zero cells only, so the result stays sparse"""
+        counts = self.counts.tocoo()
+        g_totals = np.asarray(self.books_google.sum(axis=0)).ravel()
+        s_totals = np.asarray(self.books_search.sum(axis=0)).ravel()
+        values = counts.data * self.n_books / (g_totals[counts.row] * s_totals[counts.col])
+        return coo_matrix((values, (counts.row, counts.col)), shape=counts.shape).tocsr()
+
+    def pmi(self):
+        lift = self.lift()
+        lift.data = np.log2(lift.data)
+        return lift
+
+    def top_pairs(self, k=20, min_count=5, by='pmi'):
+        """Strongest (Google label, search_category) associations"""
+        counts = self.counts.tocoo()
+        scores = self.pmi() if by == 'pmi' else self.lift()
+        table = pd.DataFrame({
+            'categories': self.google[counts.row],
+            'search_category': self.search[counts.col],
+            'count': counts.data,
+            by: np.asarray(scores[counts.row, counts.col]).ravel(),
+        })
+        table = table[table['count'] >= min_count]
+        return table.nlargest(k, by).reset_index(drop=True)
+
+    def category_components(self, min_lift=2.0, min_count=5):
+        """Clusters of labels joined by strong (lift, count) associations, via csgraph.
+
+        Nodes are Google labels followed by search categories; returns a
+        Series of component ids indexed by (dimension, label).
+        """
+        lift = self.lift().tocoo()
+        keep = (lift.data >= min_lift) & (np.asarray(self.counts[lift.row, lift.col]).ravel() >= min_count)
+        strong = coo_matrix((np.ones(keep.sum(), dtype=np.int8), (lift.row[keep], lift.col[keep])),
+                            shape=lift.shape)
+        graph = bmat([[None, strong], [strong.T, None]])
+        _, labels = connected_components(graph, directed=False)
+        index = pd.MultiIndex.from_arrays([
+            ['categories'] * len(self.google) + ['search_category'] * len(self.search),
+            list(self.google) + list(self.search)])
+        return pd.Series(labels, index=index, name='component')
+
+    def book_components(self):
+        """Component id per book in the book-to-book shared-category graph.
+
+        The book x book graph is never built: components of the bipartite
+        book-label graph are the same, and it only has one edge per label.
+        """
+        incidence = bmat([[self.books_google, self.books_search]]).tocsr()
+        graph = bmat([[None, incidence], [incidence.T, None]])
+        _, labels = connected_components(graph, directed=False)
+        return labels[:self.n_books]
+
+
+if __name__ == '__main__':
+    graph = CategoryGraph(load_books())
+    print(f"🕸️  {len(graph.google)} Google labels x {len(graph.search)} search categories "
+          f"({graph.counts.nnz:,} non-zero pairs)")
+
+    print("\n🔗 STRONGEST ASSOCIATIONS (PMI, min 5 books):")
+    for _, row in graph.top_pairs(k=15).iterrows():
+        print(f"   {row['categories'][:30]} ↔ {row['search_category'][:30]}: "
+              f"PMI {row['pmi']:.2f} ({row['count']} books)")
+
+    components = graph.category_components()
+    sizes = components.value_counts()
+    print(f"\n🧩 Category clusters (lift ≥ 2): {(sizes > 1).sum()} multi-label clusters, "
+          f"largest has {sizes.max()} labels")
+
+    books = pd.Series(graph.book_components())
+    print(f"📚 Book components sharing any category: {books.nunique():,}")
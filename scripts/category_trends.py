@@ -0,0 +1,107 @@
+"""
+Category x Year Cube
+Prefix sums of book counts per search_category and year for constant-time window queries
+"""
+import pandas as pd
+import numpy as np
+from snapshot import load_books
+
+
+class CategoryYearCube:
+    """Dense (category, year) count cube with cumulative sums along the year axis.
+
+    prefix[c, j] holds the number of books in category c published before
+    year first_year + j, so any [start, end] window is a single subtraction.
+    """
+
+    def __init__(self, categories, first_year, counts):
+        self.categories = pd.Index(categories)
+        self.first_year = first_year
+        self.last_year = first_year + counts.shape[1] - 1
+        self.counts = counts
+        self.prefix = np.zeros((counts.shape[0], counts.shape[1] + 1), dtype=np.int64)
+        np.cumsum(counts, axis=1, out=self.prefix[:, 1:])
+
+    @classmethod
+    def from_frame(cls, df, first_year=1900, last_year=2025):
+        year = df['year'].to_numpy(dtype='float64', na_value=np.nan)
+        codes, categories = pd.factorize(df['search_category'])
+        # factorize codes a missing category as -1, which bincount cannot take
+        in_range = (year >= first_year) & (year <= last_year) & (codes >= 0)
+        codes, year = codes[in_range], year[in_range].astype(np.int64)
+
+        n_years = last_year - first_year + 1
+        flat = np.bincount(codes * n_years + (year - first_year), minlength=len(categories) * n_years)
+        return cls(categories, first_year, flat.reshape(len(categories), n_years))
+
+    def merge(self, other):
+        """Cube over the books of both cubes (same year range); categories are unioned"""
+        if (other.first_year, other.last_year) != (self.first_year, self.last_year):
+            raise ValueError('cubes cover different years')
+        categories = self.categories.append(other.categories.difference(self.categories, sort=False))
+        counts = np.zeros((len(categories), self.counts.shape[1]), dtype=np.int64)
+        counts[:len(self.categories)] = self.counts
+        counts[categories.get_indexer(other.categories)] += other.counts
+        return CategoryYearCube(categories, self.first_year, counts)
+
+    def _column(self, year):
+        return int(np.clip(year - self.first_year, 0, self.counts.shape[1]))
+
+    def _rows(self, categories):
+        if categories is None:
+            return slice(None)
+        return self.categories.get_indexer(categories)
+
+    def window(self, start, end, categories=None):
+        """Books per category published in [start, end] (inclusive)"""
+        rows = self._rows(categories)
+        counts = self.prefix[rows, self._column(end + 1)] - self.prefix[rows, self._column(start)]
+        index = self.categories if categories is None else pd.Index(categories)
+        return pd.Series(counts, index=index)
+
+    def growth(self, old, new, categories=None, min_base=10):
+        """Percent growth from the old (start, end) window to the new one"""
+        before = self.window(*old, categories=categories)
+        after = self.window(*new, categories=categories)
+        keep = (before > min_base) & (after > 0)
+        return ((after[keep] - before[keep]) / before[keep] * 100).sort_values(ascending=False)
+
+    def cagr(self, old, new, categories=None, min_base=10):
+        """Compound annual growth between two windows, spaced by their start years"""
+        before = self.window(*old, categories=categories)
+        after = self.window(*new, categories=categories)
+        keep = (before > min_base) & (after > 0)
+        years = new[0] - old[0]
+        return ((after[keep] / before[keep]) ** (1 / years) - 1).sort_values(ascending=False)
+
+    def rolling(self, width):
+        """Trailing width-year totals for every category and end year"""
+        totals = self.prefix[:, width:] - self.prefix[:, :-width]
+        years = np.arange(self.first_year + width - 1, self.last_year + 1)
+        return pd.DataFrame(totals, index=self.categories, columns=years)
+
+    def growth_sweep(self, width=10):
+        """Growth of each width-year window over the one before it, for every window at once"""
+        rolled = self.rolling(width).to_numpy()
+        before, after = rolled[:, :-width], rolled[:, width:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(before > 0, (after - before) / before * 100, np.nan)
+        years = np.arange(self.first_year + 2 * width - 1, self.last_year + 1)
+        return pd.DataFrame(pct, index=self.categories, columns=years)
+
+
+def build_cube(df=None):
+    return CategoryYearCube.from_frame(load_books() if df is None else df)
+
+
+if __name__ == '__main__':
+    cube = build_cube()
+    print(f"📦 Cube: {len(cube.categories)} categories x {cube.first_year}-{cube.last_year}")
+
+    print("\n🚀 FASTEST GROWING CATEGORIES (2020s vs 2010s):")
+    for cat, growth in cube.growth((2010, 2019), (2020, 2029)).head(10).items():
+        print(f"   {cat}: {growth:+.1f}% growth")
+
+    print("\n📈 HIGHEST CAGR (2000s -> 2010s):")
+    for cat, rate in cube.cagr((2000, 2009), (2010, 2019)).head(10).items():
+        print(f"   {cat}: {rate * 100:+.1f}% per year")
@@ -0,0 +1,227 @@
+"""
+Chart Rendering Service
+Filtered PNGs of the 02/03/06 charts from warm worker processes, deduplicated and cached on disk
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+from charts import EmptySelection, filter_books
+from http_server import etag_matches, serve, send, send_json
+from ingest import load_log
+from snapshot import data_path, dataset_hash
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+chart_cache_dir = os.path.join(project_dir, 'cache', 'charts')
+
+# Bump when a renderer in charts.py changes so cached PNGs are not reused
+RENDER_VERSION = 1
+
+WORKERS = 2
+CACHE_BYTES = 256 * 1024 * 1024
+
+CHART_NAMES = ['ratings', 'pages', 'prices']
+QUERY_PARAMS = ['category', 'language', 'publisher', 'year_from', 'year_to']
+
+
+# =============================================================================
+# WORKERS
+# =============================================================================
+_books = None
+_aggs = None
+
+
+def _warm_worker():
+    """Runs once per worker: load the snapshot and matplotlib, then draw one throwaway chart"""
+    global _books, _aggs
+    import charts
+    from aggregates import load_aggregates
+    from snapshot import load_books
+    _books = load_books()
+    _aggs = load_aggregates()
+    try:
+        charts.render_png('ratings', _books.head(500), dpi=20)
+    except charts.EmptySelection:
+        pass
+
+
+def _ready():
+    # Held briefly so each warm-up call lands on a different worker
+    time.sleep(0.2)
+    return os.getpid()
+
+
+def _render(name, filters):
+    import charts
+    return charts.render_png(name, _books, aggs=_aggs, **filters)
+
+
+# =============================================================================
+# DISK CACHE
+# =============================================================================
+class DiskCache:
+    """PNG bytes on disk, evicted least-recently-used first once max_bytes is exceeded.
+
+    Recency is the file mtime, touched on every hit, so the order survives restarts.
+    """
+
+    def __init__(self, directory=chart_cache_dir, max_bytes=CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        files = [entry for entry in os.scandir(directory) if entry.name.endswith('.png')]
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        self.entries = OrderedDict((entry.name[:-4], entry.stat().st_size) for entry in files)
+        self.bytes = sum(self.entries.values())
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.png')
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.bytes -= self.entries.pop(key)
+            return None
+        os.utime(path)
+        self.entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.bytes += len(data) - self.entries.pop(key, 0)
+        self.entries[key] = len(data)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            oldest, size = self.entries.popitem(last=False)
+            self.bytes -= size
+            try:
+                os.remove(self._path(oldest))
+            except FileNotFoundError:
+                pass
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+class ChartService:
+    def __init__(self, workers=WORKERS, cache=None):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        self.cache = cache or DiskCache()
+        self.inflight = {}  # cache key -> future shared by identical concurrent requests
+        self.data_hash = dataset_hash(data_path)
+        self.log = load_log(data_path)
+        self.warming = None
+
+    async def warm(self):
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*[loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)])
+        return len(set(pids))
+
+    async def refresh(self):
+        """Follow a new version of the CSV (an ingest or a full rebuild): new cache keys, new workers.
+
+        The hash is memoized by file size and mtime, so an unchanged CSV costs one stat.
+        Renders already running on the old workers finish under their old keys.
+        """
+        current = await asyncio.to_thread(dataset_hash, data_path)
+        if current == self.data_hash:
+            return
+        self.data_hash = current
+        self.log = load_log(data_path)
+        old, self.pool = self.pool, ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        old.shutdown(wait=False)
+        self.warming = asyncio.create_task(self.warm())
+
+    def key(self, name, filters):
+        # Ingested deltas only change the charts whose selection takes in one of their books
+        touching = [delta['hash'] for delta in self.log['deltas']
+                    if len(filter_books(pd.DataFrame(delta['touched']), **filters))]
+        payload = json.dumps([RENDER_VERSION, self.log['base'], name, filters, touching], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    async def png(self, name, filters, key):
+        """(bytes, 'hit' | 'joined' | 'miss') for one chart"""
+        data = self.cache.get(key)
+        if data is not None:
+            return data, 'hit'
+        if key in self.inflight:
+            return await asyncio.shield(self.inflight[key]), 'joined'
+
+        future = asyncio.get_running_loop().run_in_executor(self.pool, _render, name, filters)
+        self.inflight[key] = future
+        try:
+            data = await asyncio.shield(future)
+        finally:
+            self.inflight.pop(key, None)
+        self.cache.put(key, data)
+        return data, 'miss'
+
+    async def handle(self, request, writer):
+        head_only = request.method == 'HEAD'
+        if request.method not in ('GET', 'HEAD'):
+            return await send(writer, 405, {'Allow': 'GET, HEAD'})
+        if request.path == '/charts':
+            return await send_json(writer, {'charts': CHART_NAMES, 'filters': QUERY_PARAMS},
+                                   head_only=head_only)
+
+        name = request.path.removeprefix('/chart/').removesuffix('.png')
+        if not request.path.startswith('/chart/') or name not in CHART_NAMES:
+            return await send_json(writer, {'error': 'not found'}, status=404, head_only=head_only)
+
+        unknown = set(request.query) - set(QUERY_PARAMS)
+        if unknown:
+            return await send_json(writer, {'error': f"unknown parameter(s): {', '.join(sorted(unknown))}"},
+                                   status=400, head_only=head_only)
+        filters = {param: request.query[param] for param in QUERY_PARAMS if param in request.query}
+        for param in ('year_from', 'year_to'):
+            if param in filters:
+                if not filters[param].isdigit():
+                    return await send_json(writer, {'error': f'{param} must be a year'}, status=400,
+                                           head_only=head_only)
+                filters[param] = int(filters[param])
+
+        await self.refresh()
+        key = self.key(name, filters)
+        headers = {'Content-Type': 'image/png', 'ETag': f'"{key}"', 'Cache-Control': 'public, max-age=3600'}
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and etag_matches(if_none_match, f'"{key}"'):
+            return await send(writer, 304, headers)
+
+        try:
+            data, source = await self.png(name, filters, key)
+        except EmptySelection as e:
+            return await send_json(writer, {'error': str(e)}, status=404, head_only=head_only)
+        await send(writer, 200, {**headers, 'X-Cache': source}, data, head_only)
+
+
+async def main(host='127.0.0.1', port=8002):
+    service = ChartService()
+    print(f"🎨 Warming {service.workers} render workers...")
+    print(f"   {await service.warm()} workers ready, {len(service.cache.entries)} cached charts")
+    await serve(service.handle, host, port,
+                on_start=lambda _: print(f"🖼️  Chart service on http://{host}:{port}/chart/<name>.png"))
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8002
+    try:
+        asyncio.run(main(port=port))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
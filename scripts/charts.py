@@ -0,0 +1,316 @@
+"""
+Chart Renderers
+Figure builders behind the 02/03/06 scripts, reusable on any filtered slice of the books
+"""
+import io
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+import numpy as np
+from aggregates import build_aggregates
+from topk import TopKEngine
+
+plt.style.use('seaborn-v0_8-darkgrid')
+
+# Query parameter -> column for the slices a chart can be drawn on
+CHART_FILTERS = {'category': 'search_category', 'language': 'language', 'publisher': 'publisher'}
+
+
+class EmptySelection(ValueError):
+    """The filters leave no books with the values a chart needs"""
+
+
+def _require(df, what):
+    if len(df) == 0:
+        raise EmptySelection(f'no {what} in this selection')
+
+
+def filter_books(df, category=None, language=None, publisher=None, year_from=None, year_to=None):
+    """Rows matching every given filter; unset filters are ignored"""
+    mask = pd.Series(True, index=df.index)
+    for param, value in (('category', category), ('language', language), ('publisher', publisher)):
+        if value is not None:
+            mask &= df[CHART_FILTERS[param]] == value
+    if year_from is not None:
+        mask &= df['year'] >= int(year_from)
+    if year_to is not None:
+        mask &= df['year'] <= int(year_to)
+    return df[mask.fillna(False)]
+
+
+def describe_filters(filters):
+    return ', '.join(f'{name} = {value}' for name, value in sorted(filters.items()) if value is not None)
+
+
+# =============================================================================
+# 02 RATINGS
+# =============================================================================
+def ratings_figure(df, aggs=None):
+    """Rating distribution, top categories, ratings count vs rating, rating by language.
+
+    aggs: persisted aggregates of the same books; sketched from the slice when None
+    """
+    # Filter books with ratings
+    df_rated = df[df['average_rating'].notna()].copy()
+    _require(df_rated, 'rated books')
+
+    # Quantile sketches (medians and box stats come from here)
+    if aggs is None:
+        aggs = build_aggregates(df_rated)
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+
+    # 1. Rating Distribution Histogram
+    ax1 = axes[0, 0]
+    ax1.hist(df_rated['average_rating'], bins=20, color='#3498db', edgecolor='white', alpha=0.8)
+    ax1.axvline(df_rated['average_rating'].mean(), color='#e74c3c', linestyle='--', linewidth=2, label=f'Mean: {df_rated["average_rating"].mean():.2f}')
+    ax1.axvline(aggs.median('average_rating'), color='#2ecc71', linestyle='--', linewidth=2, label=f'Median: {aggs.median("average_rating"):.2f}')
+    ax1.set_xlabel('Average Rating', fontsize=11)
+    ax1.set_ylabel('Number of Books', fontsize=11)
+    ax1.set_title('⭐ Rating Distribution', fontsize=13, fontweight='bold')
+    ax1.legend()
+
+    # 2. Top 10 Categories by Average Rating
+    ax2 = axes[0, 1]
+    # Best first from the engine; reversed so the top category sits at the top of the barh
+    category_ratings = TopKEngine(df_rated).group_top('average_rating', 'search_category', k=15, min_count=5).iloc[::-1]
+
+    colors = sns.color_palette("RdYlGn", len(category_ratings))
+    bars = ax2.barh(range(len(category_ratings)), category_ratings['average_rating'], color=colors)
+    ax2.set_yticks(range(len(category_ratings)))
+    ax2.set_yticklabels(category_ratings.index, fontsize=9)
+    ax2.set_xlabel('Average Rating', fontsize=11)
+    ax2.set_title('🏆 Top 15 Categories by Rating\n(min 5 books)', fontsize=13, fontweight='bold')
+    ax2.set_xlim(3.5, 5)
+
+    # Add value labels
+    for bar, val in zip(bars, category_ratings['average_rating']):
+        ax2.text(val + 0.02, bar.get_y() + bar.get_height()/2, f'{val:.2f}',
+                va='center', fontsize=9)
+
+    # 3. Ratings Count vs Average Rating Scatter
+    ax3 = axes[1, 0]
+    df_scatter = df_rated[df_rated['ratings_count'] > 0]
+    scatter = ax3.scatter(df_scatter['ratings_count'], df_scatter['average_rating'],
+                          alpha=0.6, c=df_scatter['average_rating'], cmap='RdYlGn',
+                          s=50, edgecolors='white', linewidth=0.5)
+    ax3.set_xlabel('Number of Ratings', fontsize=11)
+    ax3.set_ylabel('Average Rating', fontsize=11)
+    ax3.set_title('📊 Ratings Count vs Average Rating', fontsize=13, fontweight='bold')
+    fig.colorbar(scatter, ax=ax3, label='Rating')
+
+    # 4. Rating Distribution by Language (top 5 languages)
+    ax4 = axes[1, 1]
+    top_langs = df_rated['language'].value_counts().head(5).index
+    df_lang = df_rated[df_rated['language'].isin(top_langs)]
+    df_lang.boxplot(column='average_rating', by='language', ax=ax4, patch_artist=True)
+    ax4.set_xlabel('Language', fontsize=11)
+    ax4.set_ylabel('Average Rating', fontsize=11)
+    ax4.set_title('🌍 Rating Distribution by Language', fontsize=13, fontweight='bold')
+    fig.suptitle('')  # Remove automatic title
+
+    fig.tight_layout()
+    return fig
+
+
+# =============================================================================
+# 03 PAGE COUNT
+# =============================================================================
+def page_count_figure(df, aggs=None):
+    """Page count distribution, longest/shortest categories, per-category box plots.
+
+    aggs: persisted aggregates of the same books; sketched from the slice when None
+    """
+    # Filter valid page counts (non-zero, not a per-category outlier)
+    df_pages = df[(df['page_count'] > 0) & ~df['is_outlier_page_count']].copy()
+    _require(df_pages, 'books with a page count')
+
+    # Quantile sketches over the same rows as the histogram (medians and box stats come from here)
+    if aggs is None:
+        aggs = build_aggregates(df_pages)
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+
+    # 1. Page Count Distribution
+    ax1 = axes[0, 0]
+    ax1.hist(df_pages['page_count'], bins=50, color='#9b59b6', edgecolor='white', alpha=0.8)
+    ax1.axvline(df_pages['page_count'].mean(), color='#e74c3c', linestyle='--', linewidth=2,
+                label=f'Mean: {df_pages["page_count"].mean():.0f}')
+    ax1.axvline(aggs.median('page_count'), color='#2ecc71', linestyle='--', linewidth=2,
+                label=f'Median: {aggs.median("page_count"):.0f}')
+    ax1.set_xlabel('Page Count', fontsize=11)
+    ax1.set_ylabel('Number of Books', fontsize=11)
+    ax1.set_title('📖 Page Count Distribution', fontsize=13, fontweight='bold')
+    ax1.legend()
+
+    # 2. Average Page Count by Category (Top 15)
+    ax2 = axes[0, 1]
+    category_pages = df_pages.groupby('search_category')['page_count'].mean().sort_values(ascending=True).tail(15)
+    colors = sns.color_palette("magma", len(category_pages))
+    bars = ax2.barh(range(len(category_pages)), category_pages.values, color=colors)
+    ax2.set_yticks(range(len(category_pages)))
+    ax2.set_yticklabels(category_pages.index, fontsize=9)
+    ax2.set_xlabel('Average Page Count', fontsize=11)
+    ax2.set_title('📚 Longest Books by Category\n(Average Pages)', fontsize=13, fontweight='bold')
+
+    for bar, val in zip(bars, category_pages.values):
+        ax2.text(val + 5, bar.get_y() + bar.get_height()/2, f'{val:.0f}',
+                va='center', fontsize=9)
+
+    # 3. Shortest Books by Category
+    ax3 = axes[1, 0]
+    category_pages_short = df_pages.groupby('search_category')['page_count'].mean().sort_values().head(15)
+    colors = sns.color_palette("cool", len(category_pages_short))
+    bars = ax3.barh(range(len(category_pages_short)), category_pages_short.values, color=colors)
+    ax3.set_yticks(range(len(category_pages_short)))
+    ax3.set_yticklabels(category_pages_short.index, fontsize=9)
+    ax3.set_xlabel('Average Page Count', fontsize=11)
+    ax3.set_title('📄 Shortest Books by Category\n(Average Pages)', fontsize=13, fontweight='bold')
+
+    for bar, val in zip(bars, category_pages_short.values):
+        ax3.text(val + 2, bar.get_y() + bar.get_height()/2, f'{val:.0f}',
+                va='center', fontsize=9)
+
+    # 4. Page Count Box Plot by Top Categories
+    ax4 = axes[1, 1]
+    top_cats = df_pages['search_category'].value_counts().head(8).index
+
+    # Create box plot from the per-category sketches
+    box_stats = aggs.box_stats('page_count', top_cats,
+                               labels=[cat[:15] + '...' if len(cat) > 15 else cat for cat in top_cats])
+    bp = ax4.bxp(box_stats, patch_artist=True, showfliers=False)
+
+    # Color the boxes
+    colors = sns.color_palette("Set2", len(top_cats))
+    for patch, color in zip(bp['boxes'], colors):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+
+    ax4.set_xlabel('Category', fontsize=11)
+    ax4.set_ylabel('Page Count', fontsize=11)
+    ax4.set_title('📊 Page Count Distribution by Category', fontsize=13, fontweight='bold')
+    ax4.tick_params(axis='x', rotation=45)
+
+    fig.tight_layout()
+    return fig
+
+
+# =============================================================================
+# 06 PRICE
+# =============================================================================
+def price_figure(df, aggs=None):
+    """Price distribution, most expensive/affordable categories, price vs page count.
+
+    aggs: persisted aggregates of the same books; sketched from the slice when None
+    """
+    # Filter books with price info and reasonable prices
+    df_price = df[(df['list_price'].notna()) & (df['list_price'] > 0) & ~df['is_outlier_list_price']].copy()
+    _require(df_price, 'books with a price')
+
+    # Quantile sketches over the same rows as the histogram (medians come from here)
+    if aggs is None:
+        aggs = build_aggregates(df_price)
+
+    # Most expensive and cheapest categories share one cached per-category aggregate
+    topk = TopKEngine(df_price)
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+
+    # 1. Price Distribution
+    ax1 = axes[0, 0]
+    ax1.hist(df_price['list_price'], bins=50, color='#27ae60', edgecolor='white', alpha=0.8)
+    ax1.axvline(df_price['list_price'].mean(), color='#e74c3c', linestyle='--', linewidth=2,
+                label=f'Mean: ${df_price["list_price"].mean():.2f}')
+    ax1.axvline(aggs.median('list_price'), color='#3498db', linestyle='--', linewidth=2,
+                label=f'Median: ${aggs.median("list_price"):.2f}')
+    ax1.set_xlabel('Price ($)', fontsize=11)
+    ax1.set_ylabel('Number of Books', fontsize=11)
+    ax1.set_title('💰 Price Distribution', fontsize=13, fontweight='bold')
+    ax1.legend()
+
+    # 2. Average Price by Category
+    ax2 = axes[0, 1]
+    category_prices = topk.group_top('list_price', 'search_category', k=15, min_count=5).iloc[::-1]
+
+    colors = sns.color_palette("YlOrRd", len(category_prices))
+    bars = ax2.barh(range(len(category_prices)), category_prices['list_price'], color=colors)
+    ax2.set_yticks(range(len(category_prices)))
+    ax2.set_yticklabels(category_prices.index, fontsize=9)
+    ax2.set_xlabel('Average Price ($)', fontsize=11)
+    ax2.set_title('💵 Most Expensive Categories\n(min 5 books with price)', fontsize=13, fontweight='bold')
+
+    for bar, val in zip(bars, category_prices['list_price']):
+        ax2.text(val + 1, bar.get_y() + bar.get_height()/2, f'${val:.0f}',
+                va='center', fontsize=9)
+
+    # 3. Cheapest Categories
+    ax3 = axes[1, 0]
+    cheap_categories = topk.group_top('list_price', 'search_category', k=15, min_count=5, ascending=True)
+
+    colors = sns.color_palette("YlGn", len(cheap_categories))
+    bars = ax3.barh(range(len(cheap_categories)), cheap_categories['list_price'], color=colors)
+    ax3.set_yticks(range(len(cheap_categories)))
+    ax3.set_yticklabels(cheap_categories.index, fontsize=9)
+    ax3.set_xlabel('Average Price ($)', fontsize=11)
+    ax3.set_title('🏷️ Most Affordable Categories\n(min 5 books with price)', fontsize=13, fontweight='bold')
+
+    for bar, val in zip(bars, cheap_categories['list_price']):
+        ax3.text(val + 0.5, bar.get_y() + bar.get_height()/2, f'${val:.0f}',
+                va='center', fontsize=9)
+
+    # 4. Price vs Page Count Scatter
+    ax4 = axes[1, 1]
+    df_scatter = df_price[(df_price['page_count'] > 0) & ~df_price['is_outlier_page_count']]
+    scatter = ax4.scatter(df_scatter['page_count'], df_scatter['list_price'],
+                          alpha=0.5, c=df_scatter['list_price'], cmap='viridis',
+                          s=30, edgecolors='white', linewidth=0.3)
+    ax4.set_xlabel('Page Count', fontsize=11)
+    ax4.set_ylabel('Price ($)', fontsize=11)
+    ax4.set_title('📊 Price vs Page Count', fontsize=13, fontweight='bold')
+    fig.colorbar(scatter, ax=ax4, label='Price ($)')
+
+    # Add trend line (needs two distinct page counts on a filtered slice)
+    if df_scatter['page_count'].nunique() >= 2:
+        z = np.polyfit(df_scatter['page_count'].dropna(), df_scatter['list_price'].dropna(), 1)
+        p = np.poly1d(z)
+        x_line = np.linspace(df_scatter['page_count'].min(), df_scatter['page_count'].max(), 100)
+        ax4.plot(x_line, p(x_line), 'r--', linewidth=2, alpha=0.7, label='Trend')
+        ax4.legend()
+
+    fig.tight_layout()
+    return fig
+
+
+# Chart name -> (figure builder, file name of the full-dataset version in graphs/)
+RENDERERS = {
+    'ratings': (ratings_figure, '02_ratings_analysis.png'),
+    'pages': (page_count_figure, '03_page_count_analysis.png'),
+    'prices': (price_figure, '06_price_analysis.png'),
+}
+
+
+def render_figure(name, df, aggs=None, **filters):
+    """Figure for one chart on the filtered books, titled with the filters that were applied.
+
+    aggs (aggregates of all of df) is only used when no filter is set.
+    """
+    builder, _ = RENDERERS[name]
+    active = any(value is not None for value in filters.values())
+    fig = builder(filter_books(df, **filters), None if active else aggs)
+    title = describe_filters(filters)
+    if title:
+        fig.suptitle(title, fontsize=14, fontweight='bold')
+        fig.tight_layout()
+    return fig
+
+
+def save_figure(fig, target, dpi=150):
+    """Write and close a figure; target is a path or a binary file object"""
+    fig.savefig(target, dpi=dpi, bbox_inches='tight', facecolor='white', edgecolor='none', format='png')
+    plt.close(fig)
+
+
+def render_png(name, df, dpi=150, aggs=None, **filters):
+    buffer = io.BytesIO()
+    save_figure(render_figure(name, df, aggs, **filters), buffer, dpi)
+    return buffer.getvalue()
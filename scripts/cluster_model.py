@@ -0,0 +1,141 @@
+"""
+Cluster Model Artifacts
+Persists the fitted scaler/K-Means/PCA pipeline and assigns clusters to new books
+"""
+import os
+import sys
+import json
+import time
+import joblib
+import pandas as pd
+import numpy as np
+from features import add_feature_columns
+from projection import project
+from snapshot import dataset_hash, data_path
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+model_dir = os.path.join(project_dir, 'models', 'clustering')
+
+FEATURES = ['average_rating', 'page_count', 'ratings_count', 'title_length']
+
+# Bump when FEATURES or the cleaning rules change
+PIPELINE_VERSION = 1
+
+# Refit when new books sit this much further from their centroids than the training set did
+DRIFT_THRESHOLD = 1.5
+
+
+def clean_for_clustering(df):
+    """Rated books with the clustering feature columns filled in"""
+    df = df.dropna(subset=['average_rating', 'page_count'])
+    df = df[df['average_rating'] > 0].copy()
+    df['page_count'] = pd.to_numeric(df['page_count'], errors='coerce').fillna(200)
+    df['ratings_count'] = pd.to_numeric(df['ratings_count'], errors='coerce').fillna(0)
+    # Snapshot frames already carry the derived columns; raw CSV batches do not
+    if 'title_length' not in df.columns:
+        df = add_feature_columns(df)
+    return df
+
+
+class ClusterPipeline:
+    """Fitted scaler, K-Means and PCA tied to the dataset snapshot they were trained on"""
+
+    def __init__(self, scaler, kmeans, pca, cluster_names, data_hash, scores=None):
+        self.scaler = scaler
+        self.kmeans = kmeans
+        self.pca = pca
+        self.cluster_names = cluster_names
+        self.scores = scores or {}
+        self.data_hash = data_hash
+        self.version = PIPELINE_VERSION
+        self.created_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.baseline_distance = None
+
+    def set_baseline(self, X_scaled):
+        """Record the training set's mean squared distance to its centroids"""
+        self.baseline_distance = float(self._distances(X_scaled).mean())
+        return self
+
+    def _distances(self, X_scaled):
+        return np.min(self.kmeans.transform(X_scaled), axis=1) ** 2
+
+    def transform(self, df):
+        return self.scaler.transform(df[FEATURES].fillna(0))
+
+    def assign(self, new_books):
+        """Cluster, cluster name and PCA coordinates for new books (no refitting)"""
+        books = clean_for_clustering(new_books)
+        X_scaled = self.transform(books)
+        coords = project(self.pca, X_scaled)
+        clusters = self.kmeans.predict(X_scaled)
+        return pd.DataFrame({
+            'book_id': books['book_id'].to_numpy(),
+            'Cluster': clusters,
+            'Cluster_Name': pd.Series(clusters).map(self.cluster_names).to_numpy(),
+            'pca1': coords[:, 0],
+            'pca2': coords[:, 1],
+        }, index=books.index)
+
+    def drift(self, new_books):
+        """Ratio of new books' centroid distance to the training baseline (1.0 = no drift)"""
+        books = clean_for_clustering(new_books)
+        if books.empty or not self.baseline_distance:
+            return 0.0
+        return float(self._distances(self.transform(books)).mean() / self.baseline_distance)
+
+    def save(self, directory=model_dir):
+        os.makedirs(directory, exist_ok=True)
+        name = f'pipeline_{self.data_hash[:16]}_v{self.version}.joblib'
+        path = os.path.join(directory, name)
+        joblib.dump(self, path)
+        with open(os.path.join(directory, 'latest.json'), 'w', encoding='utf-8') as f:
+            json.dump({'path': name, 'data_hash': self.data_hash, 'version': self.version,
+                       'created_at': self.created_at}, f, indent=2)
+        return path
+
+
+def load_pipeline(directory=model_dir, data_hash=None):
+    """Latest saved pipeline, or the one fitted on a specific snapshot hash"""
+    if data_hash is not None:
+        path = os.path.join(directory, f'pipeline_{data_hash[:16]}_v{PIPELINE_VERSION}.joblib')
+    else:
+        manifest = os.path.join(directory, 'latest.json')
+        if not os.path.exists(manifest):
+            return None
+        with open(manifest, encoding='utf-8') as f:
+            path = os.path.join(directory, json.load(f)['path'])
+    if not os.path.exists(path):
+        return None
+    pipeline = joblib.load(path)
+    return pipeline if pipeline.version == PIPELINE_VERSION else None
+
+
+def current_pipeline():
+    """Pipeline fitted on the current CSV, if one has been saved"""
+    return load_pipeline(data_hash=dataset_hash(data_path))
+
+
+if __name__ == '__main__':
+    # Usage: python cluster_model.py new_books.csv [output.csv]
+    if len(sys.argv) < 2:
+        print("Usage: python cluster_model.py new_books.csv [output.csv]")
+        sys.exit(1)
+
+    pipeline = load_pipeline()
+    if pipeline is None:
+        print("❌ No saved pipeline - run 12_category_clustering.py first")
+        sys.exit(1)
+
+    new_books = pd.read_csv(sys.argv[1])
+    assignments = pipeline.assign(new_books)
+    drift = pipeline.drift(new_books)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else 'cluster_assignments.csv'
+    assignments.to_csv(output, index=False)
+    print(f"✅ Assigned {len(assignments):,} books -> {output}")
+    print(f"   Drift ratio: {drift:.2f} (threshold {DRIFT_THRESHOLD})")
+
+    if drift > DRIFT_THRESHOLD:
+        print("⚠️  Drift above threshold - refit with 12_category_clustering.py")
+        sys.exit(2)
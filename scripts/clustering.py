@@ -0,0 +1,83 @@
+"""
+Clustering Engine
+Parallel K sweeps, MiniBatch/streaming K-Means and sampled silhouette scores
+"""
+import os
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+# Above this many rows 'auto' mode switches from KMeans to MiniBatchKMeans
+MINIBATCH_THRESHOLD = 200_000
+
+
+def _resolve_mode(mode, n_rows):
+    if mode == 'auto':
+        return 'minibatch' if n_rows > MINIBATCH_THRESHOLD else 'full'
+    return mode
+
+
+def fit_kmeans(X, k, mode='auto', random_state=42, n_init=10, batch_size=4096):
+    """Fit one K-Means model ('full' Lloyd or 'minibatch')"""
+    if _resolve_mode(mode, len(X)) == 'minibatch':
+        model = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3,
+                                batch_size=batch_size)
+    else:
+        model = KMeans(n_clusters=k, random_state=random_state, n_init=n_init)
+    return model.fit(X)
+
+
+def kmeans_sweep(X, k_range=range(2, 8), mode='auto', n_jobs=None, **kwargs):
+    """Fit every K in parallel worker processes; returns {k: fitted model}.
+
+    Keep the models around: the final clustering is just models[k], so the
+    chosen K is never fitted twice.
+    """
+    n_jobs = n_jobs or min(len(k_range), os.cpu_count() or 1)
+    models = Parallel(n_jobs=n_jobs, prefer='processes')(
+        delayed(fit_kmeans)(X, k, mode=mode, **kwargs) for k in k_range)
+    return dict(zip(k_range, models))
+
+
+def stream_kmeans(chunks, k, random_state=42, batch_size=4096):
+    """MiniBatchKMeans trained with partial_fit over an iterable of feature chunks.
+
+    Only one chunk is in memory at a time, so this scales to catalogues that
+    do not fit in RAM. Each chunk should hold at least k rows.
+    """
+    model = MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=batch_size)
+    for chunk in chunks:
+        model.partial_fit(chunk)
+    return model
+
+
+def stratified_sample(labels, sample_size=10_000, random_state=42):
+    """Row indices sampled proportionally from each cluster (at least 2 per cluster)"""
+    labels = np.asarray(labels)
+    if len(labels) <= sample_size:
+        return np.arange(len(labels))
+    rng = np.random.default_rng(random_state)
+    clusters, counts = np.unique(labels, return_counts=True)
+    quotas = np.maximum(2, np.round(counts / len(labels) * sample_size).astype(int))
+    picks = [rng.choice(np.flatnonzero(labels == c), size=min(q, n), replace=False)
+             for c, q, n in zip(clusters, quotas, counts)]
+    return np.sort(np.concatenate(picks))
+
+
+def sampled_silhouette(X, labels, sample_size=10_000, random_state=42):
+    """Silhouette score on a stratified sample instead of all O(n^2) pairs"""
+    idx = stratified_sample(labels, sample_size, random_state)
+    labels = np.asarray(labels)[idx]
+    if len(np.unique(labels)) < 2:
+        return np.nan
+    return silhouette_score(X[idx], labels)
+
+
+def sweep_scores(X, models, sample_size=10_000):
+    """Inertia and sampled silhouette for each model of a sweep"""
+    return {
+        k: {'inertia': model.inertia_,
+            'silhouette': sampled_silhouette(X, model.predict(X), sample_size)}
+        for k, model in models.items()
+    }
@@ -0,0 +1,76 @@
+"""
+Published Date Parser
+Vectorized fixed-width parsing of mixed YYYY / YYYY-MM / YYYY-MM-DD dates
+"""
+import pandas as pd
+import numpy as np
+
+# date_precision values
+PRECISION_NONE = 0
+PRECISION_YEAR = 1
+PRECISION_MONTH = 2
+PRECISION_DAY = 3
+
+WIDTH = 10  # len('YYYY-MM-DD')
+
+
+def _byte_matrix(series):
+    """Left-justified ASCII bytes of each value, shape (n, WIDTH)"""
+    text = series.fillna('').astype(str).str.slice(0, WIDTH)
+    raw = text.to_numpy(dtype=f'S{WIDTH}')
+    return raw.view(np.uint8).reshape(len(raw), WIDTH)
+
+
+def _digits(block):
+    """Integer value of a block of ASCII digit columns, plus an all-digits mask"""
+    digits = block.astype(np.int16) - ord('0')
+    ok = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    value = (digits * (10 ** np.arange(block.shape[1] - 1, -1, -1))).sum(axis=1)
+    return value, ok
+
+
+def parse_published_date(series):
+    """Parse published_date into year, month, published and date_precision columns.
+
+    Works column-wise on the raw bytes: every value is read as a fixed-width
+    YYYY-MM-DD record and each field is validated independently, so partial
+    dates keep whatever precision they have.
+    """
+    raw = _byte_matrix(series)
+    dash = ord('-')
+
+    year, has_year = _digits(raw[:, 0:4])
+    month, month_digits = _digits(raw[:, 5:7])
+    day, day_digits = _digits(raw[:, 8:10])
+
+    has_year &= year > 0
+    has_month = has_year & (raw[:, 4] == dash) & month_digits & (month >= 1) & (month <= 12)
+    has_day = has_month & (raw[:, 7] == dash) & day_digits & (day >= 1) & (day <= 31)
+
+    precision = np.select([has_day, has_month, has_year],
+                          [PRECISION_DAY, PRECISION_MONTH, PRECISION_YEAR],
+                          PRECISION_NONE).astype(np.int8)
+
+    # Missing month/day fall back to the first of the period
+    months = ((np.where(has_year, year, 1970) - 1970) * 12
+              + np.where(has_month, month, 1) - 1).astype('datetime64[M]')
+    published = months.astype('datetime64[D]') + (np.where(has_day, day, 1) - 1)
+    # Clamp days like 02-31 that would overflow into the next month
+    published = np.minimum(published, (months + 1).astype('datetime64[D]') - 1)
+    published[~has_year] = np.datetime64('NaT')
+
+    index = series.index
+    return pd.DataFrame({
+        'year': pd.Series(np.where(has_year, year, 0).astype(np.int16), index=index, dtype='Int16').where(has_year),
+        'month': pd.Series(np.where(has_month, month, 0).astype(np.int8), index=index, dtype='Int8').where(has_month),
+        'published': pd.Series(published, index=index),
+        'date_precision': pd.Series(precision, index=index),
+    })
+
+
+def add_date_columns(df):
+    """Attach the parsed date columns to a books frame"""
+    parsed = parse_published_date(df['published_date'])
+    for col in parsed.columns:
+        df[col] = parsed[col]
+    return df
@@ -0,0 +1,231 @@
+"""
+Book Deduplication
+Normalizes ISBNs and assigns a canonical work_id to editions and near-duplicates
+"""
+import os
+import zlib
+import pandas as pd
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+data_path = os.path.join(project_dir, 'google_books_dataset.csv')
+
+# Read ISBNs as text so 13-digit values never pass through float64
+ISBN_DTYPES = {'isbn_13': str, 'isbn_10': str}
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+# MinHash / LSH settings shared by the full build and ingest.py
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_THRESHOLD = 0.8
+
+
+# =============================================================================
+# ISBN NORMALIZATION
+# =============================================================================
+def _clean_isbn_text(series):
+    """Strip separators (and a float '.0' suffix) leaving digits and X"""
+    if pd.api.types.is_float_dtype(series):
+        series = series.astype('Int64').astype(str)
+    s = series.astype(str).str.upper().str.replace(r'\.0$', '', regex=True)
+    return s.str.replace(r'[^0-9X]', '', regex=True)
+
+
+def _digit_matrix(strings, width):
+    """Fixed-width digit strings -> (n, width) int array ('X' becomes 10)"""
+    if len(strings) == 0:
+        return np.empty((0, width), dtype=np.int64)
+    raw = np.frombuffer(''.join(strings).encode('ascii'), dtype=np.uint8).reshape(-1, width)
+    digits = raw.astype(np.int64) - ord('0')
+    digits[raw == ord('X')] = 10
+    return digits
+
+
+def _digits_to_int(digits):
+    return digits @ (10 ** np.arange(digits.shape[1] - 1, -1, -1, dtype=np.int64))
+
+
+def _isbn13_check_digit(first12):
+    weights = np.tile([1, 3], 6)
+    return (10 - (first12 @ weights) % 10) % 10
+
+
+def normalize_isbn13(series):
+    """Validated ISBN-13 values as Int64 (invalid or missing -> <NA>)"""
+    s = _clean_isbn_text(series)
+    mask = (s.str.len() == 13) & s.str.isdigit()
+    out = pd.Series(pd.NA, index=series.index, dtype='Int64')
+    digits = _digit_matrix(s[mask].tolist(), 13)
+    valid = _isbn13_check_digit(digits[:, :12]) == digits[:, 12]
+    out[mask[mask].index[valid]] = _digits_to_int(digits[valid])
+    return out
+
+
+def isbn10_to_isbn13(series):
+    """Validated ISBN-10 values converted to ISBN-13 as Int64"""
+    s = _clean_isbn_text(series)
+    mask = (s.str.len() == 10) & s.str.match(r'^\d{9}[\dX]$')
+    out = pd.Series(pd.NA, index=series.index, dtype='Int64')
+    digits = _digit_matrix(s[mask].tolist(), 10)
+    valid = (digits @ np.arange(10, 0, -1)) % 11 == 0
+
+    first12 = np.hstack([np.tile([9, 7, 8], (valid.sum(), 1)), digits[valid, :9]])
+    isbn13 = np.hstack([first12, _isbn13_check_digit(first12)[:, None]])
+    out[mask[mask].index[valid]] = _digits_to_int(isbn13)
+    return out
+
+
+def canonical_isbn(df):
+    """ISBN-13 where valid, otherwise the converted ISBN-10"""
+    return normalize_isbn13(df['isbn_13']).fillna(isbn10_to_isbn13(df['isbn_10']))
+
+
+# =============================================================================
+# MINHASH + LSH
+# =============================================================================
+def _normalize_text(series):
+    return (series.fillna('').astype(str).str.lower()
+            .str.replace(r'[^a-z0-9 ]', ' ', regex=True)
+            .str.split().str.join(' '))
+
+
+def work_text(df):
+    """Normalized 'title | authors' text the near-duplicate matching compares"""
+    return _normalize_text(df['title']) + ' | ' + _normalize_text(df['authors'])
+
+
+def has_work_text(df):
+    """Rows that may be linked by text: a title alone (e.g. 'Poems') is too common to identify a work"""
+    return df['title'].notna() & (_normalize_text(df['authors']) != '')
+
+
+def _mod_mersenne(x):
+    """x mod 2^61 - 1 for uint64 x, using 2^61 = 1 (mod 2^61 - 1)"""
+    x = (x & MERSENNE_PRIME) + (x >> np.uint64(61))
+    return np.where(x >= MERSENNE_PRIME, x - np.uint64(MERSENNE_PRIME), x)
+
+
+def _mulmod_mersenne(a, x):
+    """a * x mod 2^61 - 1 without overflowing uint64 (a < 2^61, x < 2^32).
+
+    a is split into 29 high and 32 low bits; the high product is shifted up by
+    2^32 with the same folding trick so every intermediate stays below 2^64.
+    """
+    hi, lo = a >> np.uint64(32), a & np.uint64(0xFFFFFFFF)
+    t = _mod_mersenne(hi * x)
+    t = _mod_mersenne((t >> np.uint64(29)) + ((t & np.uint64((1 << 29) - 1)) << np.uint64(32)))
+    return _mod_mersenne(t + _mod_mersenne(lo * x))
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, shingle=4, seed=42):
+    """MinHash signatures of character shingles, shape (n, num_perm)"""
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, num_perm), dtype=np.uint64)
+    doc_ids, hashes = [], []
+    for i, text in enumerate(texts):
+        grams = {text[j:j + shingle] for j in range(max(len(text) - shingle + 1, 1))}
+        doc_ids.extend([i] * len(grams))
+        hashes.extend(zlib.crc32(g.encode('utf-8')) for g in grams)
+    doc_ids = np.asarray(doc_ids, dtype=np.int64)
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    starts = np.flatnonzero(np.r_[True, doc_ids[1:] != doc_ids[:-1]])
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+    # One vectorized pass per permutation; reduceat takes the min per document
+    sig = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for p in range(num_perm):
+        permuted = _mod_mersenne(_mulmod_mersenne(a[p], hashes) + b[p])
+        sig[:, p] = np.minimum.reduceat(permuted, starts)
+    return sig
+
+
+def band_keys(sig, bands=LSH_BANDS):
+    """Per row, the bytes of each LSH band of its signature"""
+    rows = sig.shape[1] // bands
+    return [[row[band * rows:(band + 1) * rows].tobytes() for band in range(bands)] for row in sig]
+
+
+def lsh_edges(sig, bands=LSH_BANDS, threshold=LSH_THRESHOLD):
+    """Candidate pairs sharing an LSH band, verified against the signatures.
+
+    Each bucket is checked against its first member rather than pairwise, so
+    the work stays linear in the number of rows.
+    """
+    n, num_perm = sig.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows = num_perm // bands
+    left, right = [], []
+    for band in range(bands):
+        chunk = np.ascontiguousarray(sig[:, band * rows:(band + 1) * rows])
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        _, bucket = np.unique(keys, return_inverse=True)
+        order = np.argsort(bucket, kind='stable')
+        sorted_bucket = bucket[order]
+        first = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+        leader = order[np.repeat(first, np.diff(np.r_[first, n]))]
+
+        candidates = leader != order
+        a, b = leader[candidates], order[candidates]
+        similarity = (sig[a] == sig[b]).mean(axis=1)
+        keep = similarity >= threshold
+        left.append(a[keep])
+        right.append(b[keep])
+    return np.concatenate(left), np.concatenate(right)
+
+
+# =============================================================================
+# WORK IDS
+# =============================================================================
+def assign_work_ids(df, num_perm=NUM_PERM, bands=LSH_BANDS, threshold=LSH_THRESHOLD):
+    """Canonical work_id per row: exact ISBN groups joined with near-duplicate title/author matches"""
+    n = len(df)
+    positions = np.arange(n)
+    left, right = [], []
+
+    # Exact ISBN matches: link every row to the first row carrying that ISBN
+    isbn_codes = pd.factorize(canonical_isbn(df))[0]
+    has_isbn = isbn_codes >= 0
+    first_of = pd.Series(positions[has_isbn]).groupby(isbn_codes[has_isbn]).transform('min')
+    left.append(first_of.to_numpy())
+    right.append(positions[has_isbn])
+
+    # Near-duplicate title + author text (only rows that name an author)
+    text = work_text(df)
+    has_text = has_work_text(df).to_numpy()
+    sig = minhash_signatures(text[has_text], num_perm=num_perm)
+    a, b = lsh_edges(sig, bands=bands, threshold=threshold)
+    left.append(positions[has_text][a])
+    right.append(positions[has_text][b])
+
+    left, right = np.concatenate(left), np.concatenate(right)
+    graph = coo_matrix((np.ones(len(left), dtype=np.int8), (left, right)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    # Name each work after its first book_id
+    first_row = pd.Series(positions).groupby(labels).transform('min').to_numpy()
+    return pd.Series(df['book_id'].to_numpy()[first_row], index=df.index, name='work_id')
+
+
+if __name__ == '__main__':
+    df = pd.read_csv(data_path, dtype=ISBN_DTYPES)
+    isbn = canonical_isbn(df)
+    df['work_id'] = assign_work_ids(df)
+
+    print(f"📘 Rows: {len(df):,}")
+    print(f"   Valid ISBNs: {isbn.notna().sum():,} ({isbn.nunique():,} distinct)")
+    print(f"   Distinct works: {df['work_id'].nunique():,}")
+    print(f"   Duplicate rows: {len(df) - df['work_id'].nunique():,}")
+
+    print("\n📊 TOP CATEGORIES BY DISTINCT WORKS:")
+    works = df.groupby('search_category')['work_id'].nunique().sort_values(ascending=False)
+    for cat, count in works.head(10).items():
+        print(f"   {cat}: {count} works")
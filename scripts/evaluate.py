@@ -0,0 +1,168 @@
+"""
+Model Evaluation Harness
+Parallel k-fold CV and hyperparameter grids over the rating and clustering models
+"""
+import os
+import json
+import time
+import warnings
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import SGDRegressor
+from sklearn.model_selection import KFold, ParameterGrid
+from sklearn.preprocessing import StandardScaler
+from clustering import sampled_silhouette
+from cluster_model import FEATURES, clean_for_clustering
+from rating_model import RatingModel
+from snapshot import load_books, dataset_hash, data_path
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+feature_dir = os.path.join(project_dir, 'cache', 'features')
+leaderboard_path = os.path.join(project_dir, 'models', 'leaderboard.json')
+
+N_FOLDS = 5
+
+# Applies in the worker processes too, since they import this module
+warnings.filterwarnings('ignore', category=ConvergenceWarning)
+
+GRIDS = {
+    'rating_sgd': ParameterGrid({
+        'alpha': [1e-6, 1e-5, 1e-4, 1e-3],
+        'penalty': ['l2', 'elasticnet'],
+    }),
+    'clustering_kmeans': ParameterGrid({
+        'n_clusters': [2, 3, 4, 5, 6, 7, 8],
+    }),
+}
+
+
+# =============================================================================
+# CACHED FEATURE MATRICES
+# =============================================================================
+def _rating_features(df):
+    rated = df[df['average_rating'].notna() & (df['average_rating'] > 0)]
+    return {'X': RatingModel().features(rated), 'y': rated['average_rating'].to_numpy(dtype=float)}
+
+
+def _clustering_features(df):
+    return {'X': clean_for_clustering(df)[FEATURES].fillna(0).to_numpy(dtype=float)}
+
+
+FEATURE_BUILDERS = {
+    'rating_sgd': _rating_features,
+    'clustering_kmeans': _clustering_features,
+}
+
+
+def feature_cache(task, data_hash):
+    """Path of the task's feature matrix for this snapshot, building it on first use"""
+    path = os.path.join(feature_dir, f'{task}_{data_hash[:16]}.joblib')
+    if not os.path.exists(path):
+        os.makedirs(feature_dir, exist_ok=True)
+        joblib.dump(FEATURE_BUILDERS[task](load_books()), path)
+    return path
+
+
+# =============================================================================
+# FOLD WORKERS
+# =============================================================================
+def _run_rating_fold(path, params, train_idx, test_idx):
+    data = joblib.load(path, mmap_mode='r')
+    X, y = data['X'], np.asarray(data['y'])
+    mean = y[train_idx].mean()
+    model = SGDRegressor(random_state=42, learning_rate='adaptive', eta0=0.01, max_iter=50,
+                         tol=1e-4, **params)
+    model.fit(X[train_idx], y[train_idx] - mean)
+    pred = np.clip(model.predict(X[test_idx]) + mean, 1, 5)
+    err = pred - y[test_idx]
+    return {'mae': float(np.abs(err).mean()), 'rmse': float(np.sqrt((err ** 2).mean()))}
+
+
+def _run_clustering_fold(path, params, train_idx, test_idx):
+    X = np.asarray(joblib.load(path, mmap_mode='r')['X'])
+    scaler = StandardScaler().fit(X[train_idx])
+    train, test = scaler.transform(X[train_idx]), scaler.transform(X[test_idx])
+    model = KMeans(random_state=42, n_init=10, **params).fit(train)
+    labels = model.predict(test)
+    return {
+        'heldout_inertia_per_row': float(-model.score(test) / len(test)),
+        'silhouette': float(sampled_silhouette(test, labels, sample_size=5_000)),
+    }
+
+
+FOLD_RUNNERS = {
+    'rating_sgd': _run_rating_fold,
+    'clustering_kmeans': _run_clustering_fold,
+}
+
+# Metric each leaderboard is ranked by, and whether higher is better
+RANK_BY = {
+    'rating_sgd': ('mae', False),
+    'clustering_kmeans': ('silhouette', True),
+}
+
+
+# =============================================================================
+# HARNESS
+# =============================================================================
+def evaluate(tasks=None, n_folds=N_FOLDS, n_jobs=-1):
+    """Run every (task, params, fold) job in one process pool and build the leaderboard"""
+    tasks = tasks or list(GRIDS)
+    data_hash = dataset_hash(data_path)
+    jobs, keys = [], []
+    for task in tasks:
+        path = feature_cache(task, data_hash)
+
+        n_rows = joblib.load(path, mmap_mode='r')['X'].shape[0]
+        folds = list(KFold(n_splits=n_folds, shuffle=True, random_state=42).split(np.arange(n_rows)))
+        for params in GRIDS[task]:
+            for train_idx, test_idx in folds:
+                jobs.append(delayed(FOLD_RUNNERS[task])(path, params, train_idx, test_idx))
+                keys.append((task, json.dumps(params, sort_keys=True)))
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(jobs)
+    elapsed = time.perf_counter() - start
+
+    # Average fold metrics per (task, params)
+    grouped = {}
+    for key, metrics in zip(keys, results):
+        grouped.setdefault(key, []).append(metrics)
+
+    leaderboard = {'data_hash': data_hash, 'n_folds': n_folds, 'seconds': round(elapsed, 2),
+                   'tasks': {}}
+    for task in tasks:
+        metric, higher_better = RANK_BY[task]
+        entries = []
+        for (t, params), fold_metrics in grouped.items():
+            if t != task:
+                continue
+            entry = {'params': json.loads(params)}
+            for name in fold_metrics[0]:
+                values = np.array([m[name] for m in fold_metrics])
+                entry[name] = float(values.mean())
+                entry[f'{name}_std'] = float(values.std())
+            entries.append(entry)
+        entries.sort(key=lambda e: e[metric], reverse=higher_better)
+        leaderboard['tasks'][task] = {'rank_by': metric, 'results': entries}
+    return leaderboard
+
+
+def save_leaderboard(leaderboard, path=leaderboard_path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(leaderboard, f, indent=2)
+    return path
+
+
+if __name__ == '__main__':
+    print("🧪 Running cross-validated grids...")
+    leaderboard = evaluate()
+    print(f"✅ Saved: {save_leaderboard(leaderboard)} ({leaderboard['seconds']}s)")
+    for task, board in leaderboard['tasks'].items():
+        best = board['results'][0]
+        print(f"   {task}: best {board['rank_by']}={best[board['rank_by']]:.3f} with {best['params']}")
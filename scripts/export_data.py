@@ -0,0 +1,132 @@
+"""
+Dashboard Data Export
+Writes the aggregate tables behind the charts as small columnar JSON shards for index.html
+"""
+import os
+import json
+import numpy as np
+from aggregates import build_aggregates
+from category_trends import CategoryYearCube
+from snapshot import load_books, dataset_hash, data_path
+from topk import TopKEngine
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+export_dir = os.path.join(project_dir, 'data')
+
+TOP_PUBLISHERS = 50
+TOP_K = 15
+MIN_GROUP = 5
+
+
+def _column(values, digits=3):
+    """Plain list for JSON, floats rounded so shards stay short and compress well"""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        return [None if np.isnan(v) else round(float(v), digits) for v in values]
+    return values.tolist()
+
+
+def _table(frame):
+    """Columnar {column: [...]} form, with the index stored under 'name'"""
+    table = {'name': [str(v) for v in frame.index]}
+    for col in frame.columns:
+        table[col] = _column(frame[col].to_numpy(dtype=float) if frame[col].dtype.kind == 'f'
+                             else frame[col].to_numpy())
+    return table
+
+
+def _group_summary(df, by):
+    """Book count plus mean rating / pages / price per value of `by`, largest first"""
+    valid = df[by].notna()
+    grouped = df[valid].groupby(by)
+    summary = grouped.size().to_frame('books')
+    summary['avg_rating'] = grouped['average_rating'].mean()
+    summary['avg_pages'] = df[valid & (df['page_count'] > 0)].groupby(by)['page_count'].mean()
+    summary['avg_price'] = df[valid & (df['list_price'] > 0)].groupby(by)['list_price'].mean()
+    return summary.sort_values('books', ascending=False)
+
+
+def _histogram(values, bins):
+    counts, edges = np.histogram(values, bins=bins)
+    return {'edges': _column(edges.astype(float), 2), 'counts': counts.tolist()}
+
+
+# =============================================================================
+# SHARDS
+# =============================================================================
+def build_shards(df):
+    """Every shard as a dict, keyed by shard name"""
+    aggs = build_aggregates(df)
+    topk = TopKEngine(df)
+    rated = df['average_rating'].notna()
+    pages = (df['page_count'] > 0) & ~df['is_outlier_page_count']
+    priced = (df['list_price'] > 0) & ~df['is_outlier_list_price']
+
+    summary = {
+        'books': int(len(df)),
+        'rated_books': int(rated.sum()),
+        'avg_rating': round(float(df.loc[rated, 'average_rating'].mean()), 2),
+        'median_pages': round(float(aggs.median('page_count')), 0),
+        'median_price': round(float(aggs.median('list_price')), 2),
+        'categories': int(df['search_category'].nunique()),
+        'languages': int(df['language'].nunique()),
+        'publishers': int(df['publisher'].nunique()),
+    }
+
+    cube = CategoryYearCube.from_frame(df)
+    years = {'first_year': cube.first_year, 'counts': cube.counts.sum(axis=0).tolist()}
+
+    histograms = {
+        'average_rating': _histogram(df.loc[rated, 'average_rating'], np.arange(1, 5.25, 0.25)),
+        'page_count': _histogram(df.loc[pages, 'page_count'], 40),
+        'list_price': _histogram(df.loc[priced, 'list_price'], 40),
+    }
+
+    longest = topk.top('page_count', k=TOP_K, filters={'page_count': ('>', 0),
+                                                       'is_outlier_page_count': ('==', False)})
+    top_lists = {
+        'rated_categories': _table(topk.group_top('average_rating', 'search_category', k=TOP_K,
+                                                  min_count=MIN_GROUP)),
+        'expensive_categories': _table(topk.group_top('list_price', 'search_category', k=TOP_K,
+                                                      min_count=MIN_GROUP, filters={'list_price': ('>', 0)})),
+        'cheap_categories': _table(topk.group_top('list_price', 'search_category', k=TOP_K, min_count=MIN_GROUP,
+                                                  filters={'list_price': ('>', 0)}, ascending=True)),
+        'longest_books': {'title': [str(t) for t in longest['title']],
+                          'page_count': _column(longest['page_count'].to_numpy(dtype=float), 0)},
+    }
+
+    return {
+        'summary': summary,
+        'categories': _table(_group_summary(df, 'search_category')),
+        'languages': _table(_group_summary(df, 'language')),
+        'publishers': _table(_group_summary(df, 'publisher').head(TOP_PUBLISHERS)),
+        'histograms': histograms,
+        'years': years,
+        'topk': top_lists,
+    }
+
+
+def write_shards(shards, directory=export_dir, data_hash=None):
+    """One compact JSON file per shard plus a manifest with their sizes"""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'data_hash': data_hash, 'shards': {}}
+    for name, shard in shards.items():
+        path = os.path.join(directory, f'{name}.json')
+        payload = json.dumps(shard, separators=(',', ':'), ensure_ascii=False)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        manifest['shards'][name] = {'file': f'{name}.json', 'bytes': len(payload.encode('utf-8'))}
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == '__main__':
+    print("📦 Exporting dashboard data shards...")
+    manifest = write_shards(build_shards(load_books()), data_hash=dataset_hash(data_path))
+    total = 0
+    for name, info in manifest['shards'].items():
+        total += info['bytes']
+        print(f"   {info['file']}: {info['bytes'] / 1024:.1f} KB")
+    print(f"✅ Saved {len(manifest['shards'])} shards to {export_dir} ({total / 1024:.1f} KB total)")
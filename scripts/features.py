@@ -0,0 +1,31 @@
+"""
+Derived Features
+Vectorized feature columns shared by the model and chart scripts
+"""
+import pandas as pd
+import numpy as np
+
+PRICE_BANDS = [0, 10, 25, 50, np.inf]
+PRICE_LABELS = ['< $10', '$10-25', '$25-50', '> $50']
+
+PAGE_BANDS = [0, 100, 300, 500, 1000, np.inf]
+PAGE_LABELS = ['< 100', '100-300', '300-500', '500-1000', '1000+']
+
+
+def add_feature_columns(df):
+    """Attach title/description/decade/band features (needs the date columns for decade)"""
+    title = df['title'].fillna('').astype(str)
+    df['title_length'] = title.str.len().astype(np.int32)
+    df['title_words'] = title.str.count(r'\S+').astype(np.int16)
+    df['has_subtitle'] = df['subtitle'].notna().astype(np.int8)
+    df['has_description'] = df['description'].notna().astype(np.int8)
+    df['description_length'] = df['description'].fillna('').astype(str).str.len().astype(np.int32)
+
+    if 'year' in df.columns:
+        df['decade'] = (df['year'] // 10 * 10).astype('Int16')
+
+    price = pd.to_numeric(df['list_price'], errors='coerce')
+    df['price_band'] = pd.cut(price.where(price > 0), PRICE_BANDS, labels=PRICE_LABELS, right=False)
+    pages = pd.to_numeric(df['page_count'], errors='coerce')
+    df['page_band'] = pd.cut(pages.where(pages > 0), PAGE_BANDS, labels=PAGE_LABELS, right=False)
+    return df
@@ -0,0 +1,116 @@
+"""
+Asset Fingerprinting
+Copies dashboard assets to content-hashed names in dist/ and rewrites index.html to point at them
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+dist_dir = os.path.join(project_dir, 'dist')
+
+ASSET_DIRS = ['graphs', 'graphs_mobile', 'gifs', 'data']
+PAGE = 'index.html'
+MANIFEST = 'asset-manifest.json'
+
+HASH_LENGTH = 10
+FINGERPRINT_PATTERN = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.\w+$')
+REFERENCE_PATTERN = re.compile(r'(src|href)="([^"#?:]+)"')
+
+# index.html carries this line; the build replaces it with the hashed data shard names
+MANIFEST_PLACEHOLDER = 'const ASSET_MANIFEST = {};'
+
+
+def is_fingerprinted(path):
+    return FINGERPRINT_PATTERN.search(path) is not None
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(relpath, digest):
+    stem, ext = os.path.splitext(relpath)
+    return f'{stem}.{digest}{ext}'
+
+
+def build_manifest(root=project_dir):
+    """Original relative path -> fingerprinted relative path for every asset.
+
+    A WebP twin takes its PNG's hash so the two names stay paired
+    (serve_dashboard.py swaps .png for .webp when the client accepts it).
+    """
+    manifest = {}
+    for directory in ASSET_DIRS:
+        folder = os.path.join(root, directory)
+        if not os.path.isdir(folder):
+            continue
+        names = sorted(os.listdir(folder))
+        for name in names:
+            relpath = f'{directory}/{name}'
+            path = os.path.join(folder, name)
+            if not os.path.isfile(path) or is_fingerprinted(name):
+                continue
+            stem, ext = os.path.splitext(name)
+            if ext == '.webp' and f'{stem}.png' in names:
+                continue
+            digest = content_hash(path)
+            manifest[relpath] = hashed_name(relpath, digest)
+            if ext == '.png' and f'{stem}.webp' in names:
+                manifest[f'{directory}/{stem}.webp'] = hashed_name(f'{directory}/{stem}.webp', digest)
+    return manifest
+
+
+def rewrite_page(html, manifest):
+    """Point src/href attributes and the data shard table at the fingerprinted files"""
+    html = REFERENCE_PATTERN.sub(
+        lambda m: f'{m.group(1)}="{manifest.get(m.group(2), m.group(2))}"', html)
+    shards = {os.path.splitext(os.path.basename(src))[0]: dst
+              for src, dst in manifest.items() if src.startswith('data/') and src.endswith('.json')}
+    return html.replace(MANIFEST_PLACEHOLDER, f'const ASSET_MANIFEST = {json.dumps(shards, sort_keys=True)};')
+
+
+def build(root=project_dir, out=dist_dir):
+    """Copy changed assets, drop stale ones, write the manifest and the rewritten page"""
+    manifest = build_manifest(root)
+    copied = 0
+    for src, dst in manifest.items():
+        target = os.path.join(out, dst)
+        if os.path.exists(target):
+            continue  # same name means same content
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(root, src), target)
+        copied += 1
+
+    keep = set(manifest.values())
+    removed = 0
+    for directory in ASSET_DIRS:
+        folder = os.path.join(out, directory)
+        if not os.path.isdir(folder):
+            continue
+        for name in os.listdir(folder):
+            if f'{directory}/{name}' not in keep:
+                os.remove(os.path.join(folder, name))
+                removed += 1
+
+    with open(os.path.join(root, PAGE), encoding='utf-8', newline='') as f:
+        html = f.read()
+    with open(os.path.join(out, PAGE), 'w', encoding='utf-8', newline='') as f:
+        f.write(rewrite_page(html, manifest))
+    with open(os.path.join(out, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return {'assets': len(manifest), 'copied': copied, 'removed': removed}
+
+
+if __name__ == '__main__':
+    print("🔖 Fingerprinting dashboard assets...")
+    stats = build()
+    print(f"✅ {stats['assets']} assets in dist/ ({stats['copied']} new, {stats['removed']} stale removed, "
+          f"{stats['assets'] - stats['copied']} unchanged)")
@@ -1,15 +1,35 @@
 """
 Comprehensive Mobile Graphs for Google Books Dataset
+Every figure is computed from the snapshot; only figures whose numbers changed are re-rendered
 """
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import pandas as pd
 import numpy as np
 import os
+import sys
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from aggregates import build_aggregates
+from cluster_model import current_pipeline
+from features import PRICE_LABELS
+from snapshot import load_books
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_dir = os.path.dirname(script_dir)
 output_dir = os.path.join(project_dir, 'graphs_mobile')
+stamp_path = os.path.join(project_dir, 'cache', 'mobile_graphs.json')
 os.makedirs(output_dir, exist_ok=True)
 
+# Bump when a figure's drawing code changes so it is re-rendered
+GRAPHS_VERSION = 2
+
+# Names 12_category_clustering.py assigns; shown until a clustering pipeline is saved
+DEFAULT_CLUSTERS = ['Low Rated', 'Top Rated', 'Short Books', 'Popular', 'Long Books']
+MIN_CATEGORY_BOOKS = 20
+
 M = {
     'figsize': (6, 8), 'figsize_wide': (6, 6),
     'bg': '#0d1117', 'text': '#ffffff', 'gray': '#8b949e', 'grid': '#30363d',
@@ -34,7 +54,68 @@ def save(name):
     plt.close()
     print(f"   ✅ {name}")
 
-def g01_stats():
+# =============================================================================
+# NUMBERS
+# =============================================================================
+def _counts(values):
+    """(labels, counts) largest first, from one factorize + bincount"""
+    codes, labels = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    order = np.argsort(-counts, kind='stable')
+    return [str(labels[i]) for i in order], counts[order].tolist()
+
+
+def mobile_numbers(df):
+    """Every number the mobile figures show, as plain JSON-able values"""
+    aggs = build_aggregates(df)
+    rated = df['average_rating'].dropna().to_numpy(dtype=float)
+    median_price = aggs.median('list_price')
+
+    categories, category_counts = _counts(df['search_category'])
+    publishers, publisher_counts = _counts(df['publisher'])
+
+    # Whole-star buckets, 5 stars first
+    stars = np.bincount(np.clip(np.rint(rated), 1, 5).astype(int), minlength=6)[1:][::-1]
+
+    bands = df['price_band'].value_counts().reindex(PRICE_LABELS, fill_value=0)
+    band_pcts = (bands / max(bands.sum(), 1) * 100).round().astype(int)
+
+    pages = df[(df['page_count'] > 0) & ~df['is_outlier_page_count']]
+    codes, labels = pd.factorize(pages['search_category'])
+    sizes = np.bincount(codes, minlength=len(labels))
+    means = np.bincount(codes, weights=pages['page_count'].to_numpy(dtype=float), minlength=len(labels))
+    means = means / np.maximum(sizes, 1)
+    keep = np.flatnonzero(sizes >= MIN_CATEGORY_BOOKS)
+    by_length = keep[np.argsort(-means[keep], kind='stable')]
+    page_rows = [(str(labels[i]), int(round(means[i]))) for i in by_length[:2]]
+    page_rows += [(str(labels[i]), int(round(means[i]))) for i in by_length[-2:]]
+
+    pipeline = current_pipeline()
+    clusters = ([pipeline.cluster_names[k] for k in sorted(pipeline.cluster_names)]
+                if pipeline is not None else DEFAULT_CLUSTERS)
+
+    return {
+        'total_books': int(len(df)),
+        'median_price': float(round(median_price, 2)) if not np.isnan(median_price) else None,
+        'avg_rating': float(round(rated.mean(), 1)) if len(rated) else None,
+        'n_categories': len(categories),
+        'top_categories': categories[:6],
+        'top_category_counts': category_counts[:6],
+        'top_category_share': round(category_counts[0] / max(len(df), 1) * 100) if categories else 0,
+        'star_counts': stars.tolist(),
+        'price_bands': PRICE_LABELS,
+        'price_band_pcts': band_pcts.tolist(),
+        'page_rows': page_rows,
+        'top_publishers': publishers[:5],
+        'top_publisher_counts': publisher_counts[:5],
+        'clusters': clusters,
+    }
+
+
+# =============================================================================
+# FIGURES
+# =============================================================================
+def g01_stats(n):
     print("📱 01: Key Stats")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax); ax.axis('off')
@@ -43,11 +124,11 @@ def g01_stats():
     ax.text(0.5, 0.88, 'ML-Powered Book Intelligence', fontsize=14, ha='center', color=M['gray'], transform=ax.transAxes)
     
     stats = [
-        ('15,292', 'Total Books', M['blue']),
-        ('$15.99', 'Median Price', M['green']),
-        ('3.8★', 'Avg Rating', M['gold']),
-        ('18', 'Categories', M['purple']),
-        ('5', 'Clusters Found', M['orange']),
+        (f"{n['total_books']:,}", 'Total Books', M['blue']),
+        (f"${n['median_price']:.2f}" if n['median_price'] is not None else 'n/a', 'Median Price', M['green']),
+        (f"{n['avg_rating']:.1f}★" if n['avg_rating'] is not None else 'n/a', 'Avg Rating', M['gold']),
+        (f"{n['n_categories']:,}", 'Categories', M['purple']),
+        (str(len(n['clusters'])), 'Clusters Found', M['orange']),
     ]
     
     for i, (val, label, color) in enumerate(stats):
@@ -57,41 +138,41 @@ def g01_stats():
     
     save('01_stats.png')
 
-def g02_categories():
+def g02_categories(n):
     print("📱 02: Top Categories")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax)
     
-    cats = ['Fiction', 'Business', 'Computers', 'History', 'Biography', 'Science']
-    counts = [3200, 2100, 1800, 1500, 1200, 1100]
-    colors = [M['red'], M['blue'], M['green'], M['gold'], M['purple'], M['orange']]
+    cats = n['top_categories']
+    counts = n['top_category_counts']
+    colors = [M['red'], M['blue'], M['green'], M['gold'], M['purple'], M['orange']][:len(cats)]
     
     y_pos = np.arange(len(cats))
     bars = ax.barh(y_pos, counts, color=colors, height=0.6)
     
     for bar, count in zip(bars, counts):
-        ax.text(count - 150, bar.get_y() + bar.get_height()/2, f'{count:,}',
+        ax.text(count - max(counts) * 0.03, bar.get_y() + bar.get_height()/2, f'{count:,}',
                 va='center', ha='right', color='white', fontsize=14, fontweight='bold')
     
     ax.set_yticks(y_pos); ax.set_yticklabels(cats, fontsize=12)
     ax.invert_yaxis()
-    ax.set_title('Top 6 Categories', fontsize=18, fontweight='bold', pad=15)
+    ax.set_title(f'Top {len(cats)} Categories', fontsize=18, fontweight='bold', pad=15)
     save('02_categories.png')
 
-def g03_ratings():
+def g03_ratings(n):
     print("📱 03: Rating Distribution")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax)
     
     ratings = ['5★', '4★', '3★', '2★', '1★']
-    counts = [2800, 5100, 4500, 1800, 1092]
+    counts = n['star_counts']
     colors = [M['green'], M['blue'], M['gold'], M['orange'], M['red']]
     
     y_pos = np.arange(len(ratings))
     bars = ax.barh(y_pos, counts, color=colors, height=0.6)
     
     for bar, count in zip(bars, counts):
-        ax.text(count + 100, bar.get_y() + bar.get_height()/2, f'{count:,}',
+        ax.text(count + max(counts) * 0.02, bar.get_y() + bar.get_height()/2, f'{count:,}',
                 va='center', fontsize=12, fontweight='bold', color='white')
     
     ax.set_yticks(y_pos); ax.set_yticklabels(ratings, fontsize=14)
@@ -99,35 +180,37 @@ def g03_ratings():
     ax.set_title('Rating Distribution', fontsize=18, fontweight='bold', pad=15)
     save('03_ratings.png')
 
-def g04_price():
+def g04_price(n):
     print("📱 04: Price Ranges")
     fig, ax = plt.subplots(figsize=M['figsize_wide'])
     ax_style(ax)
     
-    ranges = ['< $10', '$10-25', '$25-50', '> $50']
-    pcts = [35, 42, 18, 5]
+    ranges = n['price_bands']
+    pcts = n['price_band_pcts']
     colors = [M['green'], M['blue'], M['gold'], M['red']]
     
-    wedges, texts, autotexts = ax.pie(pcts, labels=ranges, autopct='%1.0f%%',
-                                       colors=colors, textprops={'color': 'white', 'fontsize': 12})
-    for at in autotexts: at.set_fontweight('bold'); at.set_fontsize(14)
+    if sum(pcts):
+        wedges, texts, autotexts = ax.pie(pcts, labels=ranges, autopct='%1.0f%%',
+                                           colors=colors, textprops={'color': 'white', 'fontsize': 12})
+        for at in autotexts: at.set_fontweight('bold'); at.set_fontsize(14)
+    else:
+        ax.axis('off')
+        ax.text(0.5, 0.5, 'n/a', fontsize=24, ha='center', va='center', color=M['gray'], transform=ax.transAxes)
     
     ax.set_title('Price Distribution', fontsize=18, fontweight='bold', pad=15, color='white')
     save('04_price.png')
 
-def g05_pages():
+def g05_pages(n):
     print("📱 05: Page Length")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax); ax.axis('off')
     
     ax.text(0.5, 0.90, 'Page Count by Genre', fontsize=20, fontweight='bold', ha='center', color='white', transform=ax.transAxes)
     
-    data = [
-        ('Medical', '545', 'Longest avg', M['red']),
-        ('Biography', '412', 'Detailed life stories', M['blue']),
-        ('Fiction', '368', 'Standard novels', M['green']),
-        ('Lit. Criticism', '327', 'Shortest avg', M['gold']),
-    ]
+    notes = ['Longest avg', '2nd longest', '2nd shortest', 'Shortest avg']
+    colors = [M['red'], M['blue'], M['green'], M['gold']]
+    data = [(cat, f'{pages:,}', note, color)
+            for (cat, pages), note, color in zip(n['page_rows'], notes, colors)]
     
     for i, (cat, pages, note, color) in enumerate(data):
         y = 0.70 - i * 0.16
@@ -137,45 +220,45 @@ def g05_pages():
     
     save('05_pages.png')
 
-def g06_clustering():
+def g06_clustering(n):
     print("📱 06: ML Clustering")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax); ax.axis('off')
     
     ax.text(0.5, 0.90, 'K-Means Clustering', fontsize=20, fontweight='bold', ha='center', color='white', transform=ax.transAxes)
     
-    ax.text(0.5, 0.68, '5', fontsize=96, fontweight='bold', ha='center', color=M['green'], transform=ax.transAxes)
+    ax.text(0.5, 0.68, str(len(n['clusters'])), fontsize=96, fontweight='bold', ha='center', color=M['green'], transform=ax.transAxes)
     ax.text(0.5, 0.52, 'Clusters Found', fontsize=18, ha='center', color=M['gray'], transform=ax.transAxes)
     
-    clusters = ['Low Rated', 'Top Rated', 'Short Books', 'Popular', 'Long Books']
+    clusters = n['clusters']
     for i, c in enumerate(clusters):
         y = 0.38 - i * 0.07
         ax.text(0.5, y, f'• {c}', fontsize=12, ha='center', color=M['blue'], transform=ax.transAxes)
     
     save('06_clustering.png')
 
-def g07_publishers():
+def g07_publishers(n):
     print("📱 07: Top Publishers")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax)
     
-    pubs = ['Penguin', 'HarperCollins', 'Random House', 'Simon & Schuster', 'Hachette']
-    counts = [1200, 980, 890, 720, 650]
-    colors = [M['red'], M['blue'], M['green'], M['gold'], M['purple']]
+    pubs = n['top_publishers']
+    counts = n['top_publisher_counts']
+    colors = [M['red'], M['blue'], M['green'], M['gold'], M['purple']][:len(pubs)]
     
     y_pos = np.arange(len(pubs))
     bars = ax.barh(y_pos, counts, color=colors, height=0.6)
     
     for bar, count in zip(bars, counts):
-        ax.text(count + 30, bar.get_y() + bar.get_height()/2, str(count),
+        ax.text(count + max(counts) * 0.02, bar.get_y() + bar.get_height()/2, str(count),
                 va='center', fontsize=12, fontweight='bold', color='white')
     
     ax.set_yticks(y_pos); ax.set_yticklabels(pubs, fontsize=11)
     ax.invert_yaxis()
-    ax.set_title('Top 5 Publishers', fontsize=18, fontweight='bold', pad=15)
+    ax.set_title(f'Top {len(pubs)} Publishers', fontsize=18, fontweight='bold', pad=15)
     save('07_publishers.png')
 
-def g08_popularity():
+def g08_popularity(n):
     print("📱 08: Popularity Analysis")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax); ax.axis('off')
@@ -197,19 +280,30 @@ def g08_popularity():
     ax.text(0.5, 0.18, 'Ratings matter most!', fontsize=14, fontweight='bold', ha='center', color=M['gold'], transform=ax.transAxes)
     save('08_popularity.png')
 
-def g09_takeaways():
+def g09_takeaways(n):
     print("📱 09: Key Takeaways")
     fig, ax = plt.subplots(figsize=M['figsize'])
     ax_style(ax); ax.axis('off')
     
     ax.text(0.5, 0.95, 'Key Takeaways', fontsize=20, fontweight='bold', ha='center', color='white', transform=ax.transAxes)
     
+    # Small or unrated selections can leave any of these empty
+    top_category = (f"{n['top_categories'][0]} leads at {n['top_category_share']}%"
+                    if n['top_categories'] else 'n/a')
+    top_star = f"{5 - int(np.argmax(n['star_counts']))}-star sweet spot" if any(n['star_counts']) else 'n/a'
+    top_band = int(np.argmax(n['price_band_pcts']))
+    top_price = (f"{n['price_bands'][top_band]} = {n['price_band_pcts'][top_band]}%"
+                 if any(n['price_band_pcts']) else 'n/a')
+    if n['page_rows']:
+        longest, longest_pages = f"{n['page_rows'][0][0]} = longest", f"{n['page_rows'][0][1]:,} avg pages"
+    else:
+        longest, longest_pages = 'n/a', f'No category with {MIN_CATEGORY_BOOKS}+ books'
     takeaways = [
-        ('1', 'Fiction leads at 21%', 'Most popular category', M['red']),
-        ('2', '4-star sweet spot', 'Most common rating', M['blue']),
-        ('3', '5 book clusters', 'K-Means analysis', M['green']),
-        ('4', '$10-25 = 42%', 'Most common price', M['gold']),
-        ('5', 'Medical = longest', '545 avg pages', M['purple']),
+        ('1', top_category, 'Most popular category', M['red']),
+        ('2', top_star, 'Most common rating', M['blue']),
+        ('3', f"{len(n['clusters'])} book clusters", 'K-Means analysis', M['green']),
+        ('4', top_price, 'Most common price', M['gold']),
+        ('5', longest, longest_pages, M['purple']),
     ]
     
     for i, (num, head, sub, color) in enumerate(takeaways):
@@ -222,10 +316,60 @@ def g09_takeaways():
     
     save('09_takeaways.png')
 
+# Output file -> (figure function, numbers it reads)
+FIGURES = {
+    '01_stats.png': (g01_stats, ['total_books', 'median_price', 'avg_rating', 'n_categories', 'clusters']),
+    '02_categories.png': (g02_categories, ['top_categories', 'top_category_counts']),
+    '03_ratings.png': (g03_ratings, ['star_counts']),
+    '04_price.png': (g04_price, ['price_bands', 'price_band_pcts']),
+    '05_pages.png': (g05_pages, ['page_rows']),
+    '06_clustering.png': (g06_clustering, ['clusters']),
+    '07_publishers.png': (g07_publishers, ['top_publishers', 'top_publisher_counts']),
+    '08_popularity.png': (g08_popularity, []),
+    '09_takeaways.png': (g09_takeaways, ['top_categories', 'top_category_share', 'star_counts', 'clusters',
+                                         'price_bands', 'price_band_pcts', 'page_rows']),
+}
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+def figure_key(name, numbers):
+    _, keys = FIGURES[name]
+    payload = json.dumps([GRAPHS_VERSION, name, {k: numbers[k] for k in keys}], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _render(name, numbers):
+    setup()
+    FIGURES[name][0](numbers)
+    return name
+
+
+def build(df=None, force=False, max_workers=None):
+    """Render the figures whose numbers changed (or whose PNG is missing) in a process pool"""
+    numbers = mobile_numbers(load_books() if df is None else df)
+    stamps = {}
+    if os.path.exists(stamp_path) and not force:
+        with open(stamp_path, encoding='utf-8') as f:
+            stamps = json.load(f)
+
+    keys = {name: figure_key(name, numbers) for name in FIGURES}
+    stale = [name for name in FIGURES
+             if stamps.get(name) != keys[name] or not os.path.exists(os.path.join(output_dir, name))]
+    if stale:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(_render, stale, [numbers] * len(stale)))
+
+    os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        json.dump(keys, f, indent=2)
+    return stale
+
+
 if __name__ == '__main__':
     print("\n📱 Generating Comprehensive Mobile Graphs (Books)")
     print("=" * 60)
-    setup()
-    g01_stats(); g02_categories(); g03_ratings(); g04_price()
-    g05_pages(); g06_clustering(); g07_publishers(); g08_popularity(); g09_takeaways()
-    print(f"\n✅ 9 mobile graphs saved to: {output_dir}")
+    rendered = build(force='--force' in sys.argv)
+    print(f"\n✅ {len(rendered)} of {len(FIGURES)} mobile graphs rendered to: {output_dir} "
+          f"({len(FIGURES) - len(rendered)} unchanged)")
@@ -7,14 +7,15 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
 import os
+from snapshot import load_books
 
 # Load data
-df = pd.read_csv('../google_books_dataset.csv')
+df = load_books()
 
 # Filter books with ratings and valid page counts
 df_scatter = df[(df['average_rating'].notna()) & 
                 (df['page_count'] > 0) & 
-                (df['page_count'] < 1500)].copy()
+                ~df['is_outlier_page_count']].copy()
 
 # Sample for animation (too many points would be slow)
 df_sample = df_scatter.sample(n=min(200, len(df_scatter)), random_state=42)
@@ -45,7 +46,7 @@ def animate(frame):
         if frame == n_frames - 1:  # Add colorbar on last frame
             plt.colorbar(scatter, ax=ax, label='Rating')
     
-    ax.set_xlim(0, 1500)
+    ax.set_xlim(0, df_scatter['page_count'].max() * 1.05)
     ax.set_ylim(0.5, 5.5)
     ax.set_xlabel('Page Count', fontsize=12, fontweight='bold')
     ax.set_ylabel('Average Rating', fontsize=12, fontweight='bold')
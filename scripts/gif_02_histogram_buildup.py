@@ -7,12 +7,13 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
 import os
+from snapshot import load_books
 
 # Load data
-df = pd.read_csv('../google_books_dataset.csv')
+df = load_books()
 
 # Filter valid page counts
-df_pages = df[(df['page_count'] > 0) & (df['page_count'] < 1500)].copy()
+df_pages = df[(df['page_count'] > 0) & ~df['is_outlier_page_count']].copy()
 
 # Create histogram data
 n_bins = 30
@@ -48,7 +49,7 @@ def animate(frame):
     ax.axvline(median_val, color='#2ecc71', linestyle='--', linewidth=2.5,
               label=f'Median: {median_val:.0f}', alpha=eased)
     
-    ax.set_xlim(0, 1500)
+    ax.set_xlim(0, bin_edges[-1])
     ax.set_ylim(0, max(hist_values) * 1.15)
     ax.set_xlabel('Page Count', fontsize=12, fontweight='bold')
     ax.set_ylabel('Number of Books', fontsize=12, fontweight='bold')
@@ -8,18 +8,23 @@ import matplotlib.animation as animation
 import matplotlib.patches as patches
 import numpy as np
 import os
+from aggregates import load_aggregates
+from snapshot import load_books
 
 # Load data
-df = pd.read_csv('../google_books_dataset.csv')
+df = load_books()
+
+# Persisted quantile sketches of the snapshot, outliers excluded like the charts below
+aggs = load_aggregates()
 
 # Get price data
-df_price = df[(df['list_price'].notna()) & (df['list_price'] > 0) & (df['list_price'] < 150)].copy()
+df_price = df[(df['list_price'].notna()) & (df['list_price'] > 0) & ~df['is_outlier_list_price']].copy()
 
 # Price statistics
 min_price = df_price['list_price'].min()
 max_price = df_price['list_price'].max()
 mean_price = df_price['list_price'].mean()
-median_price = df_price['list_price'].median()
+median_price = aggs.median('list_price')
 
 # Price ranges for "zones"
 cheap = df_price[df_price['list_price'] < 20]['list_price'].count()
@@ -0,0 +1,130 @@
+"""
+Minimal asyncio HTTP/1.1
+Request parsing, response writing and the keep-alive connection loop shared by the local servers
+"""
+import asyncio
+import json
+import traceback
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+REASONS = {
+    200: 'OK', 204: 'No Content', 206: 'Partial Content', 304: 'Not Modified',
+    400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    416: 'Range Not Satisfiable', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class Request:
+    def __init__(self, method, target, version, headers):
+        self.method = method
+        self.version = version
+        self.headers = headers  # lower-cased names
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = dict(parse_qsl(parts.query))
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+async def read_request(reader):
+    """Next request on the connection, or None once the client has closed it"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise ValueError('truncated request head')
+        return None
+    if len(head) > MAX_HEADER_BYTES:
+        raise ValueError('request head too large')
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise ValueError(f'bad request line: {lines[0]!r}')
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    # Bodies are not used by any endpoint; drain them so the connection stays in sync
+    length = int(headers.get('content-length', 0) or 0)
+    if length:
+        await reader.readexactly(length)
+    return Request(method, target, version, headers)
+
+
+def etag_matches(header, etag):
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+
+def response_head(status, headers):
+    lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}']
+    lines += [f'{name}: {value}' for name, value in headers.items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def send(writer, status, headers=None, body=b'', head_only=False):
+    """Write a complete response; Content-Length is filled in from the body unless given.
+
+    204 and 304 responses carry no body, so they get no Content-Length of their own.
+    """
+    headers = dict(headers or {})
+    if status not in (204, 304):
+        headers.setdefault('Content-Length', str(len(body)))
+    writer.write(response_head(status, headers))
+    if body and not head_only:
+        writer.write(body)
+    await writer.drain()
+
+
+async def send_json(writer, payload, status=200, headers=None, head_only=False):
+    body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    headers = {'Content-Type': 'application/json; charset=utf-8', **(headers or {})}
+    await send(writer, status, headers, body, head_only)
+
+
+async def serve(handler, host='127.0.0.1', port=8000, on_start=None):
+    """Run `await handler(request, writer)` for every request until cancelled"""
+
+    async def connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (ValueError, asyncio.LimitOverrunError):
+                    await send(writer, 400, {'Connection': 'close'})
+                    break
+                if request is None:
+                    break
+                try:
+                    await handler(request, writer)
+                except ConnectionError:
+                    raise
+                except Exception:
+                    traceback.print_exc()
+                    await send(writer, 500, {'Connection': 'close'})
+                    break
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(connection, host, port, limit=MAX_HEADER_BYTES)
+    if on_start:
+        on_start(server)
+    async with server:
+        await server.serve_forever()
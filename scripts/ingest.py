@@ -0,0 +1,499 @@
+"""
+Delta Ingestion
+Appends new books to the CSV and the snapshot, updating every maintained aggregate from the new rows alone
+"""
+import os
+import sys
+import csv
+import json
+import pickle
+import sqlite3
+import hashlib
+import numpy as np
+import pandas as pd
+from aggregates import build_aggregates
+from category_trends import CategoryYearCube
+from dates import add_date_columns
+from aggregates import save_aggregates
+from dedup import (ISBN_DTYPES, LSH_THRESHOLD, band_keys, canonical_isbn, has_work_text, minhash_signatures,
+                   work_text)
+from export_data import TOP_K, TOP_PUBLISHERS, MIN_GROUP, _table, build_shards, write_shards, export_dir
+from features import add_feature_columns
+from outliers import OUTLIER_COLUMNS, outlier_bounds
+from snapshot import (SNAPSHOT_VERSION, cache_dir, data_path, dataset_hash, load_books, remember_hash,
+                      segments_path, snapshot_parts)
+from topk import top_positions
+
+ingest_dir = os.path.join(cache_dir, 'ingest')
+state_path = os.path.join(ingest_dir, 'state.pkl')
+index_path = os.path.join(ingest_dir, 'index.sqlite')
+log_path = os.path.join(ingest_dir, 'log.json')
+
+# Bump when IngestState changes shape so it is rebuilt from the snapshot
+INGEST_VERSION = 4
+
+# Columns a chart selection filters on (charts.filter_books)
+TOUCH_COLUMNS = ['search_category', 'language', 'publisher', 'year']
+GROUP_COLUMNS = ['search_category', 'language', 'publisher']
+
+# Histograms whose bins come from the data; new values outside them go to the end bins
+CLIPPED_HISTOGRAMS = ['page_count', 'list_price']
+
+# Rendered from the whole CSV by run_all.py; an ingest leaves them showing the old catalogue
+STATIC_OUTPUTS = ['graphs', 'graphs_mobile']
+
+# Keys per IN (...) lookup, well under SQLite's bound-variable limit
+SQL_BATCH = 500
+
+INDEX_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS book_ids (book_id TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS isbn_works (isbn INTEGER PRIMARY KEY, work_id TEXT);
+CREATE TABLE IF NOT EXISTS text_works (text TEXT PRIMARY KEY, work_id TEXT);
+CREATE TABLE IF NOT EXISTS signatures (book_id TEXT PRIMARY KEY, work_id TEXT, sig BLOB);
+CREATE TABLE IF NOT EXISTS lsh_bands (band INTEGER, key BLOB, book_id TEXT);
+CREATE INDEX IF NOT EXISTS lsh_lookup ON lsh_bands (band, key);
+'''
+INDEX_KEYS = {'book_ids': 'book_id', 'isbn_works': 'isbn', 'text_works': 'text'}
+INDEX_TABLES = list(INDEX_KEYS) + ['signatures', 'lsh_bands']
+WORK_TABLES = ['isbn_works', 'text_works']
+# Above any SQLite rowid: delta rows rank after every stored book
+DELTA_ROWID = 1 << 62
+
+
+def group_sums(df, by):
+    """Per-group book count and metric sums/counts: the mergeable form of export_data._group_summary"""
+    rows = df[df[by].notna()]
+    metrics = pd.DataFrame({
+        'rating': rows['average_rating'],
+        'pages': rows['page_count'].where(rows['page_count'] > 0),
+        'price': rows['list_price'].where(rows['list_price'] > 0),
+    })
+    grouped = metrics.groupby(rows[by])
+    sums, counts = grouped.sum(), grouped.count()
+    table = pd.DataFrame({'books': grouped.size()})
+    for metric in metrics.columns:
+        table[f'{metric}_sum'] = sums[metric]
+        table[f'{metric}_n'] = counts[metric]
+    return table
+
+
+def _histogram_rows(df):
+    """Rows each exported histogram counts (same masks as export_data.build_shards)"""
+    return {
+        'average_rating': df['average_rating'].notna(),
+        'page_count': (df['page_count'] > 0) & ~df['is_outlier_page_count'],
+        'list_price': (df['list_price'] > 0) & ~df['is_outlier_list_price'],
+    }
+
+
+class BookIndex:
+    """The catalogue-sized lookups ingest needs, kept in SQLite rather than the pickled state.
+
+    Holds every book_id, the first work seen per ISBN and per normalized
+    title/author text, and the MinHash signature and LSH band keys of every
+    book with author text (dedup.assign_work_ids). An ingest queries only its
+    delta's keys and bands and inserts only the new entries, so its cost follows
+    the delta rather than the catalogue.
+    """
+
+    def __init__(self, path=index_path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(INDEX_SCHEMA)
+
+    def is_current(self, data_hash):
+        meta = dict(self.db.execute('SELECT key, value FROM meta'))
+        return meta.get('version') == str(INGEST_VERSION) and meta.get('data_hash') == data_hash
+
+    def rebuild(self, df, data_hash):
+        """Replace every entry with the lookups of a full snapshot"""
+        isbn = canonical_isbn(df)
+        has_isbn = isbn.notna()
+        has_text = has_work_text(df)
+        text = work_text(df)
+        works = {
+            'isbn_works': df['work_id'][has_isbn].groupby(isbn[has_isbn]).first(),
+            'text_works': df['work_id'][has_text].groupby(text[has_text]).first(),
+        }
+        sig = minhash_signatures(text[has_text])
+        signatures = list(zip(df['book_id'][has_text].tolist(), df['work_id'][has_text].tolist(), sig))
+        with self.db:
+            for table in INDEX_TABLES:
+                self.db.execute(f'DELETE FROM {table}')
+            self._insert(df['book_id'].tolist(), {table: dict(zip(first.index.tolist(), first.tolist()))
+                                                  for table, first in works.items()}, signatures, data_hash)
+
+    def add(self, book_ids, pending, data_hash):
+        """Record a delta's books, new works and signatures; a key already present keeps its first work"""
+        with self.db:
+            self._insert(book_ids, {table: pending[table] for table in WORK_TABLES}, pending['signatures'],
+                         data_hash)
+
+    def _insert(self, book_ids, works, signatures, data_hash):
+        """signatures: (book_id, work_id, MinHash signature) per book with author text"""
+        self.db.executemany('INSERT OR IGNORE INTO book_ids VALUES (?)', ((book_id,) for book_id in book_ids))
+        for table, entries in works.items():
+            self.db.executemany(f'INSERT OR IGNORE INTO {table} VALUES (?, ?)', entries.items())
+        self.db.executemany('INSERT OR IGNORE INTO signatures VALUES (?, ?, ?)',
+                            ((book_id, work, sig.tobytes()) for book_id, work, sig in signatures))
+        if signatures:
+            keys = band_keys(np.stack([sig for _, _, sig in signatures]))
+            self.db.executemany('INSERT INTO lsh_bands VALUES (?, ?, ?)',
+                                ((band, key, book_id) for (book_id, _, _), row in zip(signatures, keys)
+                                 for band, key in enumerate(row)))
+        self.db.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                            [('version', str(INGEST_VERSION)), ('data_hash', data_hash)])
+
+    def _select(self, table, keys):
+        keys = list(dict.fromkeys(keys))
+        rows = []
+        for start in range(0, len(keys), SQL_BATCH):
+            chunk = keys[start:start + SQL_BATCH]
+            marks = ', '.join('?' * len(chunk))
+            rows += self.db.execute(f'SELECT * FROM {table} WHERE {INDEX_KEYS[table]} IN ({marks})', chunk)
+        return rows
+
+    def known_books(self, book_ids):
+        """The subset of book_ids already in the snapshot"""
+        return {row[0] for row in self._select('book_ids', book_ids)}
+
+    def works(self, table, keys):
+        """{key: work_id} for the keys present in 'isbn_works' or 'text_works'"""
+        return dict(self._select(table, keys))
+
+    def band_matches(self, keys):
+        """(band, key) -> [(rowid, work_id, signature)] of stored books sharing that LSH band"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        step = SQL_BATCH // 2
+        for start in range(0, len(keys), step):
+            chunk = keys[start:start + step]
+            values = ', '.join(['(?, ?)'] * len(chunk))
+            query = (f'SELECT b.band, b.key, s.rowid, s.work_id, s.sig FROM (VALUES {values}) q '
+                     'JOIN lsh_bands b ON b.band = q.column1 AND b.key = q.column2 '
+                     'JOIN signatures s ON s.book_id = b.book_id')
+            for band, key, rowid, work, sig in self.db.execute(query, [v for pair in chunk for v in pair]):
+                found.setdefault((band, key), []).append((rowid, work, np.frombuffer(sig, dtype=np.uint64)))
+        return found
+
+
+class IngestState:
+    """Everything ingest keeps up to date between full rebuilds, for one version of the CSV.
+
+    Built once from a full snapshot, then updated from each delta's rows only.
+    Rows already in the snapshot keep their outlier flags and work ids until
+    the next full rebuild (python snapshot.py); new rows are judged against
+    the bounds recorded here and the BookIndex. A new row joins at most one
+    existing work: when its ISBN and its text point at two different works,
+    assign_work_ids would merge them, but here that waits for the full rebuild.
+
+    Only the aggregates are pickled; they grow with categories and publishers,
+    not with rows.
+    """
+
+    def __init__(self, df, data_hash, index):
+        self.version = INGEST_VERSION
+        self.data_hash = data_hash
+        self.dtypes = df.dtypes.to_dict()
+        self.index = index
+        index.rebuild(df, data_hash)
+
+        self.aggs = build_aggregates(df)
+        self.cube = CategoryYearCube.from_frame(df)
+        self.groups = {by: group_sums(df, by) for by in GROUP_COLUMNS}
+
+        shards = build_shards(df)
+        self.histograms = shards['histograms']
+        longest = shards['topk']['longest_books']
+        self.longest = pd.DataFrame({'title': longest['title'], 'page_count': longest['page_count']})
+
+        # Category -> upper bound per outlier column (small categories already carry the global bound)
+        self.upper = {}
+        for col in OUTLIER_COLUMNS:
+            _, upper = outlier_bounds(df, col)
+            _, overall = outlier_bounds(df[[col]].assign(all_books=0), col, by='all_books')
+            self.upper[col] = {'groups': upper.groupby(df['search_category']).first().dropna().to_dict(),
+                               'global': overall.dropna().iloc[0] if overall.notna().any() else np.inf}
+
+    # -------------------------------------------------------------------------
+    def new_rows(self, delta):
+        """Delta rows whose book_id is new, the last occurrence winning inside the delta"""
+        delta = delta.drop_duplicates('book_id', keep='last')
+        known = self.index.known_books(delta['book_id'].tolist())
+        return delta[~delta['book_id'].isin(known)].reset_index(drop=True)
+
+    def _work_ids(self, df):
+        """Join a new book to an existing work by exact ISBN, exact title/author text, then MinHash.
+
+        Near-duplicates are found through the stored LSH bands and verified against
+        the signatures like dedup.lsh_edges; the earliest matching book's work wins.
+        Rows of the delta are matched against each other the same way.
+        """
+        isbn = canonical_isbn(df).tolist()
+        text = work_text(df)
+        has_text = has_work_text(df)
+        sig = minhash_signatures(text[has_text])
+        row_keys = [list(enumerate(row)) for row in band_keys(sig)]
+        titled_rows = iter(zip(sig, row_keys))
+        text, has_text = text.tolist(), has_text.tolist()
+        isbn_works = self.index.works('isbn_works', [key for key in isbn if key is not pd.NA])
+        text_works = self.index.works('text_works', [words for words, titled in zip(text, has_text) if titled])
+        bands = self.index.band_matches([band_key for keys in row_keys for band_key in keys])
+        # Entries first seen in this delta, written to the index by apply()
+        self.pending = {'isbn_works': {}, 'text_works': {}, 'signatures': []}
+        works = []
+        for i, (book_id, key, words, titled) in enumerate(zip(df['book_id'].tolist(), isbn, text, has_text)):
+            known = key is not pd.NA
+            work = isbn_works.get(key) if known else None
+            if titled:
+                row_sig, keys = next(titled_rows)
+                if work is None:
+                    work = text_works.get(words)
+                if work is None:
+                    work = _near_work(row_sig, keys, bands)
+            work = book_id if work is None else work
+            if known and key not in isbn_works:
+                isbn_works[key] = self.pending['isbn_works'][key] = work
+            if titled:
+                if words not in text_works:
+                    text_works[words] = self.pending['text_works'][words] = work
+                self.pending['signatures'].append((book_id, work, row_sig))
+                # Later delta rows can match this one
+                for band_key in keys:
+                    bands.setdefault(band_key, []).append((DELTA_ROWID + i, work, row_sig))
+            works.append(work)
+        return pd.Series(works, index=df.index, name='work_id')
+
+    def derive(self, raw):
+        """Snapshot columns for new raw rows, with the snapshot's dtypes"""
+        df = add_feature_columns(add_date_columns(raw.copy()))
+        for col in OUTLIER_COLUMNS:
+            bounds = self.upper[col]
+            upper = df['search_category'].map(bounds['groups']).astype(float).fillna(bounds['global'])
+            df[f'is_outlier_{col}'] = (pd.to_numeric(df[col], errors='coerce') > upper).to_numpy()
+        df['work_id'] = self._work_ids(df)
+        return df[list(self.dtypes)].astype(self.dtypes)
+
+    def apply(self, df, data_hash):
+        """Fold derived new rows into every aggregate"""
+        self.data_hash = data_hash
+        self.index.add(df['book_id'].tolist(), self.pending, data_hash)
+        self.aggs.update(df)
+        self.cube = self.cube.merge(CategoryYearCube.from_frame(df, self.cube.first_year, self.cube.last_year))
+        for by in GROUP_COLUMNS:
+            self.groups[by] = self.groups[by].add(group_sums(df, by), fill_value=0)
+
+        for col, rows in _histogram_rows(df).items():
+            hist = self.histograms[col]
+            values = df.loc[rows, col].to_numpy(dtype=float)
+            if col in CLIPPED_HISTOGRAMS:
+                values = np.clip(values, hist['edges'][0], hist['edges'][-1])
+            counts, _ = np.histogram(values, bins=hist['edges'])
+            hist['counts'] = (np.asarray(hist['counts']) + counts).tolist()
+
+        rows = _histogram_rows(df)['page_count']
+        candidates = pd.concat([self.longest, pd.DataFrame({'title': df.loc[rows, 'title'].astype(str),
+                                                            'page_count': df.loc[rows, 'page_count']})],
+                               ignore_index=True)
+        self.longest = candidates.iloc[top_positions(candidates['page_count'].to_numpy(dtype=float), TOP_K, False)]
+
+    # -------------------------------------------------------------------------
+    def _group_table(self, by):
+        sums = self.groups[by]
+        table = pd.DataFrame({'books': sums['books'].astype(np.int64)}, index=sums.index)
+        for metric, col in (('rating', 'avg_rating'), ('pages', 'avg_pages'), ('price', 'avg_price')):
+            table[col] = (sums[f'{metric}_sum'] / sums[f'{metric}_n']).where(sums[f'{metric}_n'] > 0)
+        return table.sort_values('books', ascending=False)
+
+    def _group_top(self, metric, k, ascending=False):
+        sums = self.groups['search_category']
+        name = {'rating': 'average_rating', 'price': 'list_price'}[metric]
+        stats = pd.DataFrame({name: sums[f'{metric}_sum'] / sums[f'{metric}_n'],
+                              'count': sums[f'{metric}_n'].astype(np.int64)})
+        stats = stats[stats['count'] >= MIN_GROUP]
+        return stats.iloc[top_positions(stats[name].to_numpy(), k, ascending)]
+
+    def shards(self):
+        """The export_data.build_shards dict, from the maintained aggregates"""
+        ratings = self.groups['search_category']
+        summary = {
+            'books': int(self.aggs.count),
+            'rated_books': int(self.aggs.digests['average_rating'].count),
+            'avg_rating': round(float(self.aggs.mean('average_rating')), 2),
+            'median_pages': round(float(self.aggs.median('page_count')), 0),
+            'median_price': round(float(self.aggs.median('list_price')), 2),
+            'categories': len(ratings),
+            'languages': len(self.groups['language']),
+            'publishers': len(self.groups['publisher']),
+        }
+        return {
+            'summary': summary,
+            'categories': _table(self._group_table('search_category')),
+            'languages': _table(self._group_table('language')),
+            'publishers': _table(self._group_table('publisher').head(TOP_PUBLISHERS)),
+            'histograms': self.histograms,
+            'years': {'first_year': self.cube.first_year, 'counts': self.cube.counts.sum(axis=0).tolist()},
+            'topk': {
+                'rated_categories': _table(self._group_top('rating', TOP_K)),
+                'expensive_categories': _table(self._group_top('price', TOP_K)),
+                'cheap_categories': _table(self._group_top('price', TOP_K, ascending=True)),
+                'longest_books': {'title': self.longest['title'].tolist(),
+                                  'page_count': [round(float(p), 0) for p in self.longest['page_count']]},
+            },
+        }
+
+
+def _near_work(sig, keys, bands):
+    """Work of the earliest book sharing an LSH band with sig and agreeing on LSH_THRESHOLD of it"""
+    candidates = {}
+    for band_key in keys:
+        for rowid, work, other in bands.get(band_key, ()):
+            candidates[rowid] = (work, other)
+    for rowid in sorted(candidates):
+        work, other = candidates[rowid]
+        if (other == sig).mean() >= LSH_THRESHOLD:
+            return work
+    return None
+
+
+# =============================================================================
+# STATE AND LOG
+# =============================================================================
+def load_state(data_hash, path=data_path):
+    """State for this CSV version, rebuilt with its index from the full snapshot when missing or stale"""
+    index = BookIndex()
+    if os.path.exists(state_path) and index.is_current(data_hash):
+        with open(state_path, 'rb') as f:
+            saved = pickle.load(f)
+        if saved['version'] == INGEST_VERSION and saved['data_hash'] == data_hash:
+            state = IngestState.__new__(IngestState)
+            state.__dict__.update(saved, index=index)
+            return state
+    return IngestState(load_books(path), data_hash, index)
+
+
+def save_state(state):
+    """Pickle the aggregates as a plain dict (readable whether ingest ran as a script or a module)"""
+    saved = {key: value for key, value in vars(state).items() if key not in ('index', 'pending')}
+    os.makedirs(ingest_dir, exist_ok=True)
+    tmp = f'{state_path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(saved, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, state_path)
+
+
+def load_log(path=data_path):
+    """Deltas ingested since the last full version of the CSV: {'base', 'head', 'deltas', 'stale_outputs'}.
+
+    Each delta lists the distinct (category, language, publisher, year) values
+    of its rows, so a cached chart is only stale if its selection matches one.
+    stale_outputs names the static folders rendered before the latest delta.
+    """
+    current = dataset_hash(path)
+    if os.path.exists(log_path):
+        with open(log_path, encoding='utf-8') as f:
+            log = json.load(f)
+        if log['head'] == current:
+            return log
+    return {'base': current, 'head': current, 'deltas': [], 'stale_outputs': []}
+
+
+def clear_stale_outputs(path=data_path):
+    """Called by run_all.py once the static charts have been re-rendered from the current CSV"""
+    log = load_log(path)
+    if log.get('stale_outputs'):
+        log['stale_outputs'] = []
+        with open(log_path, 'w', encoding='utf-8') as f:
+            json.dump(log, f, indent=2)
+
+
+def _touched(df):
+    touched = df[TOUCH_COLUMNS].drop_duplicates()
+    return {col: [None if pd.isna(v) else (int(v) if col == 'year' else v) for v in touched[col]]
+            for col in TOUCH_COLUMNS}
+
+
+# =============================================================================
+# INGEST
+# =============================================================================
+def _csv_payload(raw, path):
+    """New rows as CSV text in the file's column order, starting on a fresh line"""
+    with open(path, encoding='utf-8', newline='') as f:
+        header = next(csv.reader(f))
+    missing = set(header) - set(raw.columns)
+    if missing:
+        raise ValueError(f"delta is missing column(s): {', '.join(sorted(missing))}")
+    payload = raw[header].to_csv(header=False, index=False)
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return payload if f.read(1) == b'\n' else '\n' + payload
+
+
+def ingest(delta_path, path=data_path):
+    """Append the new books in delta_path; returns a summary of what changed"""
+    old_hash = dataset_hash(path)
+    if snapshot_parts(old_hash) is None:
+        load_books(path)
+    state = load_state(old_hash, path)
+
+    delta = pd.read_csv(delta_path, dtype=ISBN_DTYPES)
+    raw = state.new_rows(delta)
+    result = {'rows': len(delta), 'added': len(raw), 'skipped': len(delta) - len(raw), 'data_hash': old_hash}
+    if raw.empty:
+        return result
+
+    payload = _csv_payload(raw, path).encode('utf-8')
+    # Chained hash: the old version plus the appended bytes, without re-reading the file
+    new_hash = hashlib.sha256(f'{old_hash}:{hashlib.sha256(payload).hexdigest()}'.encode('utf-8')).hexdigest()
+    rows = state.derive(raw)
+    log = load_log(path)
+
+    # Snapshot: one new segment after the existing parts
+    segment = f'segment_{new_hash[:16]}_v{SNAPSHOT_VERSION}.pkl'
+    rows.to_pickle(os.path.join(cache_dir, segment))
+    with open(segments_path(new_hash), 'w', encoding='utf-8') as f:
+        json.dump({'parts': snapshot_parts(old_hash) + [segment]}, f, indent=2)
+
+    with open(path, 'ab') as f:
+        f.write(payload)
+    remember_hash(path, new_hash)
+
+    log['head'] = new_hash
+    log['deltas'].append({'hash': new_hash, 'rows': len(rows), 'touched': _touched(rows)})
+    log['stale_outputs'] = STATIC_OUTPUTS
+    os.makedirs(ingest_dir, exist_ok=True)
+    with open(log_path, 'w', encoding='utf-8') as f:
+        json.dump(log, f, indent=2)
+
+    state.apply(rows, new_hash)
+    save_state(state)
+    save_aggregates(state.aggs, new_hash)
+    result['data_hash'] = new_hash
+    result['stale'] = log['stale_outputs']
+
+    # Dashboard shards follow along only if they were exported from the version we started from
+    manifest = os.path.join(export_dir, 'manifest.json')
+    result['shards'] = False
+    if os.path.exists(manifest):
+        with open(manifest, encoding='utf-8') as f:
+            if json.load(f)['data_hash'] == old_hash:
+                write_shards(state.shards(), data_hash=new_hash)
+                result['shards'] = True
+    return result
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python ingest.py DELTA.csv")
+        sys.exit(1)
+
+    print(f"📥 Ingesting {sys.argv[1]}...")
+    result = ingest(sys.argv[1])
+    print(f"   {result['rows']:,} rows: {result['added']:,} new, {result['skipped']:,} already present")
+    if result['added']:
+        print(f"✅ Snapshot {result['data_hash'][:16]} updated")
+        print("   Dashboard shards " + ("updated" if result['shards'] else "not exported yet (run export_data.py)"))
+        print("   Chart service: only charts whose selection includes a new book are re-rendered")
+        print(f"⚠️  Static charts in {', '.join(f'{d}/' for d in result['stale'])} show the old catalogue "
+              "(run run_all.py)")
@@ -0,0 +1,122 @@
+"""
+Sectioned Insights
+Named report sections with structured results, cached per section by the hashes of their input columns
+"""
+import os
+import re
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+insights_cache_dir = os.path.join(project_dir, 'cache', 'insights')
+
+# Bump to invalidate every cached section (e.g. after a change to this module)
+INSIGHTS_VERSION = 2
+
+CACHE_FILE = re.compile(r'\w+_[0-9a-f]{16}\.json')
+
+
+class Section:
+    """One report section: compute(df) -> JSON-able dict, render(result) -> text lines.
+
+    `columns` lists every column compute() reads; None means the whole frame.
+    Bump `version` when compute() changes so its cached result is dropped.
+    A section without a title is rendered without a banner.
+    """
+
+    def __init__(self, name, title, columns, compute, render, version=1):
+        self.name = name
+        self.title = title
+        self.columns = columns
+        self.compute = compute
+        self.render = render
+        self.version = version
+
+
+def to_builtin(value):
+    """numpy/pandas values -> plain Python so results round-trip through JSON unchanged.
+
+    NaN stays a float (json writes and reads it as NaN) so renderers print it as before.
+    """
+    if isinstance(value, dict):
+        return {str(k): to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(v) for v in value]
+    if isinstance(value, pd.Series):
+        return [[to_builtin(k), to_builtin(v)] for k, v in value.items()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+class ColumnHashes:
+    """Content hash per column, computed at most once per run"""
+
+    def __init__(self, df):
+        self.df = df
+        self.hashes = {}
+
+    def __getitem__(self, col):
+        if col not in self.hashes:
+            values = pd.util.hash_pandas_object(self.df[col], index=False).to_numpy()
+            digest = hashlib.sha256(str(self.df[col].dtype).encode('utf-8'))
+            digest.update(values.tobytes())
+            self.hashes[col] = digest.hexdigest()
+        return self.hashes[col]
+
+    def key(self, section):
+        columns = list(self.df.columns) if section.columns is None else section.columns
+        payload = json.dumps([INSIGHTS_VERSION, section.name, section.version,
+                              {col: self[col] for col in columns}], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def run_sections(sections, df, report, cache_dir=insights_cache_dir):
+    """Results per section name, recomputing only sections whose input columns changed"""
+    folder = os.path.join(cache_dir, report)
+    os.makedirs(folder, exist_ok=True)
+    hashes = ColumnHashes(df)
+    results, recomputed = {}, []
+    for sec in sections:
+        path = os.path.join(folder, f'{sec.name}_{hashes.key(sec)}.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                results[sec.name] = json.load(f)
+            continue
+        results[sec.name] = to_builtin(sec.compute(df))
+        recomputed.append(sec.name)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(results[sec.name], f)
+        os.replace(tmp, path)
+        # Older results for this section are unreachable now
+        for name in os.listdir(folder):
+            if CACHE_FILE.fullmatch(name) and name.rsplit('_', 1)[0] == sec.name and name != os.path.basename(path):
+                os.remove(os.path.join(folder, name))
+    return results, recomputed
+
+
+def render_report(sections, results, heading, footer, width=80, section_rule='='):
+    """Text report: heading banner, each section's banner and lines, footer banner"""
+    lines = ['=' * width, heading, '=' * width]
+    for sec in sections:
+        if sec.title:
+            lines += ['', section_rule * width, sec.title, section_rule * width]
+        lines += sec.render(results[sec.name])
+    lines += ['', '=' * width, footer, '=' * width]
+    return '\n'.join(lines) + '\n'
+
+
+def write_report(sections, df, report, text_path, json_path, heading, footer, width=80, section_rule='='):
+    """Compute (or reuse) every section, then write the JSON results and the text rendered from them"""
+    results, recomputed = run_sections(sections, df, report)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'report': report, 'sections': results}, f, indent=2, ensure_ascii=False)
+    with open(text_path, 'w', encoding='utf-8') as f:
+        f.write(render_report(sections, results, heading, footer, width, section_rule))
+    return results, recomputed
@@ -0,0 +1,115 @@
+"""
+Image Optimization
+Lossless PNG re-encoding (opaque alpha dropped, exact palettes, no metadata) plus WebP twins
+"""
+import os
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+
+IMAGE_DIRS = ['graphs', 'graphs_mobile']
+MAX_WORKERS = os.cpu_count() or 4
+
+
+def _exact_palette(img):
+    """Palette image with exactly the same pixels, or None when there are more than 256 colours"""
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+    pixels = np.asarray(img)
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+    flat = pixels.reshape(-1, channels)
+    palette, indices = np.unique(flat, axis=0, return_inverse=True)
+
+    out = Image.fromarray(indices.reshape(pixels.shape[:2]).astype(np.uint8), 'P')
+    rgb = palette[:, :3] if channels >= 3 else np.repeat(palette[:, :1], 3, axis=1)
+    out.putpalette(rgb.astype(np.uint8).ravel().tolist())
+    if channels == 4 and (palette[:, 3] < 255).any():
+        out.info['transparency'] = bytes(palette[:, 3].astype(np.uint8))
+    return out
+
+
+def _reduce(img):
+    """Smallest lossless mode for the image: exact palette, else RGB when alpha is unused"""
+    if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        img = img.convert('RGBA')
+    if img.mode in ('RGBA', 'LA') and img.getchannel('A').getextrema() == (255, 255):
+        img = img.convert(img.mode[:-1])
+    return _exact_palette(img) or img
+
+
+def _encode_png(img):
+    buffer = io.BytesIO()
+    # No pnginfo/exif arguments: text chunks and other metadata are not carried over
+    params = {'transparency': img.info['transparency']} if 'transparency' in img.info else {}
+    img.save(buffer, format='PNG', optimize=True, **params)
+    return buffer.getvalue()
+
+
+def _encode_webp(img):
+    buffer = io.BytesIO()
+    if img.mode == 'P':
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    img.save(buffer, format='WEBP', lossless=True, quality=100, method=6)
+    return buffer.getvalue()
+
+
+def optimize_png(path, webp=True):
+    """Rewrite one PNG if the lossless re-encode is smaller; write its WebP twin"""
+    original = os.path.getsize(path)
+    with Image.open(path) as src:
+        src.load()
+        img = _reduce(src)
+
+    data = _encode_png(img)
+    if len(data) < original:
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    result = {'path': path, 'before': original, 'after': min(len(data), original), 'mode': img.mode}
+
+    if webp:
+        twin = os.path.splitext(path)[0] + '.webp'
+        with open(twin, 'wb') as f:
+            f.write(_encode_webp(img))
+        result['webp'] = os.path.getsize(twin)
+    return result
+
+
+def find_pngs(root=project_dir, directories=IMAGE_DIRS):
+    paths = []
+    for directory in directories:
+        folder = os.path.join(root, directory)
+        if os.path.isdir(folder):
+            paths += sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                            if name.lower().endswith('.png'))
+    return paths
+
+
+def optimize_all(paths=None, webp=True, max_workers=MAX_WORKERS):
+    """Optimize every PNG on a thread pool (zlib and the WebP encoder release the GIL)"""
+    paths = find_pngs() if paths is None else paths
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda p: optimize_png(p, webp), paths))
+
+
+if __name__ == '__main__':
+    paths = sys.argv[1:] or None
+    print("🗜️  Optimizing chart images...")
+    results = optimize_all(paths)
+    for r in results:
+        saved = r['before'] - r['after']
+        webp = f", webp {r['webp'] / 1024:.0f} KB" if 'webp' in r else ''
+        print(f"   {os.path.relpath(r['path'], project_dir)}: {r['before'] / 1024:.0f} KB -> "
+              f"{r['after'] / 1024:.0f} KB ({saved / 1024:.1f} KB saved, {r['mode']}{webp})")
+    before = sum(r['before'] for r in results)
+    after = sum(r['after'] for r in results)
+    webp_total = sum(r.get('webp', 0) for r in results)
+    print(f"✅ {len(results)} PNGs: {before / 1024:.0f} KB -> {after / 1024:.0f} KB "
+          f"({(before - after) / max(before, 1) * 100:.1f}% saved); WebP twins {webp_total / 1024:.0f} KB")
@@ -0,0 +1,60 @@
+"""
+Outlier Flags
+Per-category robust bounds (median/MAD or IQR) shared by every chart instead of fixed cutoffs
+"""
+import pandas as pd
+import numpy as np
+
+# Skewed, strictly positive columns are compared on a log scale
+OUTLIER_COLUMNS = ['page_count', 'list_price']
+
+MAD_SCALE = 1.4826   # MAD -> standard deviation for normal data
+MAD_THRESHOLD = 3.5  # modified z-score cutoff (Iglewicz & Hoaglin)
+IQR_WHISKER = 1.5
+
+# Categories with fewer valid values than this use the global bounds
+MIN_GROUP_SIZE = 20
+
+
+def _group_bounds(values, groups, method):
+    """Lower/upper bounds per row from its group's robust spread, in one grouped pass"""
+    grouped = values.groupby(groups)
+    if method == 'mad':
+        median = grouped.transform('median')
+        mad = (values - median).abs().groupby(groups).transform('median') * MAD_SCALE
+        return median - MAD_THRESHOLD * mad, median + MAD_THRESHOLD * mad, mad > 0
+    q1 = grouped.transform('quantile', 0.25)
+    q3 = grouped.transform('quantile', 0.75)
+    iqr = q3 - q1
+    return q1 - IQR_WHISKER * iqr, q3 + IQR_WHISKER * iqr, iqr > 0
+
+
+def outlier_bounds(df, col, by='search_category', method='mad'):
+    """Per-row (lower, upper) bounds for col on its original scale, NaN where the value is invalid"""
+    raw = pd.to_numeric(df[col], errors='coerce')
+    valid = raw > 0
+    values = np.log1p(raw[valid])
+    groups = df.loc[valid, by]
+
+    lower, upper, spread_ok = _group_bounds(values, groups, method)
+    glower, gupper, _ = _group_bounds(values, pd.Series(0, index=values.index), method)
+
+    size = groups.map(groups.value_counts())
+    use_group = (size >= MIN_GROUP_SIZE) & spread_ok
+    lower = lower.where(use_group, glower)
+    upper = upper.where(use_group, gupper)
+    return np.expm1(lower).reindex(df.index), np.expm1(upper).reindex(df.index)
+
+
+def add_outlier_columns(df, by='search_category', method='mad'):
+    """Attach is_outlier_<col> flags for values above their category's robust upper bound.
+
+    Only the upper tail is flagged: every cutoff this replaces was a cap on
+    very long or very expensive books, and missing/zero values stay unflagged
+    (charts already drop those as invalid).
+    """
+    for col in OUTLIER_COLUMNS:
+        _, upper = outlier_bounds(df, col, by, method)
+        values = pd.to_numeric(df[col], errors='coerce')
+        df[f'is_outlier_{col}'] = (values > upper).to_numpy()
+    return df
@@ -0,0 +1,44 @@
+"""
+2D Projection
+PCA for scatter coordinates with incremental/randomized paths for large row counts
+"""
+import numpy as np
+from sklearn.decomposition import PCA, IncrementalPCA
+
+# Above this many rows 'auto' stops using a full in-memory SVD
+INCREMENTAL_THRESHOLD = 500_000
+
+
+def fit_projection(X, n_components=2, method='auto', chunk_size=100_000, random_state=42):
+    """Fit a projection: 'full' PCA, 'randomized' SVD, or 'incremental' over row chunks"""
+    if method == 'auto':
+        method = 'incremental' if len(X) > INCREMENTAL_THRESHOLD else 'full'
+
+    if method == 'incremental':
+        model = IncrementalPCA(n_components=n_components, batch_size=chunk_size)
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size]
+            # IncrementalPCA needs at least n_components rows per call
+            if len(chunk) >= n_components:
+                model.partial_fit(chunk)
+        return model
+
+    solver = 'randomized' if method == 'randomized' else 'full'
+    return PCA(n_components=n_components, svd_solver=solver, random_state=random_state).fit(X)
+
+
+def fit_projection_stream(chunks, n_components=2):
+    """IncrementalPCA over an iterable of chunks, for data that never sits in memory at once"""
+    model = IncrementalPCA(n_components=n_components)
+    for chunk in chunks:
+        if len(chunk) >= n_components:
+            model.partial_fit(chunk)
+    return model
+
+
+def project(model, X, chunk_size=100_000):
+    """Transform rows chunk by chunk into a preallocated float32 array"""
+    out = np.empty((len(X), model.n_components_), dtype=np.float32)
+    for start in range(0, len(X), chunk_size):
+        out[start:start + chunk_size] = model.transform(X[start:start + chunk_size])
+    return out
@@ -0,0 +1,100 @@
+"""
+Publisher Specialization
+Sparse publisher x category counts with top-k categories and concentration (HHI) for every publisher
+"""
+import pandas as pd
+import numpy as np
+from scipy.sparse import coo_matrix
+from snapshot import load_books
+
+
+class PublisherCategoryMatrix:
+    """CSR matrix of book counts, one row per publisher and one column per search_category"""
+
+    def __init__(self, counts, publishers, categories):
+        self.counts = counts.tocsr()
+        self.publishers = pd.Index(publishers)
+        self.categories = pd.Index(categories)
+        self.totals = np.asarray(self.counts.sum(axis=1)).ravel()
+
+    @classmethod
+    def from_frame(cls, df):
+        df = df[df['publisher'].notna() & df['search_category'].notna()]
+        pub_codes, publishers = pd.factorize(df['publisher'])
+        cat_codes, categories = pd.factorize(df['search_category'])
+        # Missing values factorize to -1, which coo_matrix rejects
+        keep = (pub_codes >= 0) & (cat_codes >= 0)
+        pub_codes, cat_codes = pub_codes[keep], cat_codes[keep]
+        counts = coo_matrix((np.ones(len(pub_codes), dtype=np.int64), (pub_codes, cat_codes)),
+                            shape=(len(publishers), len(categories)))
+        # Duplicate (publisher, category) entries are summed on conversion
+        return cls(counts, publishers, categories)
+
+    def shares(self):
+        """Row-normalized matrix: each publisher's category mix"""
+        inv = 1.0 / np.maximum(self.totals, 1)
+        return self.counts.multiply(inv[:, None]).tocsr()
+
+    def hhi(self):
+        """Herfindahl-Hirschman index of each publisher's category mix (1 = single category)"""
+        shares = self.shares()
+        return pd.Series(np.asarray(shares.multiply(shares).sum(axis=1)).ravel(),
+                         index=self.publishers, name='hhi')
+
+    def top_k(self, k=3, block_size=4096):
+        """Top-k category codes and counts per publisher.
+
+        Rows are densified a block at a time so argpartition runs on a bounded
+        (block_size x categories) array however many publishers there are.
+        """
+        k = min(k, len(self.categories))
+        n = len(self.publishers)
+        top_codes = np.empty((n, k), dtype=np.int64)
+        top_counts = np.empty((n, k), dtype=np.int64)
+        for start in range(0, n, block_size):
+            block = self.counts[start:start + block_size].toarray()
+            part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            part_counts = np.take_along_axis(block, part, axis=1)
+            order = np.argsort(-part_counts, axis=1, kind='stable')
+            top_codes[start:start + len(block)] = np.take_along_axis(part, order, axis=1)
+            top_counts[start:start + len(block)] = np.take_along_axis(part_counts, order, axis=1)
+        return top_codes, top_counts
+
+    def profile(self, publisher, k=3):
+        """Top-k categories of one publisher with counts"""
+        row = self.counts[self.publishers.get_loc(publisher)]
+        order = np.argsort(-row.data, kind='stable')[:k]
+        return pd.Series(row.data[order], index=self.categories[row.indices[order]])
+
+    def summary(self, k=3, min_books=1):
+        """One row per publisher: book count, HHI, number of categories and top-k categories"""
+        codes, counts = self.top_k(k)
+        table = pd.DataFrame({
+            'books': self.totals,
+            'hhi': self.hhi().to_numpy(),
+            'n_categories': np.diff(self.counts.indptr),
+        }, index=self.publishers)
+        for i in range(codes.shape[1]):
+            present = counts[:, i] > 0
+            table[f'top_{i + 1}'] = np.where(present, self.categories.to_numpy()[codes[:, i]], None)
+            table[f'top_{i + 1}_share'] = counts[:, i] / np.maximum(self.totals, 1)
+        return table[table['books'] >= min_books].sort_values('books', ascending=False)
+
+
+def build_publisher_matrix(df=None):
+    return PublisherCategoryMatrix.from_frame(load_books() if df is None else df)
+
+
+if __name__ == '__main__':
+    matrix = build_publisher_matrix()
+    table = matrix.summary(k=3, min_books=20)
+    print(f"🏢 {len(matrix.publishers):,} publishers x {len(matrix.categories)} categories "
+          f"({matrix.counts.nnz:,} non-zero cells)")
+
+    print("\n🎯 MOST SPECIALIZED PUBLISHERS (min 20 books):")
+    for pub, row in table.sort_values('hhi', ascending=False).head(10).iterrows():
+        print(f"   {pub[:40]}: HHI {row['hhi']:.2f}, {row['top_1_share'] * 100:.0f}% {row['top_1']}")
+
+    print("\n🌐 MOST DIVERSIFIED PUBLISHERS (min 20 books):")
+    for pub, row in table.sort_values('hhi').head(10).iterrows():
+        print(f"   {pub[:40]}: HHI {row['hhi']:.2f} across {row['n_categories']} categories")
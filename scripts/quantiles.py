@@ -0,0 +1,140 @@
+"""
+Streaming Quantile Sketch
+Mergeable t-digest for medians, percentiles and box-plot stats
+"""
+import numpy as np
+
+
+class TDigest:
+    """Merging t-digest (k1 scale function) built on numpy arrays.
+
+    Values are buffered and folded into at most ~compression centroids, so
+    memory stays bounded however many values are added. Two digests built on
+    different chunks or processes can be combined with merge().
+    """
+
+    def __init__(self, compression=100, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or compression * 10
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values):
+        """Add a batch of values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self._buffer.append((values, np.ones(len(values))))
+        self._buffered += len(values)
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self._buffered >= self.buffer_size:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another digest's centroids into this one"""
+        other._compress()
+        if other.count == 0:
+            return self
+        self._buffer.append((other.means, other.weights))
+        self._buffered += len(other.means)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [m for m, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer = []
+        self._buffered = 0
+
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Map each centroid's midpoint quantile onto the k1 scale and collapse
+        # every run that falls in the same unit interval of k
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / np.pi * np.arcsin(2 * q - 1)
+        bucket = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Estimate one or more quantiles (q in [0, 1])"""
+        self._compress()
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        if len(self.means) == 1:
+            return np.full(np.shape(q), self.means[0]) if np.ndim(q) else self.means[0]
+
+        # Centroids sit at their cumulative midpoints; min/max anchor the tails
+        mids = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, mids, self.count]
+        values = np.r_[self.min, self.means, self.max]
+        result = np.interp(np.asarray(q, dtype=float) * self.count, positions, values)
+        return result if np.ndim(q) else float(result)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def percentiles(self, ps=(5, 25, 50, 75, 95)):
+        return dict(zip(ps, self.quantile(np.asarray(ps) / 100)))
+
+    def box_stats(self, label=None, whis=1.5):
+        """Box-plot stats in the format matplotlib's Axes.bxp expects"""
+        q1, med, q3 = self.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        return {
+            'label': label,
+            'med': med,
+            'q1': q1,
+            'q3': q3,
+            'whislo': max(self.min, q1 - whis * iqr),
+            'whishi': min(self.max, q3 + whis * iqr),
+            'fliers': [],
+        }
+
+    def to_dict(self):
+        self._compress()
+        return {
+            'compression': self.compression,
+            'count': int(self.count),
+            'min': float(self.min) if self.count else None,
+            'max': float(self.max) if self.count else None,
+            'means': self.means.tolist(),
+            'weights': self.weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(compression=data['compression'])
+        digest.count = data['count']
+        if digest.count:
+            digest.min, digest.max = data['min'], data['max']
+        digest.means = np.asarray(data['means'], dtype=float)
+        digest.weights = np.asarray(data['weights'], dtype=float)
+        return digest
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__dict__.update(TDigest.from_dict(state).__dict__)
+
+    def __len__(self):
+        return self.count
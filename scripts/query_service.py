@@ -0,0 +1,246 @@
+"""
+Catalogue Query Service
+asyncio JSON API for counts, means, medians and top-k over the in-memory snapshot
+"""
+import sys
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import numpy as np
+from http_server import serve, send, send_json
+from quantiles import TDigest
+from snapshot import load_books
+from topk import top_positions
+
+METRICS = ['average_rating', 'list_price', 'page_count', 'ratings_count']
+AGGREGATES = ['count', 'mean', 'median', 'top']
+
+# Query parameter -> snapshot column for equality filters
+FILTERS = {'category': 'search_category', 'language': 'language', 'publisher': 'publisher'}
+RANGE_PARAMS = ['year', 'year_from', 'year_to']
+
+TOP_COLUMNS = ['book_id', 'title', 'authors', 'search_category', 'language', 'year']
+MAX_K = 100
+
+CACHE_BYTES = 32 * 1024 * 1024
+CACHE_TTL = 300  # seconds
+
+
+class QueryError(ValueError):
+    """Bad query parameters (-> 400)"""
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+class LRUCache:
+    """Byte-bounded LRU of encoded results; entries also expire after ttl seconds"""
+
+    def __init__(self, max_bytes=CACHE_BYTES, ttl=CACHE_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        if key in self.entries:
+            self._drop(key)
+        if len(value) > self.max_bytes:
+            return
+        self.entries[key] = (self.clock() + self.ttl, value)
+        self.bytes += len(value)
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _drop(self, key):
+        _, value = self.entries.pop(key)
+        self.bytes -= len(value)
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+# =============================================================================
+# CATALOGUE
+# =============================================================================
+class Catalogue:
+    """Column arrays and factorized filter codes for the snapshot, read-only after load"""
+
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+        self.values = {m: df[m].to_numpy(dtype=float, na_value=np.nan) for m in METRICS}
+        self.year = df['year'].to_numpy(dtype=float, na_value=np.nan)
+        self.codes, self.lookup = {}, {}
+        for param, col in FILTERS.items():
+            codes, labels = pd.factorize(df[col])
+            self.codes[param] = codes
+            self.lookup[param] = {label: i for i, label in enumerate(labels)}
+
+    def mask(self, query):
+        mask = np.ones(self.size, dtype=bool)
+        for param in FILTERS:
+            if param in query:
+                code = self.lookup[param].get(query[param], -2)  # unknown value matches nothing
+                mask &= self.codes[param] == code
+        if 'year' in query:
+            mask &= self.year == query['year']
+        if 'year_from' in query:
+            mask &= self.year >= query['year_from']
+        if 'year_to' in query:
+            mask &= self.year <= query['year_to']
+        return mask
+
+    def run(self, query):
+        """Answer one normalized query (runs on the worker pool)"""
+        mask = self.mask(query)
+        agg = query['agg']
+        if agg == 'count':
+            return {'count': int(mask.sum())}
+
+        metric = query['metric']
+        values = self.values[metric]
+        rows = np.flatnonzero(mask & ~np.isnan(values))
+        if agg == 'mean':
+            value = float(values[rows].mean()) if len(rows) else None
+            return {'count': len(rows), 'mean': value}
+        if agg == 'median':
+            value = float(np.median(values[rows])) if len(rows) else None
+            return {'count': len(rows), 'median': value}
+
+        picked = rows[top_positions(values[rows], query['k'], query['order'] == 'asc')]
+        top = self.df.iloc[picked][TOP_COLUMNS].astype(object).where(lambda t: t.notna(), None)
+        top[metric] = values[picked]
+        return {'count': len(rows), 'top': top.to_dict(orient='records')}
+
+
+def normalize(params):
+    """Validated, defaulted query as a dict plus its cache key"""
+    known = set(FILTERS) | set(RANGE_PARAMS) | {'agg', 'metric', 'k', 'order'}
+    unknown = set(params) - known
+    if unknown:
+        raise QueryError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+
+    query = {'agg': params.get('agg', 'count')}
+    if query['agg'] not in AGGREGATES:
+        raise QueryError(f"agg must be one of {AGGREGATES}")
+    if query['agg'] != 'count':
+        query['metric'] = params.get('metric', 'average_rating')
+        if query['metric'] not in METRICS:
+            raise QueryError(f"metric must be one of {METRICS}")
+    if query['agg'] == 'top':
+        try:
+            query['k'] = int(params.get('k', 10))
+        except ValueError:
+            raise QueryError('k must be an integer')
+        if not 1 <= query['k'] <= MAX_K:
+            raise QueryError(f'k must be between 1 and {MAX_K}')
+        query['order'] = params.get('order', 'desc')
+        if query['order'] not in ('asc', 'desc'):
+            raise QueryError("order must be 'asc' or 'desc'")
+
+    for param in FILTERS:
+        if param in params:
+            query[param] = params[param]
+    for param in RANGE_PARAMS:
+        if param in params:
+            try:
+                query[param] = int(params[param])
+            except ValueError:
+                raise QueryError(f'{param} must be a year')
+    return query, tuple(sorted(query.items()))
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+class QueryService:
+    def __init__(self, catalogue, workers=4, cache=None):
+        self.catalogue = catalogue
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='query')
+        self.cache = cache or LRUCache()
+        self.latency = {}  # endpoint -> TDigest of milliseconds
+        self.requests = {}
+
+    def record(self, endpoint, started):
+        elapsed = (time.perf_counter() - started) * 1000
+        self.latency.setdefault(endpoint, TDigest()).update([elapsed])
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def metrics(self):
+        latency = {
+            endpoint: {'requests': self.requests[endpoint],
+                       'p50_ms': round(digest.quantile(0.5), 3),
+                       'p99_ms': round(digest.quantile(0.99), 3)}
+            for endpoint, digest in self.latency.items()
+        }
+        return {'books': self.catalogue.size, 'latency': latency, 'cache': self.cache.stats()}
+
+    async def query(self, params):
+        """Encoded JSON result and whether it came from the cache"""
+        query, key = normalize(params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.pool, self.catalogue.run, query)
+        body = json.dumps({'query': query, **result}, separators=(',', ':'), default=str).encode('utf-8')
+        self.cache.put(key, body)
+        return body, False
+
+    async def handle(self, request, writer):
+        started = time.perf_counter()
+        head_only = request.method == 'HEAD'
+        if request.method not in ('GET', 'HEAD'):
+            return await send(writer, 405, {'Allow': 'GET, HEAD'})
+
+        if request.path == '/query':
+            try:
+                body, hit = await self.query(request.query)
+            except QueryError as e:
+                await send_json(writer, {'error': str(e)}, status=400, head_only=head_only)
+            else:
+                headers = {'Content-Type': 'application/json; charset=utf-8',
+                           'X-Cache': 'hit' if hit else 'miss'}
+                await send(writer, 200, headers, body, head_only)
+        elif request.path == '/metrics':
+            await send_json(writer, self.metrics(), head_only=head_only)
+        elif request.path == '/health':
+            await send_json(writer, {'status': 'ok'}, head_only=head_only)
+        else:
+            return await send_json(writer, {'error': 'not found'}, status=404, head_only=head_only)
+        self.record(request.path, started)
+
+
+async def main(host='127.0.0.1', port=8001):
+    print("📚 Loading snapshot...")
+    service = QueryService(Catalogue(load_books()))
+    print(f"   {service.catalogue.size:,} books in memory")
+    await serve(service.handle, host, port,
+                on_start=lambda _: print(f"🔎 Query service on http://{host}:{port}/query"))
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8001
+    try:
+        asyncio.run(main(port=port))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
@@ -0,0 +1,138 @@
+"""
+Rating Prediction
+Out-of-core SGD regressor over hashed text, numeric and categorical features
+"""
+import os
+import zlib
+import joblib
+import pandas as pd
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.sparse import hstack, csr_matrix
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDRegressor
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+data_path = os.path.join(project_dir, 'google_books_dataset.csv')
+model_dir = os.path.join(project_dir, 'models', 'rating')
+
+TEXT_COLUMNS = ['title', 'subtitle', 'description']
+CATEGORICAL_COLUMNS = ['language', 'search_category', 'categories', 'publisher']
+
+# Every 10th book (by book_id hash) is held out to report validation error
+HOLDOUT_EVERY = 10
+
+
+class RatingModel:
+    """Stateless hashed features + SGDRegressor, so memory is fixed by n_features, not rows"""
+
+    def __init__(self, text_features=2 ** 18, category_features=2 ** 12, random_state=42):
+        self.text_hasher = HashingVectorizer(n_features=text_features, ngram_range=(1, 2),
+                                             stop_words='english', alternate_sign=False,
+                                             norm='l2')
+        self.category_hasher = FeatureHasher(n_features=category_features, input_type='string')
+        self.regressor = SGDRegressor(penalty='l2', alpha=1e-5, learning_rate='adaptive',
+                                      eta0=0.01, random_state=random_state)
+        self.rating_mean = None
+
+    def features(self, chunk):
+        text = chunk[TEXT_COLUMNS].fillna('').astype(str).agg(' '.join, axis=1)
+        categorical = chunk[CATEGORICAL_COLUMNS].fillna('missing').astype(str)
+        tokens = [[f'{col}={value}' for col, value in zip(CATEGORICAL_COLUMNS, row)]
+                  for row in categorical.itertuples(index=False)]
+
+        pages = pd.to_numeric(chunk['page_count'], errors='coerce').fillna(0).clip(lower=0)
+        price = pd.to_numeric(chunk['list_price'], errors='coerce')
+        numeric = np.column_stack([
+            np.log1p(pages) / 8,
+            np.log1p(price.fillna(0).clip(lower=0)) / 5,
+            price.isna(),
+            chunk['subtitle'].notna(),
+            chunk['description'].notna(),
+            np.ones(len(chunk)),
+        ]).astype(np.float64)
+
+        return hstack([self.text_hasher.transform(text),
+                       self.category_hasher.transform(tokens),
+                       csr_matrix(numeric)]).tocsr()
+
+    def partial_fit(self, chunk):
+        y = chunk['average_rating'].to_numpy(dtype=float)
+        if self.rating_mean is None:
+            self.rating_mean = float(y.mean())
+        # Fit the residual around the mean so the intercept starts in the right place
+        self.regressor.partial_fit(self.features(chunk), y - self.rating_mean)
+        return self
+
+    def predict(self, chunk):
+        pred = self.regressor.predict(self.features(chunk)) + self.rating_mean
+        return np.clip(pred, 1, 5)
+
+    def save(self, path=None):
+        path = path or os.path.join(model_dir, 'rating_model.joblib')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+
+def load_model(path=None):
+    return joblib.load(path or os.path.join(model_dir, 'rating_model.joblib'))
+
+
+def _is_holdout(book_ids):
+    return np.array([zlib.crc32(str(b).encode()) % HOLDOUT_EVERY == 0 for b in book_ids])
+
+
+def _rated(chunk):
+    return chunk[chunk['average_rating'].notna() & (chunk['average_rating'] > 0)]
+
+
+def train(path=data_path, chunksize=50_000, epochs=5):
+    """Stream the CSV epochs times, training on rated rows and scoring the holdout"""
+    model = RatingModel()
+    for epoch in range(epochs):
+        errors, baseline = [], []
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            rated = _rated(chunk)
+            if rated.empty:
+                continue
+            holdout = _is_holdout(rated['book_id'])
+            if (~holdout).any():
+                model.partial_fit(rated[~holdout])
+            if holdout.any() and model.rating_mean is not None:
+                truth = rated.loc[holdout, 'average_rating'].to_numpy()
+                errors.append(np.abs(model.predict(rated[holdout]) - truth))
+                baseline.append(np.abs(model.rating_mean - truth))
+        if errors:
+            mae = np.concatenate(errors).mean()
+            base = np.concatenate(baseline).mean()
+            print(f"   Epoch {epoch + 1}: holdout MAE {mae:.3f} (predict-the-mean {base:.3f})")
+    return model
+
+
+def _score_chunk(model, chunk):
+    unrated = chunk[chunk['average_rating'].isna()]
+    return pd.DataFrame({'book_id': unrated['book_id'].to_numpy(),
+                         'predicted_rating': model.predict(unrated) if len(unrated) else []})
+
+
+def score_unrated(model, path=data_path, chunksize=50_000, n_jobs=-1):
+    """Predict ratings for unrated books, one CSV chunk per worker process"""
+    results = Parallel(n_jobs=n_jobs, return_as='generator')(
+        delayed(_score_chunk)(model, chunk) for chunk in pd.read_csv(path, chunksize=chunksize))
+    return pd.concat(list(results), ignore_index=True)
+
+
+if __name__ == '__main__':
+    print("🤖 Training rating model (out-of-core SGD)...")
+    model = train()
+    print(f"✅ Saved: {model.save()}")
+
+    print("\n📈 Scoring unrated books...")
+    predictions = score_unrated(model)
+    output = os.path.join(model_dir, 'predicted_ratings.csv')
+    predictions.to_csv(output, index=False)
+    print(f"✅ Predicted {len(predictions):,} ratings -> {output}")
+    print(f"   Mean predicted rating: {predictions['predicted_rating'].mean():.2f}")
@@ -17,6 +17,7 @@ scripts = [
     "08_animated_ratings_wheel.py",
     "09_animated_publisher_race.py",
     "10_summary_dashboard.py",
+    "generate_mobile_graphs.py",
 ]
 
 print("=" * 60)
@@ -28,6 +29,7 @@ print()
 script_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(script_dir)
 
+failed = []
 for i, script in enumerate(scripts, 1):
     print(f"\n[{i}/{len(scripts)}] Running {script}...")
     print("-" * 40)
@@ -41,9 +43,28 @@ for i, script in enumerate(scripts, 1):
     
     if result.returncode != 0:
         print(f"❌ Error in {script}")
+        failed.append(script)
     else:
         print(f"✅ {script} completed")
 
+# JSON shards for the live explorer and the hero figures; fingerprinted with the images below
+result = subprocess.run([sys.executable, "export_data.py"], capture_output=True, text=True)
+print("\n" + (result.stdout.strip().splitlines()[-1] if result.returncode == 0 else f"⚠️  {result.stderr.strip()}"))
+
+# Lossless PNG re-encode and WebP twins for everything just rendered
+print("\n🗜️  Optimizing images...")
+result = subprocess.run([sys.executable, "optimize_images.py"], capture_output=True, text=True)
+print(result.stdout.strip().splitlines()[-1] if result.returncode == 0 else f"⚠️  {result.stderr.strip()}")
+
+# Content-hashed copies in dist/; unchanged charts keep their names
+result = subprocess.run([sys.executable, "fingerprint_assets.py"], capture_output=True, text=True)
+print(result.stdout.strip().splitlines()[-1] if result.returncode == 0 else f"⚠️  {result.stderr.strip()}")
+
+# Charts now reflect every ingested delta
+if not failed:
+    from ingest import clear_stale_outputs
+    clear_stale_outputs()
+
 print("\n" + "=" * 60)
 print("🎉 ALL VISUALIZATIONS COMPLETE!")
 print("=" * 60)
@@ -51,3 +72,4 @@ print("\n📁 Check the 'graphs' folder for all outputs:")
 print("   - 6 static PNG charts")
 print("   - 3 animated GIFs")
 print("   - 1 comprehensive dashboard")
+print("\n📁 Dashboard data shards are in 'data'")
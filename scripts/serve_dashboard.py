@@ -0,0 +1,216 @@
+"""
+Dashboard Server
+Local stand-in for the static hosting: precompressed text, strong ETags, 304s, ranges and sendfile
+"""
+import os
+import re
+import sys
+import gzip
+import mmap
+import asyncio
+import hashlib
+import mimetypes
+from fingerprint_assets import ASSET_DIRS, dist_dir, is_fingerprinted
+from http_server import etag_matches, serve, send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+
+# What the dashboard serves, relative to the project root (or dist/)
+ROOT_FILES = ['index.html']
+
+TEXT_EXTENSIONS = {'.html', '.json', '.js', '.css', '.svg', '.txt'}
+MIN_COMPRESS_BYTES = 512
+
+# Always revalidate pages and data; images may be reused for an hour,
+# and content-hashed names never change so they are cached for a year
+REVALIDATE = 'no-cache'
+IMAGE_CACHE = 'public, max-age=3600'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+RANGE_PATTERN = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+def _file_digest(path, size):
+    """SHA-256 of a file hashed straight from a read-only memory map"""
+    digest = hashlib.sha256()
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            digest.update(view)
+    return digest.hexdigest()[:32]
+
+
+class Asset:
+    """One servable file: identity validator plus any precompressed text variants"""
+
+    def __init__(self, path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        ext = os.path.splitext(path)[1].lower()
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.is_text = ext in TEXT_EXTENSIONS
+        if self.is_text:
+            self.content_type += '; charset=utf-8'
+        if is_fingerprinted(path):
+            self.cache_control = IMMUTABLE
+        else:
+            self.cache_control = REVALIDATE if self.is_text else IMAGE_CACHE
+        self.etag = f'"{_file_digest(path, self.size)}"'
+
+        # encoding -> (bytes, etag); only kept when compression actually helps
+        self.encoded = {}
+        if self.is_text:
+            with open(path, 'rb') as f:
+                self.body = f.read()
+            if self.size >= MIN_COMPRESS_BYTES:
+                candidates = {'gzip': gzip.compress(self.body, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    candidates['br'] = brotli.compress(self.body, quality=11)
+                for encoding, data in candidates.items():
+                    if len(data) < self.size:
+                        self.encoded[encoding] = (data, f'"{self.etag[1:-1]}-{encoding}"')
+        else:
+            self.body = None  # served from disk with sendfile
+        self.webp = None  # WebP twin of a PNG, from optimize_images.py
+
+    def negotiate(self, accept_encoding):
+        """(encoding, etag) of the best representation the client accepts"""
+        accepted = {token.split(';')[0].strip() for token in accept_encoding.lower().split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encoded and encoding in accepted:
+                return encoding, self.encoded[encoding][1]
+        return None, self.etag
+
+
+def load_assets(root=project_dir):
+    """URL path -> Asset for every dashboard file, hashed and compressed once at startup"""
+    assets = {}
+    paths = [os.path.join(root, name) for name in ROOT_FILES]
+    for directory in ASSET_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(root, directory)):
+            paths += [os.path.join(dirpath, name) for name in sorted(filenames)]
+    for path in paths:
+        if os.path.isfile(path):
+            url = '/' + os.path.relpath(path, root).replace(os.sep, '/')
+            assets[url] = Asset(path)
+    for url, asset in assets.items():
+        if url.endswith('.png'):
+            asset.webp = assets.get(url[:-4] + '.webp')
+    if '/index.html' in assets:
+        assets['/'] = assets['/index.html']
+    return assets
+
+
+# =============================================================================
+# CONDITIONAL AND RANGE REQUESTS
+# =============================================================================
+def parse_range(header, size):
+    """Inclusive (start, end) for a single bytes range; None means serve the whole file.
+
+    Raises ValueError when the range cannot be satisfied (-> 416).
+    Multi-range and malformed headers get the full body, which RFC 9110 allows.
+    """
+    match = RANGE_PATTERN.fullmatch(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError('empty suffix range')
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(f'range {header!r} outside {size} bytes')
+    return start, end
+
+
+# =============================================================================
+# HANDLER
+# =============================================================================
+def make_handler(assets):
+    loop = asyncio.get_running_loop()
+
+    async def handler(request, writer):
+        head_only = request.method == 'HEAD'
+        if request.method not in ('GET', 'HEAD'):
+            return await send(writer, 405, {'Allow': 'GET, HEAD'})
+        asset = assets.get(request.path)
+        if asset is None:
+            return await send(writer, 404, {'Content-Type': 'text/plain; charset=utf-8'}, b'Not Found',
+                              head_only)
+
+        vary = []
+        if asset.webp is not None:
+            vary.append('Accept')
+            if 'image/webp' in request.headers.get('accept', ''):
+                asset = asset.webp
+        encoding, etag = asset.negotiate(request.headers.get('accept-encoding', ''))
+        headers = {'ETag': etag, 'Cache-Control': asset.cache_control, 'Content-Type': asset.content_type}
+        if asset.encoded:
+            vary.append('Accept-Encoding')
+        if vary:
+            headers['Vary'] = ', '.join(vary)
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and etag_matches(if_none_match, etag):
+            return await send(writer, 304, headers)
+
+        if encoding:
+            body = asset.encoded[encoding][0]
+            return await send(writer, 200, {**headers, 'Content-Encoding': encoding}, body, head_only)
+
+        # Identity representation: ranges apply, unless If-Range names an older version
+        headers['Accept-Ranges'] = 'bytes'
+        start, end = 0, asset.size - 1
+        status = 200
+        range_header = request.headers.get('range')
+        if range_header and request.headers.get('if-range', etag) == etag:
+            try:
+                selected = parse_range(range_header, asset.size)
+            except ValueError:
+                return await send(writer, 416, {**headers, 'Content-Range': f'bytes */{asset.size}'})
+            if selected:
+                start, end = selected
+                status = 206
+                headers['Content-Range'] = f'bytes {start}-{end}/{asset.size}'
+
+        length = end - start + 1 if asset.size else 0
+        if asset.body is not None:
+            return await send(writer, status, headers, asset.body[start:start + length], head_only)
+
+        await send(writer, status, {**headers, 'Content-Length': str(length)})
+        if not head_only and length:
+            with open(asset.path, 'rb') as f:
+                # Zero-copy os.sendfile where the platform supports it
+                await loop.sendfile(writer.transport, f, start, length)
+
+    return handler
+
+
+async def main(host='127.0.0.1', port=8000, root=project_dir):
+    assets = load_assets(root)
+    unique = {id(asset): asset for asset in assets.values()}.values()  # '/' aliases index.html
+    text = [asset for asset in unique if asset.is_text]
+    saved = sum(a.size - min(len(d) for d, _ in a.encoded.values()) for a in text if a.encoded)
+    print(f"📦 {len(unique)} assets loaded, {len(text)} text "
+          f"({saved / 1024:.1f} KB saved by precompression, brotli {'on' if brotli else 'off'})")
+    await serve(make_handler(assets), host, port,
+                on_start=lambda _: print(f"🌐 Serving dashboard on http://{host}:{port}/"))
+
+
+if __name__ == '__main__':
+    # python serve_dashboard.py [port] [--dist]   (--dist serves the fingerprinted build)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    port = int(args[0]) if args else 8000
+    root = dist_dir if '--dist' in sys.argv else project_dir
+    try:
+        asyncio.run(main(port=port, root=root))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
@@ -0,0 +1,182 @@
+"""
+Similar Books Index
+TF-IDF + TruncatedSVD embeddings with a memory-mapped IVF index for "more like this" lookups
+"""
+import os
+import sys
+import time
+import joblib
+import pandas as pd
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from snapshot import load_books
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+index_dir = os.path.join(project_dir, 'models', 'similar')
+
+TEXT_COLUMNS = ['title', 'subtitle', 'description', 'categories']
+
+
+def book_text(df):
+    return df[TEXT_COLUMNS].fillna('').astype(str).agg(' '.join, axis=1)
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+def build_index(df, directory=index_dir, dims=128, n_lists=None, random_state=42):
+    """Embed every book, cluster the embeddings into inverted lists and write it all to disk"""
+    os.makedirs(directory, exist_ok=True)
+
+    tfidf = TfidfVectorizer(min_df=2, max_df=0.5, sublinear_tf=True, stop_words='english',
+                            dtype=np.float32)
+    tfidf_matrix = tfidf.fit_transform(book_text(df))
+    dims = min(dims, tfidf_matrix.shape[1] - 1)
+    svd = TruncatedSVD(n_components=dims, algorithm='randomized', random_state=random_state)
+    vectors = svd.fit_transform(tfidf_matrix).astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    # Coarse quantizer: ~sqrt(n) lists keeps both list scans and centroid scans small
+    n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+    quantizer = MiniBatchKMeans(n_clusters=n_lists, random_state=random_state, n_init=3,
+                                batch_size=4096).fit(vectors)
+    lists = quantizer.predict(vectors)
+    order = np.argsort(lists, kind='stable').astype(np.int64)
+    offsets = np.r_[0, np.cumsum(np.bincount(lists, minlength=n_lists))].astype(np.int64)
+
+    # Store vectors in list order so each probe reads one contiguous slice
+    embeddings = np.lib.format.open_memmap(os.path.join(directory, 'embeddings.npy'),
+                                           mode='w+', dtype=np.float32, shape=vectors.shape)
+    embeddings[:] = vectors[order]
+    embeddings.flush()
+
+    centroids = quantizer.cluster_centers_.astype(np.float32)
+    centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    np.save(os.path.join(directory, 'centroids.npy'), centroids)
+    np.save(os.path.join(directory, 'offsets.npy'), offsets)
+    np.save(os.path.join(directory, 'rows.npy'), order)
+    np.save(os.path.join(directory, 'book_ids.npy'), df['book_id'].to_numpy(dtype=str))
+    joblib.dump({'tfidf': tfidf, 'svd': svd}, os.path.join(directory, 'encoder.joblib'))
+    return SimilarBooksIndex(directory)
+
+
+# =============================================================================
+# QUERY
+# =============================================================================
+class SimilarBooksIndex:
+    """Read-only view of a built index; arrays are memory-mapped, not loaded"""
+
+    def __init__(self, directory=index_dir):
+        self.directory = directory
+        load = lambda name: np.load(os.path.join(directory, name), mmap_mode='r')
+        self.embeddings = load('embeddings.npy')
+        self.centroids = np.load(os.path.join(directory, 'centroids.npy'))
+        self.offsets = np.load(os.path.join(directory, 'offsets.npy'))
+        self.rows = load('rows.npy')
+        self.book_ids = load('book_ids.npy')
+        self._positions = None
+        self._encoder = None
+
+    def position_of(self, book_id):
+        """Position of a book inside the list-ordered embedding matrix"""
+        if self._positions is None:
+            ids = np.asarray(self.book_ids)[np.asarray(self.rows)]
+            self._positions = pd.Series(np.arange(len(ids)), index=ids)
+        return int(self._positions[book_id])
+
+    def encode(self, texts):
+        if self._encoder is None:
+            self._encoder = joblib.load(os.path.join(self.directory, 'encoder.joblib'))
+        vectors = self._encoder['svd'].transform(self._encoder['tfidf'].transform(texts))
+        vectors = vectors.astype(np.float32)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    def search(self, queries, k=10, n_probe=8, exclude=None):
+        """Top-k (book_ids, scores) for each query vector, probing the n_probe nearest lists"""
+        queries = np.atleast_2d(queries).astype(np.float32)
+        n_probe = min(n_probe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+
+        ids, scores = [], []
+        for qi, query in enumerate(queries):
+            spans = [np.arange(self.offsets[l], self.offsets[l + 1]) for l in probes[qi]]
+            candidates = np.concatenate(spans)
+            if exclude is not None:
+                candidates = candidates[candidates != exclude[qi]]
+            sims = np.asarray(self.embeddings[candidates]) @ query
+            top = min(k, len(sims))
+            best = np.argpartition(-sims, top - 1)[:top] if top else np.empty(0, dtype=np.int64)
+            best = best[np.argsort(-sims[best])]
+            ids.append(self.book_ids[self.rows[candidates[best]]])
+            scores.append(sims[best])
+        return ids, scores
+
+    def similar_to(self, book_id, k=10, n_probe=8):
+        """Books most similar to an indexed book"""
+        pos = self.position_of(book_id)
+        ids, scores = self.search(self.embeddings[pos], k, n_probe, exclude=[pos])
+        return pd.Series(scores[0], index=ids[0], name='similarity')
+
+    def similar_to_text(self, text, k=10, n_probe=8):
+        ids, scores = self.search(self.encode([text]), k, n_probe)
+        return pd.Series(scores[0], index=ids[0], name='similarity')
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+def _neighbours_block(directory, start, stop, k, n_probe):
+    index = SimilarBooksIndex(directory)
+    positions = np.arange(start, stop)
+    ids, scores = index.search(np.asarray(index.embeddings[start:stop]), k, n_probe,
+                               exclude=positions)
+    return ids, scores
+
+
+def all_neighbours(directory=index_dir, k=10, n_probe=8, block_size=2048, n_jobs=-1):
+    """Neighbours of every indexed book; each worker memory-maps the index itself"""
+    index = SimilarBooksIndex(directory)
+    n = len(index.embeddings)
+    blocks = Parallel(n_jobs=n_jobs)(
+        delayed(_neighbours_block)(directory, start, min(start + block_size, n), k, n_probe)
+        for start in range(0, n, block_size))
+
+    source = np.asarray(index.book_ids)[np.asarray(index.rows)]
+    ids = [neigh for block_ids, _ in blocks for neigh in block_ids]
+    scores = [sims for _, block_scores in blocks for sims in block_scores]
+    lengths = np.array([len(neigh) for neigh in ids])
+    return pd.DataFrame({
+        'book_id': np.repeat(source, lengths),
+        'rank': np.concatenate([np.arange(1, length + 1) for length in lengths]),
+        'neighbour_id': np.concatenate(ids),
+        'similarity': np.concatenate(scores),
+    })
+
+
+if __name__ == '__main__':
+    # Usage: python similar_books.py build | query <book_id> | batch
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+
+    if command == 'build':
+        df = load_books()
+        print(f"🔎 Building similarity index for {len(df):,} books...")
+        index = build_index(df)
+        print(f"✅ Saved: {index.directory} ({len(index.centroids)} lists)")
+
+    elif command == 'query':
+        index = SimilarBooksIndex()
+        start = time.perf_counter()
+        result = index.similar_to(sys.argv[2])
+        print(f"📚 Most similar to {sys.argv[2]} ({(time.perf_counter() - start) * 1000:.1f} ms):")
+        for book_id, score in result.items():
+            print(f"   {book_id}: {score:.3f}")
+
+    elif command == 'batch':
+        neighbours = all_neighbours()
+        output = os.path.join(index_dir, 'neighbours.csv')
+        neighbours.to_csv(output, index=False)
+        print(f"✅ Saved {len(neighbours):,} neighbour rows -> {output}")
@@ -0,0 +1,127 @@
+"""
+Dataset Snapshot
+Loads the books CSV once per dataset version and caches it with derived columns
+"""
+import os
+import json
+import hashlib
+import pandas as pd
+from dates import add_date_columns
+from features import add_feature_columns
+from outliers import add_outlier_columns
+from dedup import ISBN_DTYPES, assign_work_ids
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+data_path = os.path.join(project_dir, 'google_books_dataset.csv')
+cache_dir = os.path.join(project_dir, 'cache')
+hash_memo_path = os.path.join(cache_dir, 'hashes.json')
+
+# Bump when a derived stage changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 4
+
+
+def add_work_ids(df):
+    df['work_id'] = assign_work_ids(df)
+    return df
+
+
+# Stages run in order on a fresh load; each returns the frame with new columns
+DERIVED_STAGES = [
+    add_date_columns,
+    add_feature_columns,
+    add_outlier_columns,
+    add_work_ids,
+]
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_memo():
+    if not os.path.exists(hash_memo_path):
+        return {}
+    with open(hash_memo_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def remember_hash(path, digest):
+    """Record the hash of a file as it is now; reused until its size or mtime changes"""
+    memo = _read_memo()
+    memo[os.path.abspath(path)] = {'stamp': _file_stamp(path), 'hash': digest}
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f'{hash_memo_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(memo, f, indent=2)
+    os.replace(tmp, hash_memo_path)
+
+
+def dataset_hash(path=data_path, block_size=1 << 20):
+    """SHA-256 of the raw CSV bytes, memoized by file size and mtime.
+
+    ingest.py records a chained hash for a CSV it appended to rather than
+    re-reading the whole file; any other edit changes the stamp and the
+    file is hashed afresh.
+    """
+    entry = _read_memo().get(os.path.abspath(path))
+    if entry and entry['stamp'] == _file_stamp(path):
+        return entry['hash']
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    remember_hash(path, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def snapshot_path(path=data_path, data_hash=None):
+    data_hash = data_hash or dataset_hash(path)
+    return os.path.join(cache_dir, f'books_{data_hash[:16]}_v{SNAPSHOT_VERSION}.pkl')
+
+
+def segments_path(data_hash):
+    """Manifest listing the pickles that make up a snapshot grown by ingest.py"""
+    return os.path.join(cache_dir, f'books_{data_hash[:16]}_v{SNAPSHOT_VERSION}.json')
+
+
+def snapshot_parts(data_hash):
+    """Pickle files (relative to cache/) holding the snapshot, oldest rows first; None if not cached"""
+    if os.path.exists(snapshot_path(data_hash=data_hash)):
+        return [os.path.basename(snapshot_path(data_hash=data_hash))]
+    manifest = segments_path(data_hash)
+    if os.path.exists(manifest):
+        with open(manifest, encoding='utf-8') as f:
+            return json.load(f)['parts']
+    return None
+
+
+def build_snapshot(path=data_path):
+    df = pd.read_csv(path, dtype=ISBN_DTYPES)
+    for stage in DERIVED_STAGES:
+        df = stage(df)
+    return df
+
+
+def load_books(path=data_path, use_cache=True):
+    """Books frame with derived columns, reused across runs until the CSV changes"""
+    data_hash = dataset_hash(path)
+    snap = snapshot_path(data_hash=data_hash)
+    parts = snapshot_parts(data_hash) if use_cache else None
+    if parts:
+        frames = [pd.read_pickle(os.path.join(cache_dir, part)) for part in parts]
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    df = build_snapshot(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f'{snap}.{os.getpid()}.tmp'
+    df.to_pickle(tmp)
+    os.replace(tmp, snap)
+    return df
+
+
+if __name__ == '__main__':
+    df = load_books(use_cache=False)
+    print(f"✅ Snapshot: {snapshot_path()}")
+    print(f"   {len(df):,} rows, {len(df.columns)} columns")
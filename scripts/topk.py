@@ -0,0 +1,121 @@
+"""
+Top-K Query Engine
+One-pass "top k rows by metric", optionally per partition, with cached partition indexes and results
+"""
+import operator
+import pandas as pd
+import numpy as np
+from snapshot import load_books
+
+OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+    'in': lambda s, v: s.isin(v),
+}
+
+
+def _normalize(filters):
+    """Hashable, order-independent form of {col: (op, value)} filters"""
+    if not filters:
+        return ()
+    return tuple(sorted((col, op, tuple(v) if isinstance(v, (list, set, tuple)) else v)
+                        for col, (op, v) in filters.items()))
+
+
+def top_positions(values, k, ascending):
+    """Positions of the k best values, best first (argpartition + sort of k)"""
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    keyed = values if ascending else -values
+    if len(values) > k:
+        part = np.argpartition(keyed, k - 1)[:k]
+    else:
+        part = np.arange(len(values))
+    return part[np.argsort(keyed[part], kind='stable')]
+
+
+class TopKEngine:
+    """Answers top-k questions over one frame; partition indexes and results are cached"""
+
+    def __init__(self, df):
+        self.df = df
+        self._partitions = {}
+        self._results = {}
+
+    def _partition(self, by):
+        """Codes, labels and a sort-by-code order for a partition column, built once"""
+        if by not in self._partitions:
+            codes, labels = pd.factorize(self.df[by])
+            order = np.argsort(codes, kind='stable')
+            self._partitions[by] = (codes, labels, order)
+        return self._partitions[by]
+
+    def _mask(self, metric, filters):
+        mask = self.df[metric].notna().to_numpy().copy()
+        for col, op, value in filters:
+            mask &= OPERATORS[op](self.df[col], value).to_numpy(dtype=bool, na_value=False)
+        return mask
+
+    def top(self, metric, k=10, by=None, filters=None, ascending=False):
+        """Top k rows by metric overall, or per value of the `by` column"""
+        key = ('top', metric, k, by, _normalize(filters), ascending)
+        if key in self._results:
+            return self._results[key]
+
+        mask = self._mask(metric, _normalize(filters))
+        values = self.df[metric].to_numpy(dtype=float)
+
+        if by is None:
+            rows = np.flatnonzero(mask)
+            picked = rows[top_positions(values[rows], k, ascending)]
+        else:
+            codes, _, order = self._partition(by)
+            rows = order[mask[order]]
+            # Group boundaries inside the code-sorted row list
+            sorted_codes = codes[rows]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])[:len(rows)]
+            ends = np.r_[starts[1:], len(rows)].astype(np.int64)
+            picked = [rows[s:e][top_positions(values[rows[s:e]], k, ascending)]
+                      for s, e in zip(starts, ends)]
+            picked = np.concatenate(picked) if picked else np.empty(0, dtype=np.int64)
+
+        result = self.df.iloc[picked]
+        self._results[key] = result
+        return result
+
+    def group_stats(self, metric, by, filters=None):
+        """Per-partition mean and count of metric in one bincount pass"""
+        key = ('stats', metric, by, _normalize(filters))
+        if key not in self._results:
+            codes, labels, _ = self._partition(by)
+            mask = self._mask(metric, _normalize(filters)) & (codes >= 0)
+            values = self.df[metric].to_numpy(dtype=float)
+            counts = np.bincount(codes[mask], minlength=len(labels))
+            sums = np.bincount(codes[mask], weights=values[mask], minlength=len(labels))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = sums / counts
+            self._results[key] = pd.DataFrame({metric: means, 'count': counts}, index=labels)
+        return self._results[key]
+
+    def group_top(self, metric, by, k=10, min_count=1, filters=None, ascending=False):
+        """Top k partitions by mean metric; highest and lowest share one cached aggregate"""
+        stats = self.group_stats(metric, by, filters)
+        stats = stats[stats['count'] >= min_count]
+        positions = top_positions(stats[metric].to_numpy(), k, ascending)
+        return stats.iloc[positions]
+
+
+if __name__ == '__main__':
+    engine = TopKEngine(load_books())
+
+    print("🏷️  CHEAPEST HIGHLY-RATED BOOKS PER LANGUAGE (rating ≥ 4.5):")
+    cheapest = engine.top('list_price', k=3, by='language', ascending=True,
+                          filters={'average_rating': ('>=', 4.5), 'list_price': ('>', 0)})
+    for lang, group in cheapest.groupby('language', sort=False):
+        picks = ', '.join(f"{str(t)[:25]} (${p:.2f})" for t, p in zip(group['title'], group['list_price']))
+        print(f"   {lang}: {picks}")
+
+    print("\n⭐ TOP CATEGORIES BY RATING (min 5 books):")
+    for cat, row in engine.group_top('average_rating', 'search_category', k=10, min_count=5).iterrows():
+        print(f"   {cat}: {row['average_rating']:.2f} ({int(row['count'])} books)")